@@ -7,20 +7,24 @@ Goal:
       id -> int
       score -> float
   - Skip bad rows and count errors (automation style)
+  - Average/spread/percentiles streamed with ScoreStats (no list of rows)
 """
 
 import csv
 from pathlib import Path
 
+import score_stats
+from score_record import ScoreRecord
+
 
 REQUIRED_COLUMNS = {"id", "name", "score"}
 
-def parse_row(row: dict) -> dict:
-    return {
-        "id": int(row["id"]),
-        "name": str(row["name"]),
-        "score": float(row["score"]),
-    }
+def parse_row(row: dict) -> ScoreRecord:
+    return ScoreRecord(
+        int(row["id"]),
+        str(row["name"]),
+        float(row["score"]),
+    )
     
 
 
@@ -33,7 +37,8 @@ def main():
         print("ERROR: CSV file not found:", csv_path)
         return
     
-    good = []
+    stats = score_stats.ScoreStats()
+    best = None
     bad = 0
     
     with csv_path.open("r", encoding="utf-8") as f:
@@ -51,21 +56,24 @@ def main():
         for i, row in enumerate(reader, start=2):
             try:
                 typed = parse_row(row)
-                good.append(typed)
+                stats.add(typed.score)
+                if best is None or typed.score > best.score:
+                    best = typed
             except Exception as e:
                 bad += 1
                 print(f"SKIP row {i}: {row} -> {e}")
                 
     print("-" * 60)
-    print("Good rows:", len(good))
+    print("Good rows:", stats.count)
     print("Bad rows :", bad)   
     
-    if good:
-        avg = sum(r["score"] for r in good) / len(good)
-        best = max(good, key=lambda r:r["score"])
+    if best is not None:
+        summary = stats.to_dict()
         
-        print(f"Average score: {avg}")
-        print(f"Best: id={best['id']} name={best['name']} score={best['score']}")
+        print(f"Average score: {summary['mean']}")
+        print(f"Std dev      : {summary['stddev']}")
+        print(f"Percentiles  : {summary['percentiles']}")
+        print(f"Best: id={best.id} name={best.name} score={best.score}")
 
 
 if __name__ == "__main__":
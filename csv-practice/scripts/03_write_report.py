@@ -10,6 +10,8 @@ Goal:
 import csv
 from pathlib import Path
 
+import grading
+
 REQUIRED_COLUMNS = {"id", "name", "score"}
 
 def parse_row(row: dict) -> dict:
@@ -20,16 +22,8 @@ def parse_row(row: dict) -> dict:
     }
     
     
-def grade(score: float) -> str:
-    if score >= 90:
-        return "A"
-    elif score >= 80:
-        return "B"
-    elif score >= 70:
-        return "C"
-    elif score >= 60:
-        return "D"
-    return "F"
+# shared grade bands (grading.py), compiled once
+GRADER = grading.DEFAULT_POLICY.base
 
 
 
@@ -74,8 +68,8 @@ def main():
             "id": r["id"],
             "name": r["name"],
             "score": f"{s:.2f}",
-            "passed":"yes" if s >=80 else "no",
-            "grade": grade(s)
+            "passed": GRADER.passed(s),
+            "grade": GRADER.grade(s)
         })
         
         
@@ -3,43 +3,179 @@ Sorted report + erroes.csv
     - Read + validate + type-convert
     - Write report.csv sorted by score (desc)
     - Write errors.csv with bad rows + error message
+    - --max-memory: external merge sort (spill sorted runs, heapq k-way merge)
+    - --top K / --bottom K: size-K heap while streaming (O(K) memory)
+    - --per-grade: top/bottom K inside each grade bucket
+    - --out-format cols|both: typed columnar report_grade.cols/ next to / instead of csv
+    - --grading policy.json: custom bands / pass mark (shared with 05/07, see grading.py)
 """
 
+import argparse
+import contextlib
 import csv
-from doctest import REPORT_ONLY_FIRST_FAILURE
-from encodings.rot_13 import rot13
-from ftplib import error_perm
-from logging import root
+import heapq
+import sys
+import tempfile
+from functools import partial
+from heapq import heappush, heapreplace
 from pathlib import Path
-from turtle import end_fill
+
+import columnar_store
+import grading
+from score_record import ScoreRecord
 
 REQUIRED_COLUMNS = {"id", "name", "score"}
+REPORT_FIELDS = ["id", "name", "score", "passed", "grade"]
 
-def parse_row(row: dict) -> dict:
-    return {
-        "id": int(row["id"]),
-        "name": str(row["name"]),
-        "score": float(row["score"]),
-    }
+def parse_row(row: dict) -> ScoreRecord:
+    return ScoreRecord(
+        int(row["id"]),
+        str(row["name"]),
+        float(row["score"]),
+    )
     
     
-def grade(score: float) -> str:
-    if score >= 90:
-        return "A"
-    if score >= 80:
-        return "B"
-    if score >= 70:
-        return "C"
-    if score >= 60:
-        return "D"
-    return "F"
+def parse_size(s: str) -> int:
+    """'512K' / '64M' / '2G' / '1000000' -> bytes"""
+    s = s.strip().upper()
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    try:
+        if s and s[-1] in units:
+            return int(float(s[:-1]) * units[s[-1]])
+        return int(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {s!r} (use e.g. 64M, 1G)")
+
+
+def row_bytes(r: ScoreRecord) -> int:
+    # rough resident size of one typed row (record + its values)
+    return sys.getsizeof(r) + sys.getsizeof(r.name) + sys.getsizeof(r.id) + sys.getsizeof(r.score)
+
+
+def score_key(r: ScoreRecord) -> float:
+    return r.score
+
+
+def spill_run(rows: list[ScoreRecord], tmp_dir: Path, n: int) -> Path:
+    """Sort one chunk (stable, same key as the in-memory path) and write it out."""
+    rows.sort(key=score_key, reverse=True)
+    run_path = tmp_dir / f"run_{n:05d}.csv"
+    with run_path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        # repr(float) round-trips exactly, so merged output == in-memory output
+        w.writerows((r.id, r.name, repr(r.score)) for r in rows)
+    return run_path
+
+
+def read_run(run_path: Path):
+    with run_path.open("r", encoding="utf-8", newline="") as f:
+        for rid, name, score in csv.reader(f):
+            yield ScoreRecord(int(rid), name, float(score))
+
+
+class TopK:
+    """
+    Keep the k best rows seen so far in a min-heap of size k.
+    O(k) memory, O(n log k) time.
+
+    Heap entries are (sign * score, -seq, row): heap[0] is the weakest row
+    kept. For equal scores the later row is weaker, so ties keep the earlier
+    row, same as the stable full sort would.
+    """
+
+    def __init__(self, k: int, largest: bool = True):
+        self.k = k
+        self.sign = 1 if largest else -1
+        self.heap = []
+        self.seq = 0
+
+    def push(self, r: ScoreRecord) -> None:
+        entry = (self.sign * r.score, -self.seq, r)
+        self.seq += 1
+        if len(self.heap) < self.k:
+            heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            heapreplace(self.heap, entry)
+
+    def items(self) -> list[ScoreRecord]:
+        # best first: highest scores for --top, lowest scores for --bottom
+        return [e[2] for e in sorted(self.heap, reverse=True)]
+
+
+class GradeTopK:
+    """One TopK per grade bucket (best grade first)."""
+
+    def __init__(self, k: int, largest: bool = True, policy: grading.GradingPolicy = grading.DEFAULT_POLICY):
+        self.grades = policy.grades
+        self.grade = policy.base.grade
+        self.buckets = {g: TopK(k, largest) for g in self.grades}
+
+    def push(self, r: ScoreRecord) -> None:
+        self.buckets[self.grade(r.score)].push(r)
+
+    def items(self) -> list[ScoreRecord]:
+        return [r for g in self.grades for r in self.buckets[g].items()]
+
+
+def positive_int(s: str) -> int:
+    n = int(s)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1: {s}")
+    return n
+
+
+def report_row(r: ScoreRecord, grader: grading.Grader = grading.DEFAULT_POLICY.base) -> tuple:
+    # plain tuple in REPORT_FIELDS order (no per-row output dict)
+    s = r.score
+    return (r.id, r.name, s, "yes" if s >= grader.pass_score else "no", grader.grade(s))
+
 
 def main():
+    parser = argparse.ArgumentParser(description="sorted report + errors.csv")
+    parser.add_argument("--input", type=Path, default=None, help="Input CSV (default: playground/out/sample.csv)")
+    parser.add_argument(
+        "--max-memory",
+        type=parse_size,
+        default=None,
+        help="Memory budget for good rows (e.g. 256M). Above it, sorted runs spill to temp files",
+    )
+    pick = parser.add_mutually_exclusive_group()
+    pick.add_argument("--top", type=positive_int, default=None, help="Only write the K highest scores")
+    pick.add_argument("--bottom", type=positive_int, default=None, help="Only write the K lowest scores (lowest first)")
+    parser.add_argument("--per-grade", action="store_true", help="Apply --top/--bottom K inside each grade bucket")
+    parser.add_argument(
+        "--out-format",
+        choices=["csv", "cols", "both"],
+        default="csv",
+        help="report as csv (default), typed columns (report_grade.cols/) or both",
+    )
+    parser.add_argument(
+        "--grading",
+        type=Path,
+        default=None,
+        help="grading policy JSON (bands, pass_score); default A>=90 .. D>=60, pass >= 80",
+    )
+    args = parser.parse_args()
+
+    if args.per_grade and args.top is None and args.bottom is None:
+        parser.error("--per-grade needs --top K or --bottom K")
+    policy = grading.DEFAULT_POLICY
+    if args.grading:
+        try:
+            policy = grading.load_policy(args.grading)
+        except grading.PolicyError as e:
+            print("ERROR:", e)
+            return
+    if policy.has_cohorts:
+        # rows are graded after sorting, from (id, name, score) records
+        parser.error("cohort curves are not supported by the sorted report: use 05/07")
+    to_report = partial(report_row, grader=policy.base)
+
     script_dir = Path(__file__).resolve().parent
     root_dir = script_dir.parent
     print(f"your root dir : {root_dir}")
     
-    in_path = root_dir / "playground" / "out" / "sample.csv"
+    in_path = args.input.expanduser() if args.input else root_dir / "playground" / "out" / "sample.csv"
     report_path = root_dir / "playground" / "out" / "report_grade.csv"
     errors_path = root_dir / "playground" / "out" / "errors.csv"
     
@@ -49,71 +185,115 @@ def main():
         return
     
     good = []
-    errors = []
-    
-    
-    
-    with in_path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        
-        header = set(reader.fieldnames or [])
-        missing = REQUIRED_COLUMNS - header
-        
-        if missing:
-            print("ERROR: missing required columns ", sorted(missing))
-            print("Found columns: ", reader.fieldnames)
-            return
-        
-        for line_no, row in  enumerate(reader, start=2):
-            try:
-                typed = parse_row(row)
+    good_bytes = 0
+    good_count = 0
+    error_count = 0
+    runs: list[Path] = []
+
+    selector = None
+    if args.top is not None or args.bottom is not None:
+        k = args.top if args.top is not None else args.bottom
+        if args.per_grade:
+            selector = GradeTopK(k, largest=args.top is not None, policy=policy)
+        else:
+            selector = TopK(k, largest=args.top is not None)
+
+    # spilled runs are removed on every exit; errors.csv is streamed (created on the first bad row)
+    with tempfile.TemporaryDirectory(prefix=".sort_runs_", dir=report_path.parent) as tmp, \
+        contextlib.ExitStack() as err_stack:
+        tmp_dir = Path(tmp)
+        err_writer = None
+
+        with in_path.open("r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+
+            header = set(reader.fieldnames or [])
+            missing = REQUIRED_COLUMNS - header
+
+            if missing:
+                print("ERROR: missing required columns ", sorted(missing))
+                print("Found columns: ", reader.fieldnames)
+                return
+
+            for line_no, row in  enumerate(reader, start=2):
+                try:
+                    typed = parse_row(row)
+                    if args.out_format != "csv":
+                        columnar_store.check_id(typed.id)  # cols store int64 ids
+                    good_count += 1
+                except Exception as e:
+                    err_row = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
+                    err_row["line_row"] = line_no
+                    err_row["error"] = str(e)
+                    if err_writer is None:
+                        f_err = err_stack.enter_context(errors_path.open("w", encoding="utf-8", newline=""))
+                        err_writer = csv.DictWriter(f_err, fieldnames=list(reader.fieldnames) + ["line_row", "error"])
+                        err_writer.writeheader()
+                    err_writer.writerow(err_row)
+                    error_count += 1
+                    continue
+
+                if selector is not None:
+                    selector.push(typed)
+                    continue
+
                 good.append(typed)
-            except Exception as e:
-                err_row = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
-                err_row["line_row"] = line_no
-                err_row["error"] = str(e)
-                errors.append(err_row)
-                
-    # higest first (descending order)            
-    good.sort(key=lambda r: r["score"], reverse=True)
-    
-    # Build the reports 
-    report_rows = []
-    for r in good:
-        s = r["score"]
-        report_rows.append(
-            {
-            "id": r["id"],
-            "name":r["name"],
-            "score":r["score"],
-            "passed": "yes" if s >= 80 else "no",
-            "grade": grade(s),
-        }
-        )
-        
-    # write report.csv
-    report_fields = ["id", "name", "score", "passed", "grade"]
-    with report_path.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=report_fields)
-        writer.writeheader()
-        writer.writerows(report_rows)
-        
-    if errors:
-        error_fields = list(reader.fieldnames) + ["line_row", "error"]
-        with errors_path.open("w", encoding="utf-8", newline="") as f:
-            w = csv.DictWriter(f, fieldnames=error_fields)
-            w.writeheader()
-            w.writerows(errors)
-    else:
+                if args.max_memory is not None:
+                    good_bytes += row_bytes(typed)
+                    if good_bytes >= args.max_memory:
+                        runs.append(spill_run(good, tmp_dir, len(runs)))
+                        good = []
+                        good_bytes = 0
+        err_stack.close()
+
+        if selector is not None:
+            sorted_rows = selector.items()
+        elif runs:
+            # runs are in input order and each is stably sorted, heapq.merge keeps
+            # ties in run order -> exactly the same order as one big stable sort
+            if good:
+                runs.append(spill_run(good, tmp_dir, len(runs)))
+                good = []
+            sorted_rows = heapq.merge(*(read_run(p) for p in runs), key=score_key, reverse=True)
+        else:
+            # higest first (descending order)
+            good.sort(key=score_key, reverse=True)
+            sorted_rows = good
+
+        # write report.csv (streamed straight from the merge when spilling)
+        cols_path = columnar_store.columns_path(report_path)
+        if args.out_format == "cols":
+            with columnar_store.ColumnWriter(cols_path, policy.grades) as col_writer:
+                col_writer.writerows(map(to_report, sorted_rows))
+        else:
+            with report_path.open("w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(REPORT_FIELDS)
+                if args.out_format == "both":
+                    with columnar_store.ColumnWriter(cols_path, policy.grades) as col_writer:
+                        columnar_store.TeeWriter(writer, col_writer).writerows(map(to_report, sorted_rows))
+                else:
+                    writer.writerows(map(to_report, sorted_rows))
+
+    if not error_count:
         # if there are no errors then choose not to create a file path
         errors_path = None
-        
+
     print("-" * 60)
     print("Input :", in_path)
-    print("Report:", report_path)
-    print("Rows  :", len(good))
+    if args.out_format != "cols":
+        print("Report:", report_path)
+    if args.out_format != "csv":
+        print("Cols  :", cols_path)
+    print("Rows  :", good_count)
+    if selector is not None:
+        mode = "top" if args.top is not None else "bottom"
+        scope = " per grade" if args.per_grade else ""
+        print("Kept  :", len(sorted_rows), f"({mode} {k}{scope})")
+    if runs:
+        print("Runs  :", len(runs), "(external merge sort)")
     if errors_path:
-        print("Errors:", errors_path, f"({len(errors)} bad rows)")
+        print("Errors:", errors_path, f"({error_count} bad rows)")
     else:
         print("Errors: none")
 
@@ -6,11 +6,26 @@ Goal:
   - Write report.csv on the fly
   - Write errors.csv on the fly
   - Keep schema validation + type conversion + computed columns
+  - --incremental: resume from a byte-offset checkpoint, append only new rows
+    (--verify-full: re-hash the whole processed prefix instead of samples)
+  - Batched writes (--write-batch rows per block) + --fsync policy
+  - Staged pipeline: reader thread -> N parse workers -> writer thread
+    (bounded queue, output in input order, --metrics per stage)
+  - --grading policy.json: custom bands / pass mark / cohort curves; each
+    batch is graded as a column (grading.Grader.grade_column)
 """
 
+import argparse
 import csv
+import io
+from functools import partial
 from pathlib import Path
 
+import batch_writer
+import checkpoint
+import grading
+import pipeline
+
 
 REQUIRED_COLUMNS = {"id", "name", "score"}
 
@@ -23,18 +38,104 @@ def parse_row(row: dict) -> dict:
     }
 
 
-def grade(score: float) -> str:
-    if score >= 90:
-        return "A"
-    if score >= 80:
-        return "B"
-    if score >= 70:
-        return "C"
-    if score >= 60:
-        return "D"
-    return "F"
+def parse_batch(batch: list[tuple[int, dict]],
+                policy: grading.GradingPolicy = grading.DEFAULT_POLICY) -> tuple[list[tuple], list[dict]]:
+    """(line_no, row) pairs -> (report rows, error rows). Module level so process workers can pickle it."""
+    parsed = []
+    bad = []
+    for line_no, row in batch:
+        try:
+            r = parse_row(row)
+            parsed.append((r["id"], r["name"], r["score"], row))
+        except Exception as e:
+            out = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
+            out["line_no"] = line_no
+            out["error"] = str(e)
+            bad.append(out)
+
+    if policy.has_cohorts:
+        good = []
+        for rid, name, s, row in parsed:
+            gr = policy.for_row(row)
+            good.append((rid, name, f"{s:.2f}", gr.passed(s), gr.grade(s)))
+        return good, bad
+    # one policy for the whole batch: grade the score column in one go
+    scores = [p[2] for p in parsed]
+    grader = policy.base
+    good = list(zip(
+        [p[0] for p in parsed], [p[1] for p in parsed], [f"{s:.2f}" for s in scores],
+        grader.passed_column(scores), grader.grade_column(scores),
+    ))
+    return good, bad
+
+
+def positive_int(s: str) -> int:
+    n = int(s)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1: {s}")
+    return n
+
 
 def main():
+    parser = argparse.ArgumentParser(description="streaming report.csv + errors.csv")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="append-only input: only process rows added since the last run",
+    )
+    parser.add_argument(
+        "--verify-full",
+        action="store_true",
+        help="with --incremental: re-hash every processed byte before resuming "
+             "(reads the whole processed prefix again; default checks sampled blocks + the tail)",
+    )
+    parser.add_argument(
+        "--write-batch",
+        type=positive_int,
+        default=batch_writer.DEFAULT_BATCH_ROWS,
+        help=f"rows buffered per output write (default: {batch_writer.DEFAULT_BATCH_ROWS})",
+    )
+    parser.add_argument(
+        "--fsync",
+        choices=batch_writer.FSYNC_POLICIES,
+        default="none",
+        help="durability: none (default), batch (after every block) or close (once at the end)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=2,
+        help="parse workers in the pipeline (default: 2)",
+    )
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="parse in worker processes instead of threads",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="print per-stage throughput and queue depth",
+    )
+    parser.add_argument(
+        "--grading",
+        type=Path,
+        default=None,
+        help="grading policy JSON (bands, pass_score, cohort curves); default A>=90 .. D>=60, pass >= 80",
+    )
+    args = parser.parse_args()
+    if args.verify_full and not args.incremental:
+        parser.error("--verify-full needs --incremental")
+
+    policy = grading.DEFAULT_POLICY
+    if args.grading:
+        try:
+            policy = grading.load_policy(args.grading)
+        except grading.PolicyError as e:
+            print("ERROR:", e)
+            return
+    options = {"grading": policy.spec} if args.grading else {}
+
     scripts_dir = Path(__file__).resolve().parent
     project_root = scripts_dir.parent
 
@@ -51,8 +152,27 @@ def main():
     good_count = 0
     bad_count = 0
 
-    with in_path.open("r", encoding="utf-8", newline="") as f_in:
-        reader = csv.DictReader(f_in)
+    ckpt_path = checkpoint.checkpoint_path(report_path)
+    resume = None
+    end = None
+    if args.incremental:
+        end = checkpoint.complete_rows_end(in_path)
+        resume = checkpoint.prepare_resume(ckpt_path, in_path, report_path, errors_path, options=options,
+                                            verify_full=args.verify_full)
+
+    first_line = 2
+    out_mode = "w"
+
+    with in_path.open("rb") as f_raw:
+        if resume:
+            lines = checkpoint.iter_lines(f_raw, resume["offset"], end)
+            reader = csv.DictReader(lines, fieldnames=resume["fieldnames"])
+            first_line = resume["rows"] + 2
+            out_mode = "a"
+        elif args.incremental:
+            reader = csv.DictReader(checkpoint.iter_lines(f_raw, 0, end))
+        else:
+            reader = csv.DictReader(io.TextIOWrapper(f_raw, encoding="utf-8", newline=""))
 
         header = set(reader.fieldnames or [])
         missing = REQUIRED_COLUMNS - header
@@ -62,43 +182,52 @@ def main():
             return
         
         # Open outputs only after header validation passes
-        with report_path.open("w", encoding="utf-8", newline="") as f_rep, \
-             errors_path.open("w", encoding="utf-8", newline="") as f_err:
-
-            rep_writer = csv.DictWriter(f_rep, fieldnames=report_fields)
-            rep_writer.writeheader()
+        with report_path.open(out_mode, encoding="utf-8", newline="") as f_rep, \
+             errors_path.open(out_mode, encoding="utf-8", newline="") as f_err:
 
             err_fields = list(reader.fieldnames) + ["line_no", "error"]
-            err_writer = csv.DictWriter(f_err, fieldnames=err_fields)
-            err_writer.writeheader()
+            with batch_writer.BatchWriter(f_rep, report_fields, args.write_batch, args.fsync) as rep_writer, \
+                 batch_writer.BatchWriter(f_err, err_fields, args.write_batch, args.fsync) as err_writer:
+                if out_mode == "w":
+                    rep_writer.writeheader()
+                    err_writer.writeheader()
             
-            for line_no, row in enumerate(reader, start=2):
-                try:
-                    r = parse_row(row)
-                    s = r["score"]
-                    rep_writer.writerow(
-                        {
-                            "id": r["id"],
-                            "name": r["name"],
-                            "score": f"{s:.2f}",
-                            "passed": "yes" if s >= 80 else "no",
-                            "grade": grade(s),
-                        }
-                    )
-                    good_count += 1
-                except Exception as e:
-                    # write bad row immediately
-                    out = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
-                    out["line_no"] = line_no
-                    out["error"] = str(e)
-                    err_writer.writerow(out)
-                    bad_count += 1
-                    
+                def write_batch(result):
+                    nonlocal good_count, bad_count
+                    good, bad = result
+                    rep_writer.writerows(good)
+                    err_writer.writerows(bad)
+                    good_count += len(good)
+                    bad_count += len(bad)
+
+                stages = pipeline.Pipeline(
+                    enumerate(reader, start=first_line), partial(parse_batch, policy=policy), write_batch,
+                    workers=args.workers, processes=args.processes,
+                )
+                stages.run()
+
+    if args.incremental:
+        checkpoint.save_checkpoint(ckpt_path, {
+            "input": str(in_path.resolve()),
+            "offset": end,
+            "rows": first_line - 2 + good_count + bad_count,
+            "fieldnames": list(reader.fieldnames),
+            "prefix_hash": checkpoint.prefix_hash(in_path, end, resume["prefix_hash"] if resume else None),
+            "sample_hash": checkpoint.sample_hash(in_path, end),
+            "report_bytes": report_path.stat().st_size,
+            "errors_bytes": errors_path.stat().st_size,
+            "options": options,
+        })
                     
     print("-" * 60)
     print("Input :", in_path)
+    if args.incremental:
+        print("Mode  :", f"incremental, resumed at byte {resume['offset']}" if resume else "incremental, full rebuild")
     print("Report:", report_path, f"({good_count} rows)")
     print("Errors:", errors_path, f"({bad_count} rows)")
+    if args.metrics:
+        for line in stages.format_metrics():
+            print(line)
 
 
 if __name__ == "__main__":
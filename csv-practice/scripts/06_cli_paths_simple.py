@@ -4,12 +4,15 @@ CLI paths (simple sys.argv)
 Goal:
   - input CSV path from CLI
   - optional output directory from CLI
-  - stream processing + write report/errors
+  - stream processing + write report/errors (batched writes)
 """
 import csv
 import sys
 from pathlib import Path
 
+import batch_writer
+import grading
+
 
 REQUIRED_COLUMNS = {"id", "name", "score"}
 
@@ -22,16 +25,8 @@ def parse_row(row: dict) -> dict:
     }
 
 
-def grade(score: float) -> str:
-    if score >= 90:
-        return "A"
-    if score >= 80:
-        return "B"
-    if score >= 70:
-        return "C"
-    if score >= 60:
-        return "D"
-    return "F"
+# shared grade bands (grading.py), compiled once
+GRADER = grading.DEFAULT_POLICY.base
 
 def usage(prog: str) -> None:
     print("Usage:")
@@ -81,33 +76,25 @@ def main():
         with report_path.open("w", encoding="utf-8", newline="") as f_rep, \
              errors_path.open("w", encoding="utf-8", newline="") as f_err:
 
-            rep_writer = csv.DictWriter(f_rep, fieldnames=report_fields)
-            rep_writer.writeheader()
-
             err_fields = list(reader.fieldnames) + ["line_no", "error"]
-            err_writer = csv.DictWriter(f_err, fieldnames=err_fields)
-            err_writer.writeheader()
-
-            for line_no, row in enumerate(reader, start=2):
-                try:
-                    r = parse_row(row)
-                    s = r["score"]
-                    rep_writer.writerow(
-                        {
-                            "id": r["id"],
-                            "name": r["name"],
-                            "score": f"{s:.2f}",
-                            "passed": "yes" if s >= 80 else "no",
-                            "grade": grade(s),
-                        }
-                    )
-                    good_count += 1
-                except Exception as e:
-                    out = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
-                    out["line_no"] = line_no
-                    out["error"] = str(e)
-                    err_writer.writerow(out)
-                    bad_count += 1
+            # with: the last block is flushed even if a row raises
+            with batch_writer.BatchWriter(f_rep, report_fields) as rep_writer, \
+                 batch_writer.BatchWriter(f_err, err_fields) as err_writer:
+                rep_writer.writeheader()
+                err_writer.writeheader()
+
+                for line_no, row in enumerate(reader, start=2):
+                    try:
+                        r = parse_row(row)
+                        s = r["score"]
+                        rep_writer.writerow((r["id"], r["name"], f"{s:.2f}", GRADER.passed(s), GRADER.grade(s)))
+                        good_count += 1
+                    except Exception as e:
+                        out = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
+                        out["line_no"] = line_no
+                        out["error"] = str(e)
+                        err_writer.writerow(out)
+                        bad_count += 1
 
     print("-" * 60)
     print("Input :", in_path)
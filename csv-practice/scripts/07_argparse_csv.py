@@ -1,19 +1,61 @@
 """
 Argparse CLI + options
     - Use argparse (clean help, defaults)
-    - INPUT.csv required
+    - INPUT.csv required (or several files / globs / directories)
     - --out-dir optinal (default: input folder)
     - --min-score optional filter
+    - --workers N: split input into row-aligned shards and use a process pool
+    - --incremental: resume from a byte-offset checkpoint, append only new rows
+      (--verify-full: re-hash the whole processed prefix instead of samples)
+    - --reader mmap: scan raw bytes via mmap, decode only id/name/score
+    - many inputs: one file per worker, combined report with source_file
+      (or --per-file reports)
+    - --out-format cols|both: typed columnar report.cols/ next to / instead of report.csv
+    - stats.json: count/mean/min/max/variance/grades/percentiles from the same pass
+    - --write-batch / --fsync: batched report/errors writes + durability policy
+    - .csv.gz/.bz2/.xz/.zst inputs read directly; --compress for the outputs
+      ((de)compression runs in a background thread)
+    - --dedupe first|last|max-score: one row per id, the rest -> errors.csv (DUPLICATE_ID)
+    - --join roster.csv --on id: add the roster's columns to every report row
+      (hash join if the roster fits --join-memory, else sort-merge on disk)
+    - --sample N / --sample-fraction p (+ --sample-seek): preview a sample,
+      projected error rate / grades / mean with 95% confidence intervals
+    - --grading policy.json: custom bands / pass mark / cohort curves
+      (compiled to a lookup table or bisect, see grading.py)
+    - --cache: keep the parsed rows on disk (keyed by content hash); a rerun
+      with another --min-score only mmaps them and re-filters
     - Stream process and write report.csv + errors.csv
 """
 
 import argparse
+import contextlib
 import csv
-import re
-import sys
+import glob
+import io
+import json
+import os
+import random
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import batch_writer
+import checkpoint
+import cli_checks
+import columnar_store
+import compressed_io
+import csv_shards
+import dedupe
+import grading
+import join_engine
+import mmap_reader
+import parse_cache
+import sampling
+import score_stats
+
 REQUIERD_COLUMNS = {"id", "name", "score"}
+REPORT_FIELDS = ["id", "name", "score", "passed", "grade"]
 
 def parse_row(row: dict) -> dict:
     return {
@@ -23,23 +65,457 @@ def parse_row(row: dict) -> dict:
     }
 
 
-def grade(score: float) -> str:
-    if score >= 90:
-        return "A"
-    if score >= 80:
-        return "B"
-    if score >= 70:
-        return "C"
-    if score >= 60:
-        return "D"
-    return "F"
-
 def existing_file(p: str) -> Path:
     path = Path(p).expanduser()
     if not path.is_file():
         raise argparse.ArgumentTypeError(f"input file not found: {path}")
     return path
 
+def expand_inputs(items: list[str]) -> list[Path]:
+    """
+    Each item may be a file, a directory (-> its *.csv, compressed too) or a glob pattern.
+    Order is kept, duplicates dropped.
+    """
+    files: list[Path] = []
+    for item in items:
+        path = Path(item).expanduser()
+        if path.is_dir():
+            found = sorted(p for p in path.iterdir()
+                           if p.is_file() and compressed_io.plain_name(p).endswith(".csv"))
+        elif glob.has_magic(item):
+            found = [Path(p) for p in sorted(glob.glob(str(path), recursive=True)) if Path(p).is_file()]
+        else:
+            found = [existing_file(item)]
+        if not found:
+            raise argparse.ArgumentTypeError(f"no csv files match: {item}")
+        files.extend(found)
+
+    seen = set()
+    unique = []
+    for f in files:
+        key = f.resolve()
+        if key not in seen:
+            seen.add(key)
+            unique.append(f)
+    return unique
+
+def positive_int(s: str) -> int:
+    n = int(s)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1: {s}")
+    return n
+
+def parse_size(s: str) -> int:
+    """'512K' / '64M' / '2G' / '1000000' -> bytes"""
+    s = s.strip().upper()
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    try:
+        if s and s[-1] in units:
+            return int(float(s[:-1]) * units[s[-1]])
+        return int(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {s!r} (use e.g. 64M, 1G)")
+
+
+def process_rows(reader, rep_writer, err_writer, min_score, first_line: int,
+                 extra: dict | None = None, stats=None, deduper=None,
+                 numbered: bool = False, cache=None,
+                 policy: grading.GradingPolicy = grading.DEFAULT_POLICY) -> tuple[int, int, int]:
+    """
+    Stream rows -> report/errors. Returns (good, bad, filtered).
+    extra: constant columns added to every report/error row (e.g. source_file).
+    stats: optional ScoreStats fed with every row written to the report.
+    deduper: optional dedupe.Deduper (prepasses done); dropped duplicates are error rows.
+    numbered: reader already yields (line_no, row) pairs (e.g. a sample).
+    cache: optional parse_cache.CacheBuilder fed with every parsed row (before
+    the filter) and every error row.
+    policy: grading policy; with cohort curves each row picks its cohort's grader.
+    Report rows go out as tuples (REPORT_FIELDS order, then extra values).
+    """
+    good_count = 0
+    bad_count = 0
+    filtered_count = 0
+    extra_values = tuple(extra.values()) if extra else ()
+    grade_of, pass_score = policy.base.grade, policy.base.pass_score
+    by_cohort = policy.for_row if policy.has_cohorts else None
+    full_row = getattr(reader, "full_row", None)
+
+    for line_no, row in (reader if numbered else enumerate(reader, start=first_line)):
+        try:
+            r = parse_row(row)
+            s = r["score"]
+            if cache is not None:
+                cache.add(r["id"], r["name"], s)
+            if deduper is not None:
+                deduper.check(r["id"], s)
+
+            if min_score is not None and s < min_score:
+                filtered_count += 1
+                continue
+
+            if by_cohort is not None:
+                gr = by_cohort(row)
+                grade_of, pass_score = gr.grade, gr.pass_score
+            g = grade_of(s)
+            rep_writer.writerow(
+                (r["id"], r["name"], f"{s:.2f}", "yes" if s >= pass_score else "no", g) + extra_values
+            )
+            good_count += 1
+            if stats is not None:
+                stats.add(s, g)
+
+        except dedupe.IdIndexFull:
+            raise
+        except Exception as e:
+            if full_row is not None:
+                row = full_row()  # the mmap reader decoded only the columns it needed
+            out={k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
+            out["line_no"] = line_no
+            out["error"] = str(e)
+            if extra:
+                out.update(extra)
+            err_writer.writerow(out)
+            bad_count += 1
+            if cache is not None:
+                cache.add_error(out)
+
+    return good_count, bad_count, filtered_count
+
+
+def process_cached(cached, rep_writer, min_score, stats=None,
+                   policy: grading.GradingPolicy = grading.DEFAULT_POLICY) -> tuple[int, int]:
+    """
+    Same report rows as process_rows, from a parse cache hit (no csv parsing).
+    Returns (good, filtered); the error rows are copied by the caller.
+    The cache has no cohort column, so only the policy's uncurved bands apply.
+    """
+    good_count = 0
+    filtered_count = 0
+    grade_of, pass_score = policy.base.grade, policy.base.pass_score
+    for rid, name, s in cached:
+        if min_score is not None and s < min_score:
+            filtered_count += 1
+            continue
+        g = grade_of(s)
+        rep_writer.writerow((rid, name, f"{s:.2f}", "yes" if s >= pass_score else "no", g))
+        good_count += 1
+        if stats is not None:
+            stats.add(s, g)
+    return good_count, filtered_count
+
+
+def process_shard(job: tuple) -> tuple:
+    """
+    Worker: process one byte range and write its own part files.
+    Line numbers in the errors part are shard-relative (first row = 0);
+    the parent adds the real offset while merging.
+    """
+    in_path, start, end, fieldnames, rep_part, err_part, min_score, reader_kind, write_batch, policy = job
+
+    if reader_kind == "mmap":
+        reader = mmap_reader.MmapReader(in_path, mmap_columns(policy), start=start, end=end,
+                                        fieldnames=fieldnames)
+    else:
+        reader = csv_shards.read_shard(in_path, start, end, fieldnames)
+    try:
+        with rep_part.open("w", encoding="utf-8", newline="") as f_rep, \
+            err_part.open("w", encoding="utf-8", newline="") as f_err, \
+            batch_writer.BatchWriter(f_rep, REPORT_FIELDS, write_batch) as rep_writer, \
+            batch_writer.BatchWriter(f_err, list(fieldnames) + ["line_no", "error"], write_batch) as err_writer:
+                stats = score_stats.ScoreStats()
+                counts = process_rows(reader, rep_writer, err_writer, min_score, first_line=0, stats=stats,
+                                      policy=policy)
+    finally:
+        if reader_kind == "mmap":
+            reader.close()
+    return (*counts, stats)
+
+
+def run_sharded(in_path: Path, out_dir: Path, fieldnames: list[str], data_start: int,
+                f_rep, f_err, min_score, workers: int, reader_kind: str = "csv",
+                write_batch: int = batch_writer.DEFAULT_BATCH_ROWS,
+                policy: grading.GradingPolicy = grading.DEFAULT_POLICY) -> tuple:
+    n_shards = csv_shards.shard_count(in_path, workers)
+    bounds = csv_shards.find_row_boundaries(in_path, data_start, n_shards)
+
+    with tempfile.TemporaryDirectory(prefix=".shards_", dir=out_dir) as tmp:
+        tmp_dir = Path(tmp)
+        jobs = []
+        for i, (start, end) in enumerate(zip(bounds, bounds[1:])):
+            jobs.append((
+                in_path, start, end, fieldnames,
+                tmp_dir / f"report_{i:05d}.csv",
+                tmp_dir / f"errors_{i:05d}.csv",
+                min_score,
+                reader_kind,
+                write_batch,
+                policy,
+            ))
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(process_shard, jobs))
+
+        # line numbers: header is line 1, so shard k starts at 2 + rows before it
+        error_parts = []
+        line_offset = 2
+        for job, (good, bad, filtered, _) in zip(jobs, results):
+            error_parts.append((job[5], line_offset))
+            line_offset += good + bad + filtered
+
+        csv_shards.merge_parts([job[4] for job in jobs], f_rep, error_parts, f_err,
+                               line_col=len(fieldnames))
+
+    totals = [sum(r[i] for r in results) for i in range(3)]
+    stats = score_stats.ScoreStats()
+    for r in results:
+        stats.merge(r[3])
+    return totals[0], totals[1], totals[2], stats
+
+
+def id_score_pairs(in_path: Path, reader_kind: str):
+    """(id, score) of every valid row, for the dedupe prepasses."""
+    reader, close = open_reader(in_path, reader_kind)
+    try:
+        for row in reader:
+            try:
+                r = parse_row(row)
+            except Exception:
+                continue
+            yield r["id"], r["score"]
+    finally:
+        close()
+
+
+def mmap_columns(policy: grading.GradingPolicy) -> tuple:
+    """Columns the mmap reader must decode: id/name/score, plus the cohort for curves."""
+    if policy.has_cohorts:
+        return mmap_reader.DEFAULT_COLUMNS + (policy.cohort_column,)
+    return mmap_reader.DEFAULT_COLUMNS
+
+
+def open_reader(in_path: Path, reader_kind: str, columns=mmap_reader.DEFAULT_COLUMNS):
+    """Return (reader, close) for a whole input file (columns: what the mmap reader decodes)."""
+    if reader_kind == "mmap":
+        reader = mmap_reader.MmapReader(in_path, columns)
+        return reader, reader.close
+    f = compressed_io.open_text(in_path)
+    return csv.DictReader(f), f.close
+
+
+def process_file(job: tuple) -> tuple:
+    """
+    Worker: one whole input file -> its own report/errors files.
+    Line numbers are real per-file line numbers, source_file tags each row.
+    """
+    (in_path, rep_path, err_path, rep_fields, err_fields, extra, min_score, reader_kind, with_header,
+     write_batch, fsync, policy) = job
+
+    reader, close = open_reader(in_path, reader_kind, mmap_columns(policy))
+    try:
+        with compressed_io.open_output(rep_path) as f_rep, \
+            compressed_io.open_output(err_path) as f_err, \
+            batch_writer.BatchWriter(f_rep, rep_fields, write_batch, fsync) as rep_writer, \
+            batch_writer.BatchWriter(f_err, err_fields, write_batch, fsync) as err_writer:
+                if with_header:
+                    rep_writer.writeheader()
+                    err_writer.writeheader()
+                stats = score_stats.ScoreStats()
+                counts = process_rows(reader, rep_writer, err_writer, min_score, first_line=2,
+                                      extra=extra, stats=stats, policy=policy)
+        return (*counts, stats)
+    finally:
+        close()
+
+
+def output_stems(files: list[Path]) -> list[str]:
+    """
+    --per-file name stem for each input: its own stem, or stem_<position>
+    when two inputs share one (dir1/x.csv + dir2/x.csv, b.csv + b.csv.gz),
+    so no worker overwrites another's report.
+    """
+    stems = [Path(compressed_io.plain_name(f)).stem for f in files]
+    counts = Counter(stems)
+    taken = {s for s in stems if counts[s] == 1}
+    out = []
+    for i, stem in enumerate(stems, start=1):
+        if counts[stem] == 1:
+            out.append(stem)
+            continue
+        n = i
+        while f"{stem}_{n}" in taken:
+            n += len(stems)
+        taken.add(f"{stem}_{n}")
+        out.append(f"{stem}_{n}")
+    return out
+
+
+def run_multi(files: list[Path], out_dir: Path, min_score, workers: int, reader_kind: str,
+              per_file: bool, write_batch: int = batch_writer.DEFAULT_BATCH_ROWS,
+              fsync: str = "none", compress: str | None = None,
+              policy: grading.GradingPolicy = grading.DEFAULT_POLICY) -> int:
+    # validate every header up front: a bad file is reported, the rest still run
+    headers = {}
+    skipped = []
+    for f in files:
+        fieldnames = compressed_io.read_header(f)
+        missing = REQUIERD_COLUMNS - set(fieldnames)
+        if missing:
+            print(f"ERROR: {f}: missing required columns: {sorted(missing)}")
+            skipped.append(f)
+        else:
+            headers[f] = fieldnames
+    todo = [f for f in files if f in headers]
+
+    if per_file:
+        jobs = []
+        for f, stem in zip(todo, output_stems(todo)):
+            jobs.append((
+                f,
+                compressed_io.with_codec(out_dir / f"{stem}_report.csv", compress),
+                compressed_io.with_codec(out_dir / f"{stem}_errors.csv", compress),
+                REPORT_FIELDS, list(headers[f]) + ["line_no", "error"], None,
+                min_score, reader_kind, True, write_batch, fsync, policy,
+            ))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(process_file, jobs))
+        for job, (good, bad, filtered, _) in zip(jobs, results):
+            print(f"{job[0]}: {good} rows -> {job[1].name}, {bad} errors -> {job[2].name}")
+    else:
+        # union of input columns so files with extra columns still fit errors.csv
+        input_cols: list[str] = []
+        for f in todo:
+            input_cols += [c for c in headers[f] if c not in input_cols]
+        rep_fields = REPORT_FIELDS + ["source_file"]
+        err_fields = input_cols + ["source_file", "line_no", "error"]
+
+        report_path = compressed_io.with_codec(out_dir / "report.csv", compress)
+        errors_path = compressed_io.with_codec(out_dir / "errors.csv", compress)
+        with tempfile.TemporaryDirectory(prefix=".files_", dir=out_dir) as tmp:
+            tmp_dir = Path(tmp)
+            jobs = []
+            for i, f in enumerate(todo):
+                jobs.append((
+                    f, tmp_dir / f"report_{i:05d}.csv", tmp_dir / f"errors_{i:05d}.csv",
+                    rep_fields, err_fields, {"source_file": str(f)},
+                    min_score, reader_kind, False, write_batch, "none", policy,
+                ))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(process_file, jobs))
+
+            with compressed_io.open_output(report_path) as f_rep, \
+                compressed_io.open_output(errors_path) as f_err:
+                    csv.writer(f_rep).writerow(rep_fields)
+                    csv.writer(f_err).writerow(err_fields)
+                    csv_shards.append_parts([job[1] for job in jobs], f_rep)
+                    csv_shards.append_parts([job[2] for job in jobs], f_err)
+                    if fsync != "none":
+                        # parts are temporary; only the combined files need to be durable
+                        for f_out in (f_rep, f_err):
+                            f_out.flush()
+                            os.fsync(f_out.fileno())
+        print("Report  :", report_path)
+        print("Errors  :", errors_path)
+
+    good_count = sum(r[0] for r in results)
+    bad_count = sum(r[1] for r in results)
+    filtered_count = sum(r[2] for r in results)
+    stats = score_stats.ScoreStats()
+    for r in results:
+        stats.merge(r[3])
+    stats_path = out_dir / "stats.json"
+    score_stats.write_stats_json(stats_path, stats, inputs=[str(f) for f in todo], min_score=min_score)
+
+    print("-" * 60)
+    print("Inputs  :", len(files))
+    if skipped:
+        print("Skipped :", ", ".join(str(f) for f in skipped))
+    print("Out dir :", out_dir)
+    print("Rows    :", good_count)
+    print("Errors  :", bad_count)
+    print("Workers :", workers)
+    print("Stats   :", stats_path)
+    if min_score is not None:
+        print("Filtered:", filtered_count, f"(score < {min_score})")
+    return 2 if skipped else 0
+
+
+def parse_fraction(s: str) -> float:
+    p = float(s)
+    if not 0 < p <= 1:
+        raise argparse.ArgumentTypeError(f"must be in (0, 1]: {s}")
+    return p
+
+
+def run_sample(in_path: Path, out_dir: Path, args, policy: grading.GradingPolicy) -> int:
+    """Process only a sample of the rows and print projected stats for the whole input."""
+    rng = random.Random(args.seed)
+    reader, close = open_reader(in_path, args.reader, columns=None)  # sampled rows keep every column
+    try:
+        fieldnames = list(reader.fieldnames or [])
+        missing = REQUIERD_COLUMNS - set(fieldnames)
+        if missing:
+            print("ERROR: missing required columns:", sorted(missing))
+            print("Found columns: ", fieldnames)
+            return 2
+        if args.sample_seek:
+            _, data_start = csv_shards.header_info(in_path)
+            sample, row_bytes = sampling.seek_sample(in_path, args.sample, rng, fieldnames, data_start)
+            data_bytes = in_path.stat().st_size - data_start
+            population = round(data_bytes / row_bytes) if row_bytes else 0
+            mode = f"seek {args.sample}"
+        elif args.sample:
+            sample, population = sampling.reservoir(enumerate(reader, start=2), args.sample, rng)
+            mode = f"reservoir {args.sample}"
+        else:
+            sample, population = sampling.bernoulli(enumerate(reader, start=2), args.sample_fraction, rng)
+            mode = f"bernoulli p={args.sample_fraction}"
+    finally:
+        close()
+
+    report_path = out_dir / "sample_report.csv"
+    errors_path = out_dir / "sample_errors.csv"
+    stats = score_stats.ScoreStats()
+    with report_path.open("w", encoding="utf-8", newline="") as f_rep, \
+        errors_path.open("w", encoding="utf-8", newline="") as f_err, \
+        batch_writer.BatchWriter(f_rep, REPORT_FIELDS) as rep_writer, \
+        batch_writer.BatchWriter(f_err, fieldnames + ["line_no", "error"]) as err_writer:
+            rep_writer.writeheader()
+            err_writer.writeheader()
+            good, bad, filtered = process_rows(sample, rep_writer, err_writer, args.min_score, first_line=2,
+                                               stats=stats, numbered=True, policy=policy)
+
+    projection = sampling.project(good, bad, filtered, stats, population,
+                                  population_exact=not args.sample_seek)
+    stats_path = out_dir / "sample_stats.json"
+    with stats_path.open("w", encoding="utf-8") as f:
+        json.dump({"input": str(in_path), "mode": mode, "seed": args.seed, "min_score": args.min_score,
+                   "projection": projection, "sample_stats": stats.to_dict()}, f, indent=2)
+
+    def pct(share: dict) -> str:
+        lo, hi = share["ci95"]
+        return f"{share['rate']:.2%} (95% CI {lo:.2%} .. {hi:.2%})"
+
+    approx = "" if projection["population_exact"] else "~"
+    print("-" * 60)
+    print("Input   :", in_path)
+    print("Sample  :", mode, f"seed={args.seed}: {good + bad + filtered} of {approx}{population} rows")
+    print("Report  :", report_path, f"({good} rows)")
+    print("Errors  :", errors_path, f"({bad} rows)")
+    print("Stats   :", stats_path)
+    e = projection["errors"]
+    print("Error rate :", pct(e), f"-> ~{e['projected']} errors "
+          f"({e['projected_ci95'][0]} .. {e['projected_ci95'][1]})")
+    if "filtered" in projection:
+        print("Filtered   :", pct(projection["filtered"]))
+    if "mean_score" in projection:
+        m = projection["mean_score"]
+        print(f"Mean score : {m['estimate']:.2f} (95% CI {m['ci95'][0]:.2f} .. {m['ci95'][1]:.2f})")
+        for g, share in projection["grades"].items():
+            lo, hi = share["ci95"]
+            print(f"  grade {g}  : {share['share']:.2%} (95% CI {lo:.2%} .. {hi:.2%})")
+    return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="streaming report/errors with argparse options"
@@ -47,8 +523,8 @@ def main() -> int:
     
     parser.add_argument(
         "input_csv",
-        type=existing_file,
-        help="Path to input csv file"
+        nargs="+",
+        help="Input csv file(s), directories or glob patterns (quote globs)"
     )
     parser.add_argument(
         "--out-dir",
@@ -62,77 +538,370 @@ def main() -> int:
         default=None,
         help="only include rows with score >= this value"
     )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=1,
+        help="process shards of the input in N processes (default: 1 = single stream)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="append-only input: only process rows added since the last run"
+    )
+    parser.add_argument(
+        "--verify-full",
+        action="store_true",
+        help="with --incremental: re-hash every processed byte before resuming "
+             "(reads the whole processed prefix again; default checks sampled blocks + the tail)"
+    )
+    parser.add_argument(
+        "--reader",
+        choices=["csv", "mmap"],
+        default="csv",
+        help="row reader: csv.DictReader (default) or mmap byte scanner (only id/name/score decoded)"
+    )
+    parser.add_argument(
+        "--per-file",
+        action="store_true",
+        help="with several inputs: write <name>_report.csv/<name>_errors.csv per file"
+    )
+    parser.add_argument(
+        "--write-batch",
+        type=positive_int,
+        default=batch_writer.DEFAULT_BATCH_ROWS,
+        help=f"rows buffered per output write (default: {batch_writer.DEFAULT_BATCH_ROWS})"
+    )
+    parser.add_argument(
+        "--fsync",
+        choices=batch_writer.FSYNC_POLICIES,
+        default="none",
+        help="report/errors durability: none (default), batch (after every block) or close (once at the end)"
+    )
+    parser.add_argument(
+        "--compress",
+        choices=compressed_io.CODECS,
+        default=None,
+        help="write report/errors compressed (report.csv.gz, ...); inputs are detected by suffix"
+    )
+    parser.add_argument(
+        "--dedupe",
+        choices=dedupe.POLICIES,
+        default=None,
+        help="keep one row per id: first, last or max-score occurrence; the others go to errors.csv"
+    )
+    parser.add_argument(
+        "--join",
+        type=existing_file,
+        default=None,
+        metavar="ROSTER_CSV",
+        help="enrich report rows with the columns of this csv"
+    )
+    parser.add_argument(
+        "--on",
+        default="id",
+        help="join column, present in the report and the roster (default: id)"
+    )
+    parser.add_argument(
+        "--join-policy",
+        choices=join_engine.POLICIES,
+        default="left",
+        help="rows without a roster match: left = keep with empty columns (default), "
+             "inner = drop, report-missing = drop and list them in join_missing.csv"
+    )
+    parser.add_argument(
+        "--join-memory",
+        type=parse_size,
+        default=256 << 20,
+        help="hash-join the roster if it fits, else sort-merge on disk (default: 256M)"
+    )
+    sample_group = parser.add_mutually_exclusive_group()
+    sample_group.add_argument(
+        "--sample",
+        type=positive_int,
+        default=None,
+        metavar="N",
+        help="preview: process N rows picked uniformly at random (reservoir), print projected stats"
+    )
+    sample_group.add_argument(
+        "--sample-fraction",
+        type=parse_fraction,
+        default=None,
+        metavar="P",
+        help="preview: process each row with probability P (Bernoulli), print projected stats"
+    )
+    parser.add_argument(
+        "--sample-seek",
+        action="store_true",
+        help="with --sample: pick rows by seeking to random byte offsets instead of reading the whole file"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="random seed for the samplers (default: 42)"
+    )
+    parser.add_argument(
+        "--grading",
+        type=existing_file,
+        default=None,
+        metavar="POLICY_JSON",
+        help="grading policy: bands, pass_score, cohort curves (default: A>=90 B>=80 C>=70 D>=60, pass >= 80)"
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="cache the parsed rows on disk; reruns over the same input only re-filter"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=parse_cache.DEFAULT_DIR,
+        help=f"parse cache folder (default: {parse_cache.DEFAULT_DIR})"
+    )
+    parser.add_argument(
+        "--cache-max",
+        type=parse_size,
+        default=parse_cache.DEFAULT_MAX_BYTES,
+        help="total parse cache size; least recently used entries go first (default: 1G)"
+    )
+    parser.add_argument(
+        "--out-format",
+        choices=["csv", "cols", "both"],
+        default="csv",
+        help="report as csv (default), typed columns (report.cols/) or both"
+    )
     
     args = parser.parse_args()
+    if args.join and args.on not in REPORT_FIELDS:
+        parser.error(f"--on must be a report column: {', '.join(REPORT_FIELDS)}")
+    try:
+        files = expand_inputs(args.input_csv)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    policy = grading.DEFAULT_POLICY
+    if args.grading:
+        try:
+            policy = grading.load_policy(args.grading)
+        except grading.PolicyError as e:
+            print("ERROR:", e)
+            return 2
+    conflict = cli_checks.first_conflict(args, files, policy)
+    if conflict:
+        parser.error(conflict)
+    sampling_mode = args.sample is not None or args.sample_fraction is not None
+
+    if len(files) > 1:
+        out_dir: Path = args.out_dir.expanduser() if args.out_dir else files[0].parent
+        out_dir.mkdir(parents=True, exist_ok=True)
+        return run_multi(files, out_dir, args.min_score, args.workers, args.reader, args.per_file,
+                         args.write_batch, args.fsync, args.compress, policy)
     
-    in_path: Path = args.input_csv
+    in_path: Path = files[0]
     out_dir: Path = args.out_dir.expanduser() if args.out_dir else in_path.parent
     out_dir.mkdir(parents=True, exist_ok=True)
+
+    if sampling_mode:
+        return run_sample(in_path, out_dir, args, policy)
     
-    report_path = out_dir / "report.csv"
-    errors_path = out_dir / "errors.csv"
-    
-    report_fields = ["id", "name", "score", "passed", "grade"]
-    
-    good_count = 0
-    bad_count = 0
-    fileterd_count = 0
+    report_path = compressed_io.with_codec(out_dir / "report.csv", args.compress)
+    errors_path = compressed_io.with_codec(out_dir / "errors.csv", args.compress)
+    cols_path = columnar_store.columns_path(out_dir / "report.csv")
+    missing_path = compressed_io.with_codec(out_dir / "join_missing.csv", args.compress)
+    # cols only: the csv writer still runs but nothing lands on disk
+    report_target = Path(os.devnull) if args.out_format == "cols" else report_path
+
+    ckpt_path = checkpoint.checkpoint_path(report_path)
+    options = {"min_score": args.min_score}
+    if args.grading:
+        options["grading"] = policy.spec
+    resume = None
+    end = None
+    if args.incremental:
+        end = checkpoint.complete_rows_end(in_path)
+        resume = checkpoint.prepare_resume(ckpt_path, in_path, report_path, errors_path, options,
+                                            verify_full=args.verify_full)
+
+    first_line = 2
+    out_mode = "w"
+    # incremental runs continue the stats saved with the checkpoint
+    stats = score_stats.ScoreStats.from_state(resume.get("stats")) if resume else score_stats.ScoreStats()
     
-    with in_path.open("r", encoding="utf-8", newline="") as f_in:
-        reader = csv.DictReader(f_in, fieldnames=report_fields)
-        
-        header = set(reader.fieldnames or [])
-        missing = REQUIERD_COLUMNS - header
-        if missing:
-            print("ERROR: missing required columns:", sorted(missing))
-            print("Found columns: ", reader.fieldnames)
-            return 2
-        
-        with report_path.open("w", encoding="utf-8", newline="") as f_rep, \
-            errors_path.open("w", encoding="utf-8", newline="") as f_err:
-                
-                rep_writer = csv.DictWriter(f_rep, fieldnames=report_fields)
+    try:
+        # every input/output below is closed by the stack, also on an early return or an error
+        with contextlib.ExitStack() as stack:
+            f_raw = stack.enter_context(compressed_io.open_input(in_path))
+            if args.reader == "mmap":
+                if resume:
+                    reader = mmap_reader.MmapReader(
+                        in_path, mmap_columns(policy), start=resume["offset"], end=end,
+                        fieldnames=resume["fieldnames"]
+                    )
+                    first_line = resume["rows"] + 2
+                    out_mode = "a"
+                else:
+                    reader = mmap_reader.MmapReader(in_path, mmap_columns(policy), end=end)
+                stack.enter_context(reader)
+            elif resume:
+                lines = checkpoint.iter_lines(f_raw, resume["offset"], end)
+                reader = csv.DictReader(lines, fieldnames=resume["fieldnames"])
+                first_line = resume["rows"] + 2
+                out_mode = "a"
+            elif args.incremental:
+                reader = csv.DictReader(checkpoint.iter_lines(f_raw, 0, end))
+            else:
+                reader = csv.DictReader(io.TextIOWrapper(f_raw, encoding="utf-8", newline=""))
+
+            header = set(reader.fieldnames or [])
+            missing = REQUIERD_COLUMNS - header
+            if missing:
+                print("ERROR: missing required columns:", sorted(missing))
+                print("Found columns: ", reader.fieldnames)
+                return 2
+            if policy.has_cohorts and policy.cohort_column not in header:
+                print(f"WARNING: no {policy.cohort_column!r} column in the input; cohort curves are not applied")
+
+            cached = cache_builder = None
+            if args.cache:
+                cache = parse_cache.ParseCache(args.cache_dir, args.cache_max)
+                cache_key = cache.key(in_path, variant=args.reader)
+                cached = cache.lookup(cache_key)
+                if cached is not None:
+                    stack.enter_context(cached)
+                else:
+                    # discarded on exit unless commit() ran
+                    cache_builder = stack.enter_context(cache.builder(cache_key, in_path, reader.fieldnames))
+
+            deduper = None
+            if args.dedupe:
+                # last / max-score need to see every id before the report pass
+                deduper = dedupe.Deduper(args.dedupe)
+                if deduper.passes >= 1:
+                    deduper.count_pass(id_score_pairs(in_path, args.reader))
+                if deduper.passes >= 2:
+                    deduper.best_pass(id_score_pairs(in_path, args.reader))
+
+            roster = None
+            report_fields = REPORT_FIELDS
+            if args.join:
+                try:
+                    roster = join_engine.Roster(args.join, args.on)
+                except ValueError as e:
+                    print("ERROR:", e)
+                    return 2
+                # roster columns that clash with report columns get a prefix
+                report_fields = REPORT_FIELDS + [c if c not in REPORT_FIELDS else f"roster_{c}"
+                                                 for c in roster.extra_cols]
+
+            f_rep = stack.enter_context(compressed_io.open_output(report_target, out_mode))
+            f_err = stack.enter_context(compressed_io.open_output(errors_path, out_mode))
+            csv_writer = stack.enter_context(
+                batch_writer.BatchWriter(f_rep, report_fields, args.write_batch, args.fsync))
+            rep_writer = csv_writer
+            col_writer = None
+            joiner = None
+            if roster is not None:
+                join_tmp = stack.enter_context(tempfile.TemporaryDirectory(prefix=".join_", dir=out_dir))
+                missing_writer = None
+                if args.join_policy == "report-missing":
+                    f_missing = stack.enter_context(compressed_io.open_output(missing_path))
+                    missing_writer = stack.enter_context(
+                        batch_writer.BatchWriter(f_missing, REPORT_FIELDS, args.write_batch))
+                joiner = join_engine.JoinWriter(
+                    csv_writer, roster, args.join_policy, args.join_memory, Path(join_tmp),
+                    missing=missing_writer, key_index=REPORT_FIELDS.index(args.on),
+                )
+                rep_writer = joiner
+            if args.out_format != "csv":
+                # an error exit leaves the previous report.cols in place
+                col_writer = stack.enter_context(columnar_store.ColumnWriter(cols_path, policy.grades))
+                if args.out_format == "cols":
+                    rep_writer = col_writer
+                else:
+                    rep_writer = columnar_store.TeeWriter(rep_writer, col_writer)
+            err_fields = list(reader.fieldnames) + ["line_no", "error"]
+            err_writer = stack.enter_context(
+                batch_writer.BatchWriter(f_err, err_fields, args.write_batch, args.fsync))
+            if out_mode == "w":
                 rep_writer.writeheader()
-                
-                err_fields = list(reader.fieldnames) + ["line_no", "error"]
-                err_writer = csv.DictWriter(f_err, fieldnames=err_fields)
                 err_writer.writeheader()
-                
-                for line_no, row in enumerate(reader, start=2):
-                    try:
-                        r = parse_row(row)
-                        s = r["score"]
-                        
-                        if args.min_score is not None and s < args.min_score:
-                            filtered_count += 1
-                            continue
-                        
-                        rep_writer.writerow(
-                            {
-                                "id": r["id"],
-                                "name":r["name"],
-                                "score":f"{s:.2f}",
-                                "passed": "yes" if s >= 80 else "no",
-                                "grade": grade(s),
-                            }
-                        )
-                        good_count += 1
-                    
-                    except Exception as e:
-                        out={k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
-                        out["line_no"] = line_no
-                        out["error"] = str(e)
-                        err_writer.writerow(out)
-                        bad_count += 1
+
+            if args.workers > 1:
+                fieldnames, data_start = csv_shards.header_info(in_path)
+                good_count, bad_count, filtered_count, stats = run_sharded(
+                    in_path, out_dir, fieldnames, data_start,
+                    f_rep, f_err, args.min_score, args.workers, args.reader, args.write_batch, policy,
+                )
+            elif cached is not None:
+                good_count, filtered_count = process_cached(cached, rep_writer, args.min_score, stats, policy)
+                bad_count = cached.errors
+                cached.copy_errors(f_err)
+            else:
+                good_count, bad_count, filtered_count = process_rows(
+                    reader, rep_writer, err_writer, args.min_score, first_line=first_line,
+                    stats=stats, deduper=deduper, cache=cache_builder, policy=policy,
+                )
+                if cache_builder is not None and not cache_builder.commit():
+                    print(f"WARNING: parse cache not stored: {cache_builder.skipped}")
+                    cache_builder = None
+            if joiner is not None:
+                # sort-merge: the actual join happens here
+                joiner.close()
+        # leaving the stack wrote the last blocks (+ fsync) before the checkpoint records output sizes
+    except dedupe.IdIndexFull as e:
+        print("ERROR:", e)
+        return 2
+
+    if args.incremental:
+        checkpoint.save_checkpoint(ckpt_path, {
+            "input": str(in_path.resolve()),
+            "offset": end,
+            "rows": first_line - 2 + good_count + bad_count + filtered_count,
+            "fieldnames": list(reader.fieldnames),
+            "prefix_hash": checkpoint.prefix_hash(in_path, end, resume["prefix_hash"] if resume else None),
+            "sample_hash": checkpoint.sample_hash(in_path, end),
+            "report_bytes": report_path.stat().st_size,
+            "errors_bytes": errors_path.stat().st_size,
+            "options": options,
+            "stats": stats.state(),
+        })
+
+    stats_path = out_dir / "stats.json"
+    score_stats.write_stats_json(stats_path, stats, inputs=[str(in_path)], min_score=args.min_score)
                         
     print("-" * 60)
     print("Input   :", in_path)
     print("Out dir :", out_dir)
-    print("Report  :", report_path, f"({good_count} rows)")
+    report_rows = good_count
+    if roster is not None:
+        report_rows = joiner.matched + (joiner.unmatched if args.join_policy == "left" else 0)
+    if args.out_format != "cols":
+        print("Report  :", report_path, f"({report_rows} rows)")
+    if args.out_format != "csv":
+        print("Columns :", cols_path, f"({good_count} rows)")
     print("Errors  :", errors_path, f"({bad_count} rows)")
+    print("Stats   :", stats_path)
+    if args.workers > 1:
+        print("Workers :", args.workers)
+    if args.grading:
+        print("Grading :", policy.describe())
+    if args.cache:
+        if cached is not None:
+            print("Cache   :", "hit, re-filtered the cached rows")
+        elif cache_builder is not None:
+            print("Cache   :", f"miss, parsed rows stored in {args.cache_dir}")
+    if args.incremental:
+        print("Mode    :", f"incremental, resumed at byte {resume['offset']}" if resume else "incremental, full rebuild")
     
+    if roster is not None:
+        print("Join    :", f"{args.join} on {args.on} ({joiner.strategy}, {args.join_policy}):",
+              f"matched {joiner.matched}, unmatched {joiner.unmatched}, roster dupes {roster.dupes}")
+        if args.join_policy == "report-missing":
+            print("Missing :", missing_path, f"({joiner.unmatched} rows)")
+    if deduper is not None:
+        print("Dupes   :", deduper.dropped, f"(--dedupe {args.dedupe}, in errors.csv as {dedupe.DUPLICATE_ID})")
     if args.min_score is not None:
-        print("Filtered:", fileterd_count, f"(score < {args.min_score})")
+        print("Filtered:", filtered_count, f"(score < {args.min_score})")
         
         
     return 0
@@ -140,4 +909,3 @@ def main() -> int:
 
 if __name__ == "__main__":
     raise SystemExit(main())
-                            
\ No newline at end of file
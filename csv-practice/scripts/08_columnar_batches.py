@@ -0,0 +1,218 @@
+"""
+Columnar batches (typed arrays instead of per-row dicts)
+
+Goal:
+  - Read rows in chunks with csv.reader (lists, not dicts)
+  - Convert each chunk into typed columns:
+        id    -> array('q')  (int64)
+        score -> array('d')  (float64)
+  - Compute passed/grade for the whole chunk at once
+    (grading.Grader.grade_column: bisect over the band cut points ==
+    numpy.searchsorted, stdlib only)
+  - Bad rows go to errors.csv, the rest of the batch keeps going
+    (line_no numbers the data records from 2, header = 1, as in 05/07:
+    blank lines are skipped and not counted)
+  - --bench: time this path against the 05 style dict path
+"""
+
+import argparse
+import csv
+import time
+from array import array
+from pathlib import Path
+
+import grading
+
+REQUIRED_COLUMNS = {"id", "name", "score"}
+REPORT_FIELDS = ["id", "name", "score", "passed", "grade"]
+
+# shared grade bands (grading.py), compiled once
+GRADER = grading.DEFAULT_POLICY.base
+
+
+class Batch:
+    __slots__ = ("first_line", "ids", "names", "scores", "errors")
+
+    def __init__(self, first_line: int):
+        self.first_line = first_line
+        self.ids = array("q")
+        self.names: list[str] = []
+        self.scores = array("d")
+        self.errors: list[list] = []
+
+
+def convert_batch(rows: list[list[str]], idx: tuple[int, int, int], first_line: int) -> Batch:
+    """
+    Fast path: convert whole columns with map(int/float) in one go.
+    If anything in the chunk is bad, redo it row by row so only the
+    bad rows are rejected.
+    """
+    i_id, i_name, i_score = idx
+    batch = Batch(first_line)
+
+    try:
+        batch.ids = array("q", map(int, [r[i_id] for r in rows]))
+        batch.scores = array("d", map(float, [r[i_score] for r in rows]))
+        batch.names = list(map(str.strip, [r[i_name] for r in rows]))
+        return batch
+    except (ValueError, IndexError, OverflowError):
+        batch = Batch(first_line)
+
+    for j, r in enumerate(rows):
+        try:
+            rid = int(r[i_id])
+            score = float(r[i_score])
+            name = r[i_name].strip()
+        except (ValueError, IndexError, OverflowError) as e:
+            batch.errors.append([v.strip() for v in r] + [first_line + j, str(e)])
+            continue
+        batch.ids.append(rid)
+        batch.scores.append(score)
+        batch.names.append(name)
+    return batch
+
+
+def iter_batches(reader, idx: tuple[int, int, int], batch_size: int):
+    line_no = 2
+    rows = []
+    for row in reader:
+        if not row:
+            continue  # blank line: csv.DictReader skips these too (and they are not counted)
+        rows.append(row)
+        if len(rows) >= batch_size:
+            yield convert_batch(rows, idx, line_no)
+            line_no += len(rows)
+            rows = []
+    if rows:
+        yield convert_batch(rows, idx, line_no)
+
+
+def run_columnar(in_path: Path, report_path: Path, errors_path: Path, batch_size: int) -> tuple[int, int]:
+    good_count = 0
+    bad_count = 0
+
+    with in_path.open("r", encoding="utf-8", newline="") as f_in:
+        reader = csv.reader(f_in)
+        fieldnames = [h.strip() for h in next(reader, [])]
+        missing = REQUIRED_COLUMNS - set(fieldnames)
+        if missing:
+            print("ERROR: missing required columns:", sorted(missing))
+            print("Found columns:", fieldnames)
+            return -1, -1
+        idx = (fieldnames.index("id"), fieldnames.index("name"), fieldnames.index("score"))
+
+        with report_path.open("w", encoding="utf-8", newline="") as f_rep, \
+             errors_path.open("w", encoding="utf-8", newline="") as f_err:
+
+            rep_writer = csv.writer(f_rep)
+            rep_writer.writerow(REPORT_FIELDS)
+            err_writer = csv.writer(f_err)
+            err_writer.writerow(fieldnames + ["line_no", "error"])
+
+            for batch in iter_batches(reader, idx, batch_size):
+                rep_writer.writerows(zip(
+                    batch.ids,
+                    batch.names,
+                    map("{:.2f}".format, batch.scores),
+                    GRADER.passed_column(batch.scores),
+                    GRADER.grade_column(batch.scores),
+                ))
+                err_writer.writerows(batch.errors)
+                good_count += len(batch.ids)
+                bad_count += len(batch.errors)
+
+    return good_count, bad_count
+
+
+# ---------------- 05 style dict path (for --bench) ----------------
+
+def parse_row(row: dict) -> dict:
+    return {
+        "id": int(row["id"].strip()),
+        "name": row["name"].strip(),
+        "score": float(row["score"].strip()),
+    }
+
+
+def run_dict_path(in_path: Path, report_path: Path, errors_path: Path) -> tuple[int, int]:
+    good_count = 0
+    bad_count = 0
+    with in_path.open("r", encoding="utf-8", newline="") as f_in, \
+         report_path.open("w", encoding="utf-8", newline="") as f_rep, \
+         errors_path.open("w", encoding="utf-8", newline="") as f_err:
+        reader = csv.DictReader(f_in)
+        rep_writer = csv.DictWriter(f_rep, fieldnames=REPORT_FIELDS)
+        rep_writer.writeheader()
+        err_writer = csv.DictWriter(f_err, fieldnames=list(reader.fieldnames) + ["line_no", "error"])
+        err_writer.writeheader()
+        for line_no, row in enumerate(reader, start=2):
+            try:
+                r = parse_row(row)
+                s = r["score"]
+                rep_writer.writerow({
+                    "id": r["id"],
+                    "name": r["name"],
+                    "score": f"{s:.2f}",
+                    "passed": GRADER.passed(s),
+                    "grade": GRADER.grade(s),
+                })
+                good_count += 1
+            except Exception as e:
+                out = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
+                out["line_no"] = line_no
+                out["error"] = str(e)
+                err_writer.writerow(out)
+                bad_count += 1
+    return good_count, bad_count
+
+
+def main() -> int:
+    scripts_dir = Path(__file__).resolve().parent
+    project_root = scripts_dir.parent
+
+    parser = argparse.ArgumentParser(description="columnar batch report (typed arrays + bisect grading)")
+    parser.add_argument("--input", type=Path, default=project_root / "playground" / "out" / "sample.csv",
+                        help="Input CSV (default: playground/out/sample.csv)")
+    parser.add_argument("--out-dir", type=Path, default=None, help="Output directory (default: input folder)")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Rows per batch (default: 50000)")
+    parser.add_argument("--bench", action="store_true", help="Also run the dict path and compare rows/sec")
+    args = parser.parse_args()
+
+    in_path: Path = args.input.expanduser()
+    out_dir: Path = args.out_dir.expanduser() if args.out_dir else in_path.parent
+
+    if not in_path.is_file():
+        print("ERROR: input CSV not found:", in_path)
+        return 2
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    report_path = out_dir / "report.csv"
+    errors_path = out_dir / "errors.csv"
+
+    t0 = time.perf_counter()
+    good_count, bad_count = run_columnar(in_path, report_path, errors_path, max(1, args.batch_size))
+    dt_col = time.perf_counter() - t0
+    if good_count < 0:
+        return 2
+
+    print("-" * 60)
+    print("Input :", in_path)
+    print("Report:", report_path, f"({good_count} rows)")
+    print("Errors:", errors_path, f"({bad_count} rows)")
+
+    if args.bench:
+        t0 = time.perf_counter()
+        run_dict_path(in_path, out_dir / "report_dict.csv", out_dir / "errors_dict.csv")
+        dt_dict = time.perf_counter() - t0
+
+        total = good_count + bad_count
+        print("-" * 60)
+        print(f"columnar: {dt_col:.3f} sec  ({total / dt_col:,.0f} rows/sec)")
+        print(f"dict    : {dt_dict:.3f} sec  ({total / dt_dict:,.0f} rows/sec)")
+        print(f"speedup : {dt_dict / dt_col:.2f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
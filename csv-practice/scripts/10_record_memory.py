@@ -0,0 +1,97 @@
+"""
+Memory per row: dict vs __slots__ record vs struct-of-arrays
+
+Goal:
+  - Parse every good row of a CSV and keep it in memory three ways:
+        dict         {"id": .., "name": .., "score": ..}   (old parse_row)
+        ScoreRecord  __slots__ object                      (new parse_row)
+        columns      array('q') + list[str] + array('d')   (08 style)
+  - Measure with tracemalloc, print bytes per row for each
+  - Make a big input with: python 09_mmap_reader_bench.py big.csv --generate 5000000
+"""
+
+import argparse
+import csv
+import gc
+import tracemalloc
+from array import array
+from pathlib import Path
+
+from score_record import ScoreRecord
+
+
+def load_dicts(path: Path) -> list:
+    rows = []
+    with path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                rows.append({"id": int(row["id"]), "name": str(row["name"]), "score": float(row["score"])})
+            except Exception:
+                pass
+    return rows
+
+
+def load_records(path: Path) -> list:
+    rows = []
+    with path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                rows.append(ScoreRecord(int(row["id"]), str(row["name"]), float(row["score"])))
+            except Exception:
+                pass
+    return rows
+
+
+def load_columns(path: Path) -> tuple:
+    ids = array("q")
+    names = []
+    scores = array("d")
+    with path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                rid, name, score = int(row["id"]), str(row["name"]), float(row["score"])
+            except Exception:
+                continue
+            ids.append(rid)
+            names.append(name)
+            scores.append(score)
+    return ids, names, scores
+
+
+def measure(loader, path: Path) -> tuple[int, int]:
+    """Return (bytes still held by the result, peak bytes while loading)."""
+    gc.collect()
+    tracemalloc.start()
+    result = loader(path)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    gc.collect()
+    return current, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="tracemalloc: bytes per in-memory row")
+    parser.add_argument("input_csv", type=Path, help="CSV with id,name,score")
+    args = parser.parse_args()
+
+    path: Path = args.input_csv.expanduser()
+    if not path.is_file():
+        print("ERROR: input CSV not found:", path)
+        return 2
+
+    n_rows = len(load_columns(path)[0])
+    if n_rows == 0:
+        print("No good rows in", path)
+        return 0
+
+    print(f"Input: {path} ({n_rows} good rows)")
+    print("-" * 60)
+    for label, loader in (("dict", load_dicts), ("ScoreRecord", load_records), ("columns", load_columns)):
+        current, peak = measure(loader, path)
+        print(f"{label:<12}: {current / n_rows:7.1f} bytes/row held | peak {peak / (1 << 20):8.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
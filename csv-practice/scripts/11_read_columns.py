@@ -0,0 +1,44 @@
+"""
+Read a columnar report (no text parsing)
+
+Goal:
+  - Open report.cols/ written with --out-format cols|both
+  - Scores/ids are memory-mapped typed views (memoryview over mmap)
+  - Print row count, mean/min/max score, grade counts, first rows
+"""
+
+import argparse
+from collections import Counter
+from pathlib import Path
+
+import columnar_store
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="summarize a report.cols folder")
+    parser.add_argument("cols_dir", type=Path, help="Path to report.cols (or report_grade.cols)")
+    parser.add_argument("--head", type=int, default=5, help="Print the first N rows (default: 5)")
+    args = parser.parse_args()
+
+    cols_dir: Path = args.cols_dir.expanduser()
+    if not (cols_dir / "meta.json").is_file():
+        print("ERROR: not a columnar report folder:", cols_dir)
+        return 2
+
+    with columnar_store.load_columns(cols_dir) as cols:
+        print("Folder:", cols_dir)
+        print("Rows  :", cols.rows)
+        if cols.rows:
+            scores = cols.score
+            print(f"Score : mean={sum(scores) / cols.rows:.2f} min={min(scores):.2f} max={max(scores):.2f}")
+            counts = Counter(cols.grade_code)
+            print("Grades:", {g: counts.get(i, 0) for i, g in enumerate(cols.grade_categories)})
+
+        print("-" * 60)
+        for i in range(min(args.head, cols.rows)):
+            print(cols.id[i], cols.name(i), cols.score[i], "yes" if cols.passed[i] else "no", cols.grade(i))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+"""
+Benchmark: plain vs compressed CSV input/output
+
+Goal:
+  - Compress the input once per codec (gz, bz2, xz, zst if available)
+  - Read + parse every row: plain file, codec inline (gzip.open & co),
+    codec with the background decompress thread (compressed_io)
+  - Write the same rows back: plain vs inline vs background compress thread
+  - Print sec / rows per sec / MB per sec (of uncompressed csv) for each
+  - CPU count is printed too: with one core the threads can't overlap
+"""
+
+import argparse
+import csv
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import compressed_io
+
+
+def parse_row(row: dict) -> dict:
+    return {
+        "id": int(row["id"].strip()),
+        "name": row["name"].strip(),
+        "score": float(row["score"].strip()),
+    }
+
+
+def consume(f) -> list[tuple]:
+    rows = []
+    for row in csv.DictReader(f):
+        try:
+            r = parse_row(row)
+            rows.append((r["id"], r["name"], f"{r['score']:.2f}"))
+        except Exception:
+            pass
+    return rows
+
+
+def inline_text(path: Path, mode: str):
+    opener = compressed_io.OPENERS[compressed_io.codec_for(path)]
+    return opener(path, mode + "t", encoding="utf-8", newline="")
+
+
+def time_read(open_fn, path: Path) -> tuple[float, list]:
+    t0 = time.perf_counter()
+    with open_fn(path) as f:
+        rows = consume(f)
+    return time.perf_counter() - t0, rows
+
+
+def time_write(open_fn, path: Path, rows: list) -> float:
+    t0 = time.perf_counter()
+    with open_fn(path) as f:
+        w = csv.writer(f)
+        w.writerow(["id", "name", "score"])
+        w.writerows(rows)
+    return time.perf_counter() - t0
+
+
+def report(label: str, dt: float, n_rows: int, size_mb: float, base: float) -> None:
+    print(f"{label:<16}: {dt:7.3f} sec | {n_rows / dt:11,.0f} rows/sec | {size_mb / dt:7.1f} MB/sec"
+          f" | {base / dt:5.2f}x plain")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="plain vs compressed csv read/write benchmark")
+    parser.add_argument("input_csv", type=Path, help="plain CSV to benchmark")
+    parser.add_argument("--codecs", nargs="+", choices=compressed_io.CODECS, default=list(compressed_io.CODECS),
+                        help="codecs to test (default: all available)")
+    args = parser.parse_args()
+
+    in_path: Path = args.input_csv.expanduser()
+    if not in_path.is_file() or compressed_io.codec_for(in_path):
+        print("ERROR: plain input CSV not found:", in_path)
+        return 2
+
+    size_mb = in_path.stat().st_size / (1 << 20)
+    print(f"Input: {in_path} ({size_mb:,.1f} MB)")
+    # the background thread only overlaps with parsing when there is a spare core
+    print("CPUs :", os.cpu_count())
+
+    with tempfile.TemporaryDirectory(prefix="csv_bench_") as tmp:
+        tmp_dir = Path(tmp)
+
+        def plain_text(path: Path):
+            return path.open("r", encoding="utf-8", newline="")
+
+        def plain_out(path: Path):
+            return path.open("w", encoding="utf-8", newline="")
+
+        base_read, rows = time_read(plain_text, in_path)
+        base_write = time_write(plain_out, tmp_dir / "plain.csv", rows)
+        print("-" * 78)
+        report("read plain", base_read, len(rows), size_mb, base_read)
+        report("write plain", base_write, len(rows), size_mb, base_write)
+
+        for codec in args.codecs:
+            packed = compressed_io.with_codec(tmp_dir / "input.csv", codec)
+            with in_path.open("rb") as f_in, compressed_io.OPENERS[codec](packed, "wb") as f_out:
+                shutil.copyfileobj(f_in, f_out, compressed_io.CHUNK_SIZE)
+            ratio = in_path.stat().st_size / packed.stat().st_size
+
+            print("-" * 78)
+            print(f"{codec} (ratio {ratio:.1f}x)")
+            dt, _ = time_read(lambda p: inline_text(p, "r"), packed)
+            report("read inline", dt, len(rows), size_mb, base_read)
+            dt, _ = time_read(compressed_io.open_text, packed)
+            report("read threaded", dt, len(rows), size_mb, base_read)
+
+            out = compressed_io.with_codec(tmp_dir / "out.csv", codec)
+            dt = time_write(lambda p: inline_text(p, "w"), out, rows)
+            report("write inline", dt, len(rows), size_mb, base_write)
+            dt = time_write(compressed_io.open_output, out, rows)
+            report("write threaded", dt, len(rows), size_mb, base_write)
+            with compressed_io.open_text(out) as f:
+                written = sum(1 for _ in csv.reader(f))
+            if written != len(rows) + 1:
+                print("ERROR: threaded output did not round-trip")
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+"""
+Diff two report runs (which ids were added / removed / changed grade)
+
+Goal:
+  - OLD + NEW report.csv (compressed too) -> report_diff.csv with one row per
+    added / removed / changed id, old_ and new_ values side by side
+  - Sorted on id -> streaming sort-merge, O(1) memory
+  - Unsorted -> hash-partitioned spill to disk, memory ~ --memory
+  - --strategy auto (default) checks the key order first
+  - Print counts + the most common grade transitions (B -> A: 12, ...)
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import batch_writer
+import compressed_io
+import report_diff
+
+
+def parse_size(s: str) -> int:
+    """'512K' / '64M' / '2G' / '1000000' -> bytes"""
+    s = s.strip().upper()
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    try:
+        if s and s[-1] in units:
+            return int(float(s[:-1]) * units[s[-1]])
+        return int(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {s!r} (use e.g. 64M, 1G)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="diff two report csv files on a key column")
+    parser.add_argument("old", type=Path, help="Yesterday's report.csv")
+    parser.add_argument("new", type=Path, help="Today's report.csv")
+    parser.add_argument("--out", type=Path, default=None,
+                        help="Diff output (default: report_diff.csv next to NEW; .gz etc. compress it)")
+    parser.add_argument("--key", default="id", help="Key column (default: id)")
+    parser.add_argument("--columns", default=None,
+                        help="Comma-separated columns to compare (default: every column both files have)")
+    parser.add_argument("--strategy", choices=report_diff.STRATEGIES, default="auto",
+                        help="merge (inputs sorted on the key), hash (spill partitions) or auto (default)")
+    parser.add_argument("--memory", type=parse_size, default=report_diff.DEFAULT_BUDGET,
+                        help="Memory budget for the hash strategy (default: 256M)")
+    parser.add_argument("--top", type=int, default=10, help="Grade transitions to print (default: 10)")
+    args = parser.parse_args()
+
+    old_path: Path = args.old.expanduser()
+    new_path: Path = args.new.expanduser()
+    for p in (old_path, new_path):
+        if not p.is_file():
+            print("ERROR: report not found:", p)
+            return 2
+    out_path: Path = args.out.expanduser() if args.out else new_path.parent / "report_diff.csv"
+    columns = [c.strip() for c in args.columns.split(",")] if args.columns else None
+
+    try:
+        diff = report_diff.ReportDiff(old_path, new_path, key=args.key, columns=columns,
+                                      budget_bytes=args.memory)
+    except report_diff.ReportDiffError as e:
+        print("ERROR:", e)
+        return 2
+
+    t0 = time.perf_counter()
+    with compressed_io.open_output(out_path) as f_out, \
+         batch_writer.BatchWriter(f_out, diff.out_fields) as writer:
+        writer.writeheader()
+        try:
+            diff.run(writer, args.strategy, tmp_dir=out_path.parent)
+        except report_diff.ReportDiffError as e:
+            print("ERROR:", e)
+            return 2
+    elapsed = time.perf_counter() - t0
+
+    c = diff.counts
+    print("-" * 60)
+    print("Old     :", old_path)
+    print("New     :", new_path)
+    print("Diff    :", out_path, f"({c['added'] + c['removed'] + c['changed']} rows)")
+    strategy = diff.strategy
+    if strategy == "hash" and diff.partitions > 1:
+        strategy += f", {diff.partitions} partitions"
+    print("Strategy:", strategy, f"({elapsed:.2f} sec)")
+    print("Compared:", ", ".join(diff.columns))
+    print(f"Added {c['added']} | removed {c['removed']} | changed {c['changed']} | unchanged {c['unchanged']}")
+    if diff.transitions:
+        print(f"{diff.track} transitions:")
+        top = sorted(diff.transitions.items(), key=lambda item: -item[1])[:args.top]
+        for (a, b), n in top:
+            print(f"  {a or '-'} -> {b or '-'} : {n}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,173 @@
+"""
+Byte-offset checkpoint for append-only CSV inputs
+
+Sidecar file (report.csv.checkpoint.json) remembers:
+  - offset      : byte position right after the last processed row
+  - rows        : how many data rows were processed (for line numbers)
+  - prefix_hash : fingerprint of every byte of input[0:offset] (sha256
+                  chained over 1 MiB blocks, see prefix_hash())
+  - sample_hash : cheap fingerprint of input[0:offset] (sampled slices + the
+                  tail, see sample_hash())
+  - report_bytes / errors_bytes : output sizes when the checkpoint was saved
+  - options     : anything that changes the output (e.g. min_score)
+
+Next run: if the input still starts with the same prefix, seek to offset and
+append only the new rows. Anything else -> full rebuild.
+
+Checking the prefix: by default only sample_hash is recomputed (a few MiB
+read, whatever the input size). verify_full=True re-hashes every byte of
+input[0:offset] instead, which reads the whole processed prefix again (tens
+of GB on the big feeds) but also catches an edit between the samples.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+HASH_BLOCK = 1 << 20
+TAIL_BLOCK = 64 << 10
+SAMPLE_COUNT = 64
+SAMPLE_SIZE = 64 << 10
+
+
+def checkpoint_path(report_path: Path) -> Path:
+    return report_path.with_name(report_path.name + ".checkpoint.json")
+
+
+def prefix_hash(path: Path, offset: int, base: dict | None = None) -> dict:
+    """
+    Fingerprint of input[0:offset]:
+
+        {"blocks": n, "chain": hex, "digest": hex}
+
+    chain = sha256 chained over the n full HASH_BLOCK blocks, digest = chain
+    + the partial last block + offset. Every byte counts, so an edit anywhere
+    in the processed prefix forces a full rebuild.
+
+    base: fingerprint of a shorter prefix of the same bytes (the checkpoint
+    we just verified). Its blocks are not read again, so saving the next
+    checkpoint only hashes the new rows (+ at most one block).
+    """
+    blocks = 0
+    chain = b""
+    if base is not None and base["blocks"] * HASH_BLOCK <= offset:
+        blocks = base["blocks"]
+        chain = bytes.fromhex(base["chain"])
+    with path.open("rb") as f:
+        f.seek(blocks * HASH_BLOCK)
+        while (blocks + 1) * HASH_BLOCK <= offset:
+            h = hashlib.sha256(chain)
+            h.update(f.read(HASH_BLOCK))
+            chain = h.digest()
+            blocks += 1
+        h = hashlib.sha256(chain)
+        h.update(f.read(offset - blocks * HASH_BLOCK))
+    h.update(str(offset).encode("ascii"))
+    return {"blocks": blocks, "chain": chain.hex(), "digest": h.hexdigest()}
+
+
+def sample_hash(path: Path, offset: int) -> str:
+    """
+    sha256 of SAMPLE_COUNT evenly spaced SAMPLE_SIZE slices of input[0:offset]
+    (the first starts at byte 0), its last SAMPLE_SIZE bytes and the offset.
+    Reads at most (SAMPLE_COUNT + 1) * SAMPLE_SIZE bytes; a short prefix is
+    hashed whole.
+    """
+    h = hashlib.sha256(str(offset).encode("ascii"))
+    with path.open("rb") as f:
+        if offset <= (SAMPLE_COUNT + 1) * SAMPLE_SIZE:
+            h.update(f.read(offset))
+            return h.hexdigest()
+        step = (offset - SAMPLE_SIZE) // SAMPLE_COUNT
+        for i in range(SAMPLE_COUNT):
+            f.seek(i * step)
+            h.update(f.read(SAMPLE_SIZE))
+        f.seek(offset - SAMPLE_SIZE)
+        h.update(f.read(SAMPLE_SIZE))
+    return h.hexdigest()
+
+
+def complete_rows_end(path: Path) -> int:
+    """
+    Byte offset just after the last newline in the file.
+    A writer may be halfway through appending a row; that partial row is
+    left for the next run.
+    """
+    size = path.stat().st_size
+    with path.open("rb") as f:
+        pos = size
+        while pos > 0:
+            start = max(0, pos - TAIL_BLOCK)
+            f.seek(start)
+            block = f.read(pos - start)
+            nl = block.rfind(b"\n")
+            if nl >= 0:
+                return start + nl + 1
+            pos = start
+    return 0
+
+
+def iter_lines(f_raw, offset: int, end: int):
+    """Decoded lines from a binary file, from offset up to (not past) end."""
+    f_raw.seek(offset)
+    pos = offset
+    for line in f_raw:
+        if pos >= end:
+            break
+        pos += len(line)
+        yield line.decode("utf-8")
+
+
+def load_checkpoint(ckpt_path: Path) -> dict:
+    if not ckpt_path.is_file():
+        return {}
+    try:
+        with ckpt_path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_checkpoint(ckpt_path: Path, data: dict) -> None:
+    # write + rename so a crash never leaves a half-written checkpoint
+    tmp_path = ckpt_path.with_name(ckpt_path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, ckpt_path)
+
+
+def prepare_resume(ckpt_path: Path, in_path: Path, report_path: Path, errors_path: Path,
+                   options: dict, verify_full: bool = False) -> dict | None:
+    """
+    Return the checkpoint if we can safely append, else None (full rebuild).
+
+    The prefix is checked with sample_hash, or with the full prefix_hash when
+    verify_full is set (or the checkpoint predates sample_hash).
+
+    Outputs are trimmed back to their checkpointed sizes, so rows appended
+    by a run that crashed before saving its checkpoint are not duplicated.
+    """
+    ckpt = load_checkpoint(ckpt_path)
+    if not ckpt:
+        return None
+    if ckpt.get("input") != str(in_path.resolve()) or ckpt.get("options") != options:
+        return None
+
+    offset = ckpt.get("offset", -1)
+    if offset <= 0 or in_path.stat().st_size < offset:
+        return None
+    if verify_full or "sample_hash" not in ckpt:
+        if prefix_hash(in_path, offset) != ckpt.get("prefix_hash"):
+            return None
+    elif sample_hash(in_path, offset) != ckpt["sample_hash"]:
+        return None
+
+    for path, key in ((report_path, "report_bytes"), (errors_path, "errors_bytes")):
+        if not path.is_file() or path.stat().st_size < ckpt.get(key, -1):
+            return None
+    for path, key in ((report_path, "report_bytes"), (errors_path, "errors_bytes")):
+        with path.open("r+b") as f:
+            f.truncate(ckpt[key])
+
+    return ckpt
@@ -0,0 +1,67 @@
+"""
+Option combinations 07_argparse_csv.py cannot run
+
+The single-stream path (one input, no --workers) supports every option;
+the sharded, incremental, multi-file and sampling paths each support a
+subset. first_conflict() walks the rules in order and returns the message
+of the first one that applies (the caller passes it to parser.error), so
+main() does not carry one if-block per pair of options.
+"""
+
+from pathlib import Path
+
+import compressed_io
+import grading
+
+
+def first_conflict(args, files: list[Path], policy: grading.GradingPolicy) -> str | None:
+    sharded = args.workers > 1
+    sampling = args.sample is not None or args.sample_fraction is not None
+    multi = len(files) > 1
+    compressed = [f for f in files if compressed_io.codec_for(f)]
+    unsupported = [str(f) for f in compressed if compressed_io.codec_for(f) not in compressed_io.CODECS]
+
+    rules = (
+        (args.verify_full and not args.incremental,
+         "--verify-full needs --incremental"),
+        (args.incremental and sharded,
+         "--incremental reads from a single offset; use it without --workers"),
+        (args.out_format != "csv" and (args.incremental or sharded),
+         "--out-format cols/both is only supported on the single-stream path"),
+        (args.dedupe and (args.incremental or sharded),
+         "--dedupe needs the whole input in order: use it without --incremental or --workers"),
+        (args.sample_seek and args.sample is None,
+         "--sample-seek needs --sample N"),
+        (sampling and (sharded or args.incremental or args.dedupe or args.join
+                       or args.out_format != "csv" or args.compress),
+         "--sample/--sample-fraction is a preview of one input: use it without --workers, "
+         "--incremental, --dedupe, --join, --out-format or --compress"),
+        (args.cache and (sharded or args.incremental or args.dedupe or sampling),
+         "--cache works on the single-stream path: use it without --workers, "
+         "--incremental, --dedupe or --sample"),
+        (args.join and (sharded or args.incremental or args.out_format != "csv"),
+         "--join works on the single-stream csv path: use it without --workers, "
+         "--incremental or --out-format cols/both"),
+        (args.compress and (args.incremental or args.fsync != "none"),
+         "--compress cannot be combined with --incremental or --fsync"),
+        # the cache stores id/name/score only; both readers decode the cohort column
+        (policy.has_cohorts and args.cache,
+         f"cohort curves need the {policy.cohort_column!r} column of every row: use them without --cache"),
+        (bool(unsupported),
+         f"no zstd support for {', '.join(unsupported)} (install the 'zstandard' package)"),
+        (compressed and (args.reader == "mmap" or args.incremental or (not multi and sharded)),
+         "compressed inputs have no byte offsets: use them without --reader mmap, "
+         "--incremental or --workers"),
+        (multi and args.incremental,
+         "--incremental works on a single input file"),
+        (multi and args.out_format != "csv",
+         "--out-format cols/both works on a single input file"),
+        (multi and (args.dedupe or args.join or sampling or args.cache),
+         "--dedupe / --join / --sample / --cache work on a single input file"),
+        (not multi and args.sample_seek and compressed,
+         "--sample-seek needs an uncompressed input"),
+    )
+    for applies, message in rules:
+        if applies:
+            return message
+    return None
@@ -0,0 +1,287 @@
+"""
+Typed columnar report files (+ a memory-mapping loader)
+
+A report becomes a folder (report.cols/) with one raw little-endian array
+per column and a meta.json that describes them:
+
+    meta.json       rows, byte order, column -> file + array typecode
+    id.q            int64
+    score.d         float64
+    passed.B        uint8 (0/1)
+    grade.B         uint8 index into meta["columns"]["grade"]["categories"]
+                    (GRADES, or the bands of a custom grading policy)
+    name.offsets.q  int64 end offset of each name in name.utf8
+    name.utf8       all names back to back (string table)
+
+ColumnWriter has the writerow()/writerows()/writeheader() shape of a csv
+writer, so it can replace or sit next to the CSV report writer. A row is
+converted and checked in full (ids must fit int64) before anything is
+buffered, and TeeWriter checks the typed side before writing any side, so
+a rejected row leaves every output aligned.
+load_columns() mmaps the files and returns zero-copy memoryviews, so a
+consumer can read every score without parsing any text.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import sys
+from array import array
+from pathlib import Path
+
+FORMAT = "score-report-columns"
+VERSION = 1
+GRADES = ["A", "B", "C", "D", "F"]
+FLUSH_ROWS = 65536
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+
+def columns_path(report_path: Path) -> Path:
+    return report_path.with_suffix(".cols")
+
+
+def check_id(rid: int) -> int:
+    if not INT64_MIN <= rid <= INT64_MAX:
+        raise ValueError(f"id {rid} does not fit a 64-bit integer column")
+    return rid
+
+
+def write_column(f, buf: array) -> None:
+    """Append an array to its column file as raw little-endian values."""
+    if sys.byteorder != "little":
+        buf.byteswap()
+    buf.tofile(f)
+
+
+def map_column(path: Path, typecode: str, byteorder: str, maps: list):
+    """
+    Zero-copy memoryview of a column file (the mmap is appended to maps, the
+    caller closes it). Empty file -> empty view; foreign byte order -> a
+    swapped in-memory copy.
+    """
+    path = Path(path)
+    if path.stat().st_size == 0:
+        return memoryview(array(typecode))
+    if byteorder != sys.byteorder:
+        data = array(typecode, path.read_bytes())
+        data.byteswap()
+        return memoryview(data)
+    with path.open("rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    maps.append(mm)
+    return memoryview(mm).cast(typecode)
+
+
+class ColumnWriter:
+    def __init__(self, out_dir: Path, categories: list[str] = GRADES):
+        self.out_dir = Path(out_dir)
+        self.categories = list(categories)
+        self._tmp_dir = self.out_dir.with_name(self.out_dir.name + ".tmp")
+        if self._tmp_dir.exists():
+            shutil.rmtree(self._tmp_dir)
+        self._tmp_dir.mkdir(parents=True)
+
+        self.rows = 0
+        self._name_bytes = 0
+        self._grade_index = {g: i for i, g in enumerate(self.categories)}
+        self._files = {
+            key: (self._tmp_dir / fname).open("wb")
+            for key, fname in (("id", "id.q"), ("score", "score.d"), ("passed", "passed.B"),
+                               ("grade", "grade.B"), ("name_offsets", "name.offsets.q"),
+                               ("name", "name.utf8"))
+        }
+        self._reset_buffers()
+
+    def _reset_buffers(self) -> None:
+        self._ids = array("q")
+        self._scores = array("d")
+        self._passed = array("B")
+        self._grades = array("B")
+        self._name_offsets = array("q")
+        self._names = bytearray()
+
+    def writeheader(self) -> None:
+        # column names live in meta.json
+        pass
+
+    def prepare(self, row) -> tuple:
+        """
+        row: report dict (id/name/score/passed/grade) or a tuple in that order.
+        Converts and checks every field; ValueError before anything is buffered.
+        """
+        if isinstance(row, dict):
+            rid, name, score, passed, grade = row["id"], row["name"], row["score"], row["passed"], row["grade"]
+        else:
+            rid, name, score, passed, grade = row
+        rid = int(rid)
+        if not INT64_MIN <= rid <= INT64_MAX:
+            check_id(rid)  # raises with the message
+        grade_code = self._grade_index.get(grade)
+        if grade_code is None:
+            raise ValueError(f"grade {grade!r} is not one of {self.categories}")
+        return rid, name.encode("utf-8"), float(score), 1 if passed == "yes" else 0, grade_code
+
+    def append(self, prepared: tuple) -> None:
+        """Buffer a row returned by prepare() (cannot fail)."""
+        rid, encoded, score, passed, grade_code = prepared
+        self._name_bytes += len(encoded)
+        self._names += encoded
+        self._name_offsets.append(self._name_bytes)
+        self._ids.append(rid)
+        self._scores.append(score)
+        self._passed.append(passed)
+        self._grades.append(grade_code)
+
+        self.rows += 1
+        if len(self._ids) >= FLUSH_ROWS:
+            self.flush()
+
+    def writerow(self, row) -> None:
+        self.append(self.prepare(row))
+
+    def writerows(self, rows) -> None:
+        for row in rows:
+            self.writerow(row)
+
+    def flush(self) -> None:
+        for key, buf in (("id", self._ids), ("score", self._scores), ("passed", self._passed),
+                         ("grade", self._grades), ("name_offsets", self._name_offsets)):
+            write_column(self._files[key], buf)
+        self._files["name"].write(self._names)
+        self._reset_buffers()
+
+    def close(self) -> None:
+        self.flush()
+        for f in self._files.values():
+            f.close()
+
+        meta = {
+            "format": FORMAT,
+            "version": VERSION,
+            "rows": self.rows,
+            "byteorder": "little",
+            "columns": {
+                "id": {"file": "id.q", "typecode": "q"},
+                "name": {"file": "name.utf8", "offsets": "name.offsets.q", "typecode": "q", "encoding": "utf-8"},
+                "score": {"file": "score.d", "typecode": "d"},
+                "passed": {"file": "passed.B", "typecode": "B", "values": ["no", "yes"]},
+                "grade": {"file": "grade.B", "typecode": "B", "categories": self.categories},
+            },
+        }
+        with (self._tmp_dir / "meta.json").open("w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        # swap the finished folder in place of the old one
+        if self.out_dir.exists():
+            shutil.rmtree(self.out_dir)
+        os.replace(self._tmp_dir, self.out_dir)
+
+    def discard(self) -> None:
+        """Drop the half-written folder; the previous out_dir (if any) stays."""
+        for f in self._files.values():
+            f.close()
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class TeeWriter:
+    """
+    Send every row to several writers (e.g. csv + columns).
+    Writers with prepare()/append() (ColumnWriter) check the row first, so a
+    row one of them rejects is written to none of them.
+    """
+
+    def __init__(self, *writers):
+        self.writers = writers
+        self._typed = tuple(w for w in writers if hasattr(w, "prepare"))
+        self._plain = tuple(w.writerow for w in writers if not hasattr(w, "prepare"))
+        if len(self._typed) == 1:
+            self.writerow = self._writerow_one
+
+    def writeheader(self) -> None:
+        for w in self.writers:
+            w.writeheader()
+
+    def writerow(self, row) -> None:
+        prepared = [w.prepare(row) for w in self._typed]
+        for writerow in self._plain:
+            writerow(row)
+        for w, p in zip(self._typed, prepared):
+            w.append(p)
+
+    def _writerow_one(self, row) -> None:
+        # the usual csv + columns pair, without the per-row list
+        typed = self._typed[0]
+        prepared = typed.prepare(row)
+        for writerow in self._plain:
+            writerow(row)
+        typed.append(prepared)
+
+    def writerows(self, rows) -> None:
+        for row in rows:
+            self.writerow(row)
+
+
+class ReportColumns:
+    """
+    Memory-mapped view of a report.cols folder.
+
+        cols = load_columns(path)
+        cols.score[i], cols.id[i]      -> zero-copy memoryview items
+        cols.name(i), cols.grade(i)    -> decoded on demand
+    """
+
+    def __init__(self, folder: Path):
+        self.folder = Path(folder)
+        with (self.folder / "meta.json").open("r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != FORMAT:
+            raise ValueError(f"not a {FORMAT} folder: {self.folder}")
+
+        self.rows = self.meta["rows"]
+        self._maps = []
+        cols = self.meta["columns"]
+        self.id = self._map(cols["id"]["file"], "q")
+        self.score = self._map(cols["score"]["file"], "d")
+        self.passed = self._map(cols["passed"]["file"], "B")
+        self.grade_code = self._map(cols["grade"]["file"], "B")
+        self._name_offsets = self._map(cols["name"]["offsets"], "q")
+        self._names = self._map(cols["name"]["file"], "B")
+        self.grade_categories = cols["grade"]["categories"]
+
+    def _map(self, fname: str, typecode: str):
+        return map_column(self.folder / fname, typecode, self.meta.get("byteorder"), self._maps)
+
+    def name(self, i: int) -> str:
+        start = self._name_offsets[i - 1] if i else 0
+        return str(self._names[start:self._name_offsets[i]], "utf-8")
+
+    def grade(self, i: int) -> str:
+        return self.grade_categories[self.grade_code[i]]
+
+    def close(self) -> None:
+        for view in (self.id, self.score, self.passed, self.grade_code, self._name_offsets, self._names):
+            view.release()
+        for mm in self._maps:
+            mm.close()
+        self._maps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_columns(folder: Path) -> ReportColumns:
+    return ReportColumns(folder)
@@ -0,0 +1,266 @@
+"""
+Transparent gzip / bz2 / xz / zstd input and output (by file suffix)
+
+- codec_for(path): "gz" | "bz2" | "xz" | "zst" | None (plain file)
+- open_input(path)        -> binary stream, decompressed by a background thread
+- open_text(path)         -> text stream (utf-8, newline="") over open_input()
+- open_output(path)       -> text stream, compressed by a background thread
+- read_header(path)       -> header fieldnames of a plain or compressed csv
+
+The codecs release the GIL while they (de)compress, so the worker thread
+really overlaps with csv parsing in the main thread. Chunks travel through
+a small bounded queue: memory stays at QUEUE_DEPTH * CHUNK_SIZE per stream.
+
+zstd uses the stdlib module when there is one (compression.zstd, 3.14+),
+else the zstandard package, else .zst paths raise ValueError.
+"""
+
+import bz2
+import csv
+import functools
+import gzip
+import io
+import lzma
+import queue
+import threading
+import zlib
+from pathlib import Path
+
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+CHUNK_SIZE = 1 << 20
+QUEUE_DEPTH = 8
+GZIP_LEVEL = 6      # gzip.open defaults to 9: ~4x slower for a few % smaller files
+
+SUFFIXES = {".gz": "gz", ".bz2": "bz2", ".xz": "xz", ".zst": "zst"}
+
+# file-object APIs (also what "inline" means in 13_compressed_bench.py)
+OPENERS = {"gz": functools.partial(gzip.open, compresslevel=GZIP_LEVEL), "bz2": bz2.open, "xz": lzma.open}
+if zstd is not None:
+    OPENERS["zst"] = zstd.open
+
+# one-shot (de)compressor objects: whole 1 MiB chunks per call, GIL released
+# for the entire chunk (the file wrappers above work in small Python-level steps)
+DECOMPRESSORS = {
+    "gz": lambda: zlib.decompressobj(16 + zlib.MAX_WBITS),
+    "bz2": bz2.BZ2Decompressor,
+    "xz": lzma.LZMADecompressor,
+}
+COMPRESSORS = {
+    "gz": lambda: zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS),
+    "bz2": bz2.BZ2Compressor,
+    "xz": lzma.LZMACompressor,
+}
+
+# names for --compress style options
+CODECS = tuple(OPENERS)
+
+
+def codec_for(path: Path) -> str | None:
+    return SUFFIXES.get(Path(path).suffix.lower())
+
+
+def plain_name(path: Path) -> str:
+    """'scores.csv.gz' -> 'scores.csv'"""
+    path = Path(path)
+    return path.stem if codec_for(path) else path.name
+
+
+def with_codec(path: Path, codec: str | None) -> Path:
+    """report.csv + 'gz' -> report.csv.gz (None: unchanged)."""
+    if codec is None:
+        return path
+    suffix = next(s for s, c in SUFFIXES.items() if c == codec)
+    return path.with_name(path.name + suffix)
+
+
+def _check_codec(path: Path, codec: str) -> None:
+    if codec not in OPENERS:
+        raise ValueError(f"{path}: no {codec} support (install the 'zstandard' package)")
+
+
+def _decompressed_chunks(path: Path, new_decompressor):
+    """Decompressed data of every stream in the file (gzip/xz may hold several)."""
+    with Path(path).open("rb") as f:
+        d = new_decompressor()
+        in_stream = False
+        while True:
+            data = f.read(CHUNK_SIZE)
+            if not data:
+                break
+            while data:
+                in_stream = True
+                out = d.decompress(data)
+                if out:
+                    yield out
+                if d.eof:
+                    data = d.unused_data
+                    d = new_decompressor()
+                    in_stream = False
+                else:
+                    data = b""
+        if in_stream:
+            raise EOFError(f"{path}: compressed file ended before the end-of-stream marker")
+
+
+def _file_chunks(f):
+    with f:
+        while True:
+            data = f.read(CHUNK_SIZE)
+            if not data:
+                return
+            yield data
+
+
+class _ThreadedReader(io.RawIOBase):
+    """Raw stream fed by a thread that runs the chunk generator (= decompresses) ahead."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._q = queue.Queue(QUEUE_DEPTH)
+        self._stop = threading.Event()
+        self._chunk = b""
+        self._pos = 0
+        self._eof = False
+        self._thread = threading.Thread(target=self._pump, daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _pump(self) -> None:
+        try:
+            for data in self._chunks:
+                if not self._put(data):
+                    return
+            self._put(b"")
+        except BaseException as e:
+            self._put(e)
+        finally:
+            self._chunks.close()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if self._pos >= len(self._chunk):
+            if self._eof:
+                return 0
+            item = self._q.get()
+            if isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._chunk = memoryview(item)
+            self._pos = 0
+        n = min(len(b), len(self._chunk) - self._pos)
+        b[:n] = self._chunk[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+        super().close()
+
+
+class _ThreadedWriter(io.RawIOBase):
+    """Raw stream whose writes are compressed + written by a thread."""
+
+    def __init__(self, path: Path, codec: str):
+        if codec in COMPRESSORS:
+            self._f = Path(path).open("wb")
+            self._c = COMPRESSORS[codec]()
+        else:
+            self._f = OPENERS[codec](path, "wb")
+            self._c = None
+        self._q = queue.Queue(QUEUE_DEPTH)
+        self._error = None
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def _drain(self) -> None:
+        while True:
+            data = self._q.get()
+            if data is None:
+                break
+            if self._error is None:
+                try:
+                    self._f.write(self._c.compress(data) if self._c else data)
+                except BaseException as e:
+                    self._error = e
+        if self._error is None and self._c is not None:
+            try:
+                self._f.write(self._c.flush())
+            except BaseException as e:
+                self._error = e
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        if self._error is not None:
+            raise self._error
+        self._q.put(bytes(b))
+        return len(b)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self._q.put(None)
+        self._thread.join()
+        try:
+            self._f.close()
+        finally:
+            super().close()
+        if self._error is not None:
+            raise self._error
+
+
+def open_input(path: Path):
+    """Binary read stream; compressed files are decompressed in a background thread."""
+    codec = codec_for(path)
+    if codec is None:
+        return Path(path).open("rb")
+    _check_codec(path, codec)
+    if codec in DECOMPRESSORS:
+        chunks = _decompressed_chunks(path, DECOMPRESSORS[codec])
+    else:
+        chunks = _file_chunks(OPENERS[codec](path, "rb"))
+    return io.BufferedReader(_ThreadedReader(chunks), CHUNK_SIZE)
+
+
+def open_text(path: Path):
+    return io.TextIOWrapper(open_input(path), encoding="utf-8", newline="")
+
+
+def open_output(path: Path, mode: str = "w"):
+    """Text write stream (utf-8, newline=""); compressed files are compressed in a background thread."""
+    codec = codec_for(path)
+    if codec is None:
+        return Path(path).open(mode, encoding="utf-8", newline="")
+    _check_codec(path, codec)
+    if mode != "w":
+        raise ValueError(f"{path}: compressed outputs can only be rewritten, not appended")
+    raw = _ThreadedWriter(path, codec)
+    return io.TextIOWrapper(io.BufferedWriter(raw, CHUNK_SIZE), encoding="utf-8", newline="")
+
+
+def read_header(path: Path) -> list[str]:
+    with open_text(path) as f:
+        return next(csv.reader(f), [])
@@ -0,0 +1,122 @@
+"""
+Split a big CSV into row-aligned byte shards (for process pools)
+
+- header_info(): header fieldnames + byte offset where the data starts
+- find_row_boundaries(): cut points that never land inside a quoted field
+  (quote rules as csv.reader: only a quote at field start opens one)
+- read_shard(): decode one shard and hand back a DictReader over it
+- merge_parts(): glue per-shard report/errors files back in input order
+- append_parts(): plain concatenation of part files
+"""
+
+import csv
+import io
+import mmap
+import re
+import shutil
+from pathlib import Path
+
+MAX_SHARD_BYTES = 64 << 20      # keep each worker's text chunk small
+
+
+def header_info(path: Path) -> tuple[list[str], int]:
+    """Return (fieldnames, data_start) where data_start is the byte after the header line."""
+    with path.open("rb") as f:
+        first = f.readline()
+        data_start = f.tell()
+    fieldnames = next(csv.reader([first.decode("utf-8")]), [])
+    return fieldnames, data_start
+
+
+def shard_count(path: Path, workers: int) -> int:
+    size = path.stat().st_size
+    by_size = size // MAX_SHARD_BYTES + 1
+    return max(workers * 4, by_size)
+
+
+# a quote only opens a quoted field at the start of a field (csv.reader does
+# the same); anywhere else it is a literal character
+_FIELD_START = b",\r\n"
+# rest of a quoted field up to and including its closing quote ('""' = escaped)
+_QUOTED_REST = re.compile(rb'[^"]*(?:""[^"]*)*"')
+
+
+def find_row_boundaries(path: Path, data_start: int, n_shards: int) -> list[int]:
+    """
+    Byte offsets [data_start, b1, ..., size] where every b is the start of a row.
+
+    A newline only ends a row outside a quoted field. Quoted fields are found
+    the way csv.reader finds them (a quote opens one only at the start of a
+    field, so O"Neil in an unquoted field is just text) and skipped whole by
+    a regex over the mmap'd file: the Python loop runs once per quoted
+    field, the scanning itself is C.
+    """
+    size = path.stat().st_size
+    bounds = [data_start]
+    if size <= data_start or n_shards <= 1:
+        bounds.append(max(size, data_start))
+        return bounds
+
+    step = (size - data_start) // n_shards
+    targets = [data_start + step * i for i in range(1, n_shards)]
+
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        pos = data_start       # outside any quoted field here
+        ti = 0
+        while ti < len(targets):
+            q = m.find(b'"', pos)
+            while q > data_start and m[q - 1] not in _FIELD_START:
+                q = m.find(b'"', q + 1)          # literal quote inside a field
+            unquoted_end = q if q >= 0 else size
+            # every newline in [pos, unquoted_end) ends a row
+            while ti < len(targets):
+                nl = m.find(b"\n", max(pos, targets[ti]), unquoted_end)
+                if nl < 0:
+                    break
+                b = nl + 1
+                if bounds[-1] < b < size:
+                    bounds.append(b)
+                ti += 1
+                # one very long row can swallow several targets
+                while ti < len(targets) and targets[ti] < b:
+                    ti += 1
+            if q < 0:
+                break
+            rest = _QUOTED_REST.match(m, q + 1)
+            if rest is None:
+                break          # unterminated quote: runs to the end of the file
+            pos = rest.end()
+
+    bounds.append(size)
+    return bounds
+
+
+def read_shard(path: Path, start: int, end: int, fieldnames: list[str]) -> csv.DictReader:
+    with path.open("rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    return csv.DictReader(io.StringIO(text, newline=""), fieldnames=fieldnames)
+
+
+def append_parts(parts: list[Path], f_out) -> None:
+    for part in parts:
+        with part.open("r", encoding="utf-8", newline="") as f:
+            shutil.copyfileobj(f, f_out)
+
+
+def merge_parts(report_parts: list[Path], f_rep, error_parts: list[tuple[Path, int]], f_err,
+                line_col: int) -> None:
+    """
+    Append shard outputs in input order.
+
+    report parts are copied byte-for-byte; error parts store shard-relative
+    line numbers in column `line_col`, so each gets its shard's offset added.
+    """
+    append_parts(report_parts, f_rep)
+
+    err_writer = csv.writer(f_err)
+    for part, line_offset in error_parts:
+        with part.open("r", encoding="utf-8", newline="") as f:
+            for row in csv.reader(f):
+                row[line_col] = str(int(row[line_col]) + line_offset)
+                err_writer.writerow(row)
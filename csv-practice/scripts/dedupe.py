@@ -0,0 +1,217 @@
+"""
+Duplicate id handling for score feeds (--dedupe first|last|max-score)
+
+IdIndex: "have I seen this id" in 1 bit per id
+  - dense integer ids live in a bytearray bitmap that grows on demand in
+    either direction (input order does not matter), up to budget_bytes
+    (64 MiB = 536M ids; 100M ids need 12.5 MB)
+  - ids the bitmap cannot stretch to within the budget go to a hash set
+    fallback; the fallback is charged ~FALLBACK_BYTES per id against the
+    same budget and IdIndexFull is raised when it would blow it
+
+Deduper decides which occurrence of an id survives:
+  first     : one pass, keep the first, drop later ones
+  last      : prepass counts the ids that repeat, keep the last occurrence
+  max-score : prepass finds repeats, second pass finds the best (first on
+              ties), keep that one
+Only the repeated ids get a dict entry, so the extra memory is
+proportional to the number of duplicates, not to the feed. Those entries
+are charged (~REPEAT_BYTES / BEST_BYTES each) against the index budget
+too, so --dedupe stops with IdIndexFull instead of growing without bound.
+
+check() raises DuplicateIdError for a dropped row; its message starts
+with the DUPLICATE_ID code, which ends up in errors.csv.
+"""
+
+DUPLICATE_ID = "DUPLICATE_ID"
+POLICIES = ("first", "last", "max-score")
+DEFAULT_BUDGET = 64 << 20
+FALLBACK_BYTES = 72       # set slot + int object, roughly
+REPEAT_BYTES = 100        # _repeats entry: dict slot + int key + count
+BEST_BYTES = 200          # _best entry: dict slot + int key + [score, occ, seen]
+
+
+class DuplicateIdError(ValueError):
+    pass
+
+
+class IdIndexFull(MemoryError):
+    pass
+
+
+class IdIndex:
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET):
+        self.budget_bytes = budget_bytes
+        self._lo = None                       # bitmap byte 0 holds ids [8 * lo, 8 * lo + 8)
+        self._bits = bytearray()
+        self._fallback: set[int] = set()
+        self._count = 0
+        self._reserved = 0                    # bytes charged by reserve() (Deduper's dicts)
+
+    @property
+    def base(self) -> int | None:
+        """Smallest id the bitmap covers."""
+        return None if self._lo is None else self._lo * 8
+
+    def _full(self) -> IdIndexFull:
+        return IdIndexFull(
+            f"id index over its {self.budget_bytes:,} byte budget "
+            f"({self._count} ids, {len(self._fallback)} sparse, {self._reserved:,} bytes for repeated ids)"
+        )
+
+    def _trim(self) -> None:
+        """Drop unused bitmap bytes at both ends (slack from earlier doubling)."""
+        used = self._bits.strip(b"\0")
+        if used:
+            self._lo += self._bits.index(used[0:1])
+            self._bits = bytearray(used)
+
+    def _grow(self, block: int) -> bool:
+        """Widen the bitmap (either way) to cover id block `block`. False if it would not fit."""
+        bits = self._bits
+        if self._lo is None:
+            self._lo = block
+        lo, hi = self._lo, self._lo + len(bits)
+        need = max(hi, block + 1) - min(lo, block)
+        room = self.budget_bytes - len(self._fallback) * FALLBACK_BYTES - self._reserved
+        if need > room and bits:
+            # slack from earlier doubling may be what is in the way
+            self._trim()
+            bits = self._bits
+            lo, hi = self._lo, self._lo + len(bits)
+            need = max(hi, block + 1) - min(lo, block)
+        if need > room:
+            return False
+        # double (at least 4 KiB) toward the side that ran out, within the budget
+        size = min(room, max(need, len(bits) * 2, 4096))
+        if block < lo:
+            new_lo = hi - size
+            if block >= 0:
+                new_lo = max(new_lo, 0)       # no room wasted on negative ids
+            self._bits = bytearray(lo - new_lo) + bits
+            self._lo = new_lo
+        else:
+            bits.extend(bytes(size - len(bits)))
+        # sparse ids the bitmap now covers move in (frees their budget)
+        lo, hi = self._lo, self._lo + len(self._bits)
+        moved = [rid for rid in self._fallback if lo <= rid >> 3 < hi]
+        for rid in moved:
+            self._fallback.discard(rid)
+            self._bits[(rid >> 3) - lo] |= 1 << (rid & 7)
+        return True
+
+    def add(self, rid: int) -> bool:
+        """Mark rid as seen. True if it was new."""
+        block = rid >> 3
+        j = -1 if self._lo is None else block - self._lo
+        if not 0 <= j < len(self._bits) and rid not in self._fallback and self._grow(block):
+            j = block - self._lo
+        bits = self._bits
+        if 0 <= j < len(bits):
+            mask = 1 << (rid & 7)
+            if bits[j] & mask:
+                return False
+            bits[j] |= mask
+        else:
+            if rid in self._fallback:
+                return False
+            if self.memory_bytes() + FALLBACK_BYTES > self.budget_bytes:
+                raise self._full()
+            self._fallback.add(rid)
+        self._count += 1
+        return True
+
+    def __contains__(self, rid: int) -> bool:
+        if self._lo is None:
+            return False
+        j = (rid >> 3) - self._lo
+        if 0 <= j < len(self._bits):
+            return bool(self._bits[j] & (1 << (rid & 7)))
+        return rid in self._fallback
+
+    def __len__(self) -> int:
+        return self._count
+
+    def memory_bytes(self) -> int:
+        return len(self._bits) + len(self._fallback) * FALLBACK_BYTES + self._reserved
+
+    def reserve(self, nbytes: int) -> None:
+        """Charge memory held next to the index against the same budget (IdIndexFull if over)."""
+        if self.memory_bytes() + nbytes > self.budget_bytes:
+            self._trim()
+            if self.memory_bytes() + nbytes > self.budget_bytes:
+                raise self._full()
+        self._reserved += nbytes
+
+    def release(self, nbytes: int) -> None:
+        self._reserved -= nbytes
+
+
+class Deduper:
+    def __init__(self, policy: str, budget_bytes: int = DEFAULT_BUDGET):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown dedupe policy: {policy!r}")
+        self.policy = policy
+        self.index = IdIndex(budget_bytes)
+        self.dropped = 0
+        self._repeats: dict[int, int] = {}           # last: occurrences left
+        self._best: dict[int, list] = {}             # max-score: [best score, best occ, occ seen]
+
+    @property
+    def passes(self) -> int:
+        """Input passes needed before the report pass."""
+        return {"first": 0, "last": 1, "max-score": 2}[self.policy]
+
+    def count_pass(self, pairs) -> None:
+        """Prepass 1 over (id, score) of every valid row: find ids that repeat."""
+        add = self.index.add
+        reserve = self.index.reserve
+        repeats = self._repeats
+        for rid, _ in pairs:
+            if not add(rid):
+                n = repeats.get(rid)
+                if n is None:
+                    reserve(REPEAT_BYTES)
+                    n = 1
+                repeats[rid] = n + 1
+
+    def best_pass(self, pairs) -> None:
+        """Prepass 2 (max-score): which occurrence of each repeated id scores highest."""
+        self.index.reserve(len(self._repeats) * BEST_BYTES)
+        best = {rid: [float("-inf"), 0, 0] for rid in self._repeats}
+        # check() only reads _best from here on
+        self.index.release(len(self._repeats) * REPEAT_BYTES)
+        self._repeats = {}
+        for rid, score in pairs:
+            entry = best.get(rid)
+            if entry is not None:
+                entry[2] += 1
+                # the first occurrence always counts (all -inf / NaN still keeps one);
+                # NaN never beats a real score
+                if entry[1] == 0 or score > entry[0] or (entry[0] != entry[0] and score == score):
+                    entry[0] = score
+                    entry[1] = entry[2]
+        for entry in best.values():
+            entry[2] = 0
+        self._best = best
+
+    def check(self, rid: int, score: float) -> None:
+        """Report pass, rows in input order: raise DuplicateIdError if this row is dropped."""
+        if self.policy == "first":
+            keep = self.index.add(rid)
+        elif self.policy == "last":
+            left = self._repeats.get(rid)
+            if left is None:
+                return
+            left -= 1
+            self._repeats[rid] = left
+            keep = left == 0
+        else:
+            entry = self._best.get(rid)
+            if entry is None:
+                return
+            entry[2] += 1
+            keep = entry[2] == entry[1]
+        if not keep:
+            self.dropped += 1
+            raise DuplicateIdError(f"{DUPLICATE_ID}: id {rid} (--dedupe {self.policy})")
@@ -0,0 +1,219 @@
+"""
+Grading policy (bands, pass mark, per-cohort curves) loaded from JSON and
+compiled into a fast grade function
+
+    {
+      "bands": [
+        {"grade": "A", "min": 90},
+        {"grade": "B", "min": 80},
+        {"grade": "C", "min": 70},
+        {"grade": "D", "min": 60},
+        {"grade": "F"}
+      ],
+      "pass_score": 80,
+      "cohort_column": "cohort",
+      "cohorts": {
+        "evening": {"offset": 5},
+        "retake": {"scale": 0.9}
+      }
+    }
+
+Bands are best first; the last one has no "min" and takes everything
+below. A cohort curve grades score * scale + offset instead of the raw
+score (the report still shows the raw score). The curve is folded into
+the cut points at compile time ((min - offset) / scale), so a curved
+cohort costs the same per row as the plain policy.
+
+Grader (one compiled band set):
+  grade(s)          : lookup table indexed by int(s) when the cut points are
+                      non-negative integers (the usual case), else
+                      bisect_right over the sorted cut points
+  passed(s)         : "yes" / "no"
+  grade_column(xs)  : a whole array at once (map + bisect, no Python frame per row)
+  passed_column(xs)
+
+NaN scores land in the lowest band and fail, like the old if-chain did.
+DEFAULT_POLICY is the 90/80/70/60, pass >= 80 policy the scripts hardcoded.
+"""
+
+import json
+from bisect import bisect_right
+from functools import partial
+from pathlib import Path
+
+TABLE_MAX = 4096   # widest cut point span compiled to a lookup table
+
+DEFAULT_SPEC = {
+    "bands": [
+        {"grade": "A", "min": 90},
+        {"grade": "B", "min": 80},
+        {"grade": "C", "min": 70},
+        {"grade": "D", "min": 60},
+        {"grade": "F"},
+    ],
+    "pass_score": 80,
+}
+SPEC_KEYS = {"bands", "pass_score", "cohort_column", "cohorts"}
+CURVE_KEYS = {"scale", "offset"}
+
+
+class PolicyError(ValueError):
+    pass
+
+
+def _number(value, what: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise PolicyError(f"{what} must be a number, got {value!r}")
+    return float(value)
+
+
+class Grader:
+    def __init__(self, cuts: list[float], labels: list[str], pass_score: float):
+        """
+        cuts: ascending cut points; labels[i] is the grade for
+        cuts[i - 1] <= s < cuts[i] (labels[0] below every cut).
+        """
+        self.cuts = list(cuts)
+        self.labels = list(labels)
+        self.pass_score = float(pass_score)
+        self._index = partial(bisect_right, self.cuts)
+        self.kind, self.grade = self._compile()
+
+    def __reduce__(self):
+        # the compiled closure does not pickle; rebuild it on the other side
+        return (Grader, (self.cuts, self.labels, self.pass_score))
+
+    def _compile(self):
+        cuts, labels, index = self.cuts, self.labels, self._index
+        bottom, top = labels[0], labels[-1]
+        if not cuts:
+            return "constant", lambda s: bottom
+        lo, hi = cuts[0], cuts[-1]
+        if lo >= 0 and hi - lo <= TABLE_MAX and all(c == int(c) for c in cuts):
+            lo, hi = int(lo), int(hi)
+            # every score in [i, i + 1) gets the same grade when cuts are integers
+            table = [labels[bisect_right(cuts, i)] for i in range(lo, hi)]
+
+            def grade(s):
+                if lo <= s < hi:
+                    return table[int(s) - lo]
+                return top if s >= hi else bottom
+
+            return "table", grade
+
+        def grade(s):
+            return labels[index(s)] if s >= lo else bottom
+
+        return "bisect", grade
+
+    def passed(self, s: float) -> str:
+        return "yes" if s >= self.pass_score else "no"
+
+    def grade_column(self, scores) -> list[str]:
+        out = list(map(self.labels.__getitem__, map(self._index, scores)))
+        total = sum(scores)
+        if total != total:
+            # NaN somewhere (bisect puts it at the top): redo those rows
+            bottom = self.labels[0]
+            out = [g if s == s else bottom for s, g in zip(scores, out)]
+        return out
+
+    def passed_column(self, scores) -> list[str]:
+        # pass_score <= s, done by float.__le__ in C; False for NaN
+        return list(map(("no", "yes").__getitem__, map(self.pass_score.__le__, scores)))
+
+
+class GradingPolicy:
+    def __init__(self, spec: dict, source: str = "<policy>"):
+        self.source = source
+        self.spec = spec
+        if not isinstance(spec, dict):
+            raise PolicyError(f"{source}: policy must be a JSON object")
+        unknown = set(spec) - SPEC_KEYS
+        if unknown:
+            raise PolicyError(f"{source}: unknown keys {sorted(unknown)} (expected {sorted(SPEC_KEYS)})")
+
+        bands = spec.get("bands")
+        if not isinstance(bands, list) or not bands:
+            raise PolicyError(f"{source}: 'bands' must be a non-empty list")
+        self.grades: list[str] = []
+        self.mins: list[float] = []
+        for i, band in enumerate(bands):
+            if not isinstance(band, dict) or not isinstance(band.get("grade"), str) or not band["grade"]:
+                raise PolicyError(f"{source}: band {i} needs a 'grade' name")
+            if band["grade"] in self.grades:
+                raise PolicyError(f"{source}: grade {band['grade']!r} listed twice")
+            self.grades.append(band["grade"])
+            last = i == len(bands) - 1
+            if last:
+                if band.get("min") is not None:
+                    raise PolicyError(f"{source}: the last band ({band['grade']}) takes the rest, drop its 'min'")
+                continue
+            m = _number(band.get("min"), f"{source}: band {band['grade']} 'min'")
+            if self.mins and m >= self.mins[-1]:
+                raise PolicyError(f"{source}: band mins must go down (best band first): {band['grade']} = {m}")
+            self.mins.append(m)
+
+        if "pass_score" not in spec:
+            raise PolicyError(f"{source}: 'pass_score' is required")
+        self.pass_score = _number(spec["pass_score"], f"{source}: 'pass_score'")
+
+        self.curves: dict[str, tuple[float, float]] = {}
+        cohorts = spec.get("cohorts") or {}
+        if not isinstance(cohorts, dict):
+            raise PolicyError(f"{source}: 'cohorts' must map cohort name -> curve")
+        for name, curve in cohorts.items():
+            if not isinstance(curve, dict) or set(curve) - CURVE_KEYS:
+                raise PolicyError(f"{source}: cohort {name!r}: curve takes only {sorted(CURVE_KEYS)}")
+            scale = _number(curve.get("scale", 1), f"{source}: cohort {name!r} scale")
+            offset = _number(curve.get("offset", 0), f"{source}: cohort {name!r} offset")
+            if scale <= 0:
+                raise PolicyError(f"{source}: cohort {name!r} scale must be > 0")
+            self.curves[name] = (scale, offset)
+        self.cohort_column = spec.get("cohort_column", "cohort" if self.curves else None)
+        if self.curves and not isinstance(self.cohort_column, str):
+            raise PolicyError(f"{source}: 'cohort_column' must be a column name")
+
+        self.base = self._compile(1.0, 0.0)
+        self._cohorts = {name: self._compile(scale, offset) for name, (scale, offset) in self.curves.items()}
+
+    def _compile(self, scale: float, offset: float) -> Grader:
+        cuts = [(m - offset) / scale for m in reversed(self.mins)]
+        return Grader(cuts, list(reversed(self.grades)), (self.pass_score - offset) / scale)
+
+    @property
+    def has_cohorts(self) -> bool:
+        return bool(self._cohorts)
+
+    def grader(self, cohort: str | None = None) -> Grader:
+        """Compiled grader for a cohort (unknown / None -> the uncurved bands)."""
+        if cohort is None:
+            return self.base
+        return self._cohorts.get(cohort.strip(), self.base)
+
+    def for_row(self, row: dict) -> Grader:
+        if not self._cohorts:
+            return self.base
+        return self.grader(row.get(self.cohort_column))
+
+    def describe(self) -> str:
+        bands = ", ".join(f"{g} >= {m:g}" for g, m in zip(self.grades, self.mins))
+        text = f"{bands}, {self.grades[-1]} below; pass >= {self.pass_score:g} ({self.base.kind})"
+        if self._cohorts:
+            text += f"; curves on {self.cohort_column}: {', '.join(sorted(self._cohorts))}"
+        return text
+
+
+def load_policy(path: Path) -> GradingPolicy:
+    path = Path(path).expanduser()
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            spec = json.load(f)
+    except OSError as e:
+        raise PolicyError(f"{path}: cannot read policy: {e.strerror or e}")
+    except ValueError as e:
+        raise PolicyError(f"{path}: invalid JSON: {e}")
+    return GradingPolicy(spec, source=str(path))
+
+
+DEFAULT_POLICY = GradingPolicy(DEFAULT_SPEC, source="<default>")
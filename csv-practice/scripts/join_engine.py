@@ -0,0 +1,202 @@
+"""
+Enrich report rows with columns from a second CSV (roster), keyed on one column
+
+Two strategies, picked from the roster size vs the memory budget:
+  hash       : roster -> dict(key -> extra values); report rows stream
+               through and keep their input order
+  sort-merge : both sides are cut into sorted runs on disk, merged with
+               heapq.merge and joined in one pass; output is in key order
+
+Policies for report rows without a roster match:
+  inner          : drop them
+  left           : keep them, roster columns empty
+  report-missing : drop them from the report, list them in a missing file
+
+Keys that parse as int compare as ints ("007" == 7), anything else as the
+stripped string. A roster key that appears twice keeps its first row; the
+repeats are counted in Roster.dupes.
+
+JoinWriter wraps the report writer and has the same writerow/writeheader
+shape. Call close() at the end: the sort-merge join runs there. Run files
+go to tmp_dir, which the caller owns (e.g. a TemporaryDirectory).
+"""
+
+import csv
+import heapq
+import itertools
+from pathlib import Path
+
+POLICIES = ("inner", "left", "report-missing")
+ROSTER_OVERHEAD = 4           # resident dict size ~ 4x the csv bytes
+RUN_ROW_BYTES = 256           # rough resident size of one buffered row
+
+
+def join_key(value) -> tuple:
+    if isinstance(value, int):
+        return (0, value)
+    s = str(value).strip()
+    try:
+        return (0, int(s))
+    except ValueError:
+        return (1, s)
+
+
+def _key_cells(key: tuple) -> list:
+    return [key[0], key[1]]
+
+
+def _cells_key(kind: str, value: str) -> tuple:
+    return (0, int(value)) if kind == "0" else (1, value)
+
+
+class Roster:
+    def __init__(self, path: Path, on: str):
+        self.path = Path(path)
+        self.on = on
+        with self.path.open("r", encoding="utf-8", newline="") as f:
+            header = [h.strip() for h in next(csv.reader(f), [])]
+        if on not in header:
+            raise ValueError(f"{self.path}: join column {on!r} not found (columns: {header})")
+        self.key_index = header.index(on)
+        self.extra_cols = [h for i, h in enumerate(header) if i != self.key_index]
+        self.dupes = 0
+
+    def rows(self):
+        """(key, extra values) for every roster row, in file order."""
+        k = self.key_index
+        n = len(self.extra_cols) + 1
+        with self.path.open("r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                if not row:
+                    continue
+                row = (row + [""] * n)[:n]
+                yield join_key(row[k]), tuple(v.strip() for i, v in enumerate(row) if i != k)
+
+    def fits(self, budget_bytes: int) -> bool:
+        return self.path.stat().st_size * ROSTER_OVERHEAD <= budget_bytes
+
+    def load(self) -> dict:
+        index = {}
+        for key, extras in self.rows():
+            if key in index:
+                self.dupes += 1
+            else:
+                index[key] = extras
+        return index
+
+
+class JoinWriter:
+    def __init__(self, out, roster: Roster, policy: str, budget_bytes: int, tmp_dir: Path,
+                 missing=None, key_index: int = 0):
+        """
+        out: writer for joined rows (fieldnames = report fields + roster.extra_cols)
+        missing: writer for unmatched rows (report-missing policy)
+        key_index: position of the join key in the report row tuple
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"unknown join policy: {policy!r}")
+        self.out = out
+        self.roster = roster
+        self.policy = policy
+        self.missing = missing
+        self.key_index = key_index
+        self.tmp_dir = Path(tmp_dir)
+        self.matched = 0
+        self.unmatched = 0
+        self._blank = ("",) * len(roster.extra_cols)
+
+        if roster.fits(budget_bytes):
+            self.strategy = "hash"
+            self._index = roster.load()
+        else:
+            self.strategy = "sort-merge"
+            self._run_rows = max(1000, budget_bytes // RUN_ROW_BYTES)
+            self._buf = []
+            self._runs: list[Path] = []
+            self._seq = itertools.count()
+            self._run_ids = itertools.count()
+
+    def writeheader(self) -> None:
+        self.out.writeheader()
+        if self.missing is not None:
+            self.missing.writeheader()
+
+    def _emit(self, row: tuple, extras) -> None:
+        if extras is not None:
+            self.matched += 1
+            self.out.writerow(tuple(row) + extras)
+            return
+        self.unmatched += 1
+        if self.policy == "left":
+            self.out.writerow(tuple(row) + self._blank)
+        elif self.policy == "report-missing" and self.missing is not None:
+            self.missing.writerow(row)
+
+    def writerow(self, row) -> None:
+        if self.strategy == "hash":
+            self._emit(row, self._index.get(join_key(row[self.key_index])))
+            return
+        self._buf.append((join_key(row[self.key_index]), next(self._seq), row))
+        if len(self._buf) >= self._run_rows:
+            self._runs.append(self._spill(self._buf, "report"))
+            self._buf = []
+
+    def writerows(self, rows) -> None:
+        for row in rows:
+            self.writerow(row)
+
+    def _spill(self, items: list, side: str) -> Path:
+        # (key, seq) sort = key order, ties in input order
+        items.sort(key=lambda item: (item[0], item[1]))
+        path = self.tmp_dir / f"{side}_{next(self._run_ids):05d}.csv"
+        with path.open("w", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerows(_key_cells(key) + [seq, *values] for key, seq, values in items)
+        return path
+
+    @staticmethod
+    def _read_run(path: Path):
+        with path.open("r", encoding="utf-8", newline="") as f:
+            for kind, value, seq, *values in csv.reader(f):
+                yield _cells_key(kind, value), int(seq), tuple(values)
+
+    def _roster_runs(self) -> list[Path]:
+        runs = []
+        buf = []
+        for seq, (key, extras) in enumerate(self.roster.rows()):
+            buf.append((key, seq, extras))
+            if len(buf) >= self._run_rows:
+                runs.append(self._spill(buf, "roster"))
+                buf = []
+        if buf:
+            runs.append(self._spill(buf, "roster"))
+        return runs
+
+    def close(self) -> None:
+        if self.strategy == "hash":
+            return
+        if self._buf:
+            self._runs.append(self._spill(self._buf, "report"))
+            self._buf = []
+
+        def merged(runs):
+            return heapq.merge(*(self._read_run(p) for p in runs), key=lambda item: (item[0], item[1]))
+
+        def first_per_key(items):
+            prev = None
+            for key, _, extras in items:
+                if key == prev:
+                    self.roster.dupes += 1
+                    continue
+                prev = key
+                yield key, extras
+
+        roster = first_per_key(merged(self._roster_runs()))
+        cur = next(roster, None)
+        for key, _, row in merged(self._runs):
+            while cur is not None and cur[0] < key:
+                cur = next(roster, None)
+            self._emit(row, cur[1] if cur is not None and cur[0] == key else None)
+        for _ in roster:
+            pass  # count the remaining roster dupes
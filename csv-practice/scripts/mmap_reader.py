@@ -0,0 +1,186 @@
+"""
+mmap-backed CSV row reader (decode only the columns we use)
+
+- Maps the file instead of decoding it into str line by line
+- Finds row/field boundaries in the raw bytes (mm.find / bytes.split)
+- Decodes only the requested columns (default: id, name, score)
+- Yields dicts shaped like csv.DictReader rows, so parse_row() works unchanged
+  (missing columns -> None, blank lines skipped)
+
+Rows without a '"' take the fast path. Blocks with a quote anywhere are read
+with csv.reader over their physical lines, so record ends follow csv's own
+quote rules (a stray quote as in O"Neil stays literal) and the output matches
+csv.DictReader. A record csv.reader rejects comes out as a row whose column
+lookups raise that csv.Error, so the caller turns it into an error row.
+
+Columns not in `columns` are not decoded and are absent from the row dict;
+full_row() decodes every header column of the row yielded last (for error
+rows, which keep all input columns).
+"""
+
+import csv
+import mmap
+from pathlib import Path
+
+DEFAULT_COLUMNS = ("id", "name", "score")
+BLOCK_SIZE = 4 << 20
+
+
+class BadRecord(dict):
+    """Row of a record csv.reader could not parse: any column lookup raises its error."""
+
+    def __init__(self, error: csv.Error):
+        super().__init__()
+        self.error = error
+
+    def __missing__(self, key):
+        raise self.error
+
+
+class MmapReader:
+    def __init__(self, path: Path, columns=DEFAULT_COLUMNS, start: int | None = None,
+                 end: int | None = None, fieldnames: list[str] | None = None):
+        """
+        columns: names to decode (None: every header column).
+        start/end: byte range of data rows to scan (default: after the header
+        to EOF). When start is given the header is not read, so pass the
+        fieldnames too.
+        """
+        self.path = Path(path)
+        self._f = self.path.open("rb")
+        size = self.path.stat().st_size
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+        if start is None:
+            nl = self._mm.find(b"\n")
+            header_end = size if nl < 0 else nl + 1
+            header = self._mm[:header_end].decode("utf-8")
+            self.fieldnames = next(csv.reader([header]), [])
+            start = header_end
+        else:
+            self.fieldnames = list(fieldnames or [])
+
+        self._start = start
+        self._end = size if end is None else end
+        if columns is None:
+            columns = self.fieldnames
+        self._cols = [(name, self.fieldnames.index(name)) for name in columns if name in self.fieldnames]
+        self._maxsplit = max((i for _, i in self._cols), default=0) + 1
+        self._last: bytes | list[str] = []   # raw line (fast path) or fields of the last row
+
+    def close(self) -> None:
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def full_row(self) -> dict:
+        """Every header column of the row yielded last, shaped like a csv.DictReader row."""
+        fields = self._last
+        if isinstance(fields, bytes):
+            fields = fields.decode("utf-8", "replace").split(",")
+        fieldnames = self.fieldnames
+        row = dict(zip(fieldnames, fields))
+        if len(fields) > len(fieldnames):
+            row[None] = fields[len(fieldnames):]
+        else:
+            for name in fieldnames[len(fields):]:
+                row[name] = None
+        return row
+
+    def __iter__(self):
+        mm = self._mm
+        pos = self._start
+        end = self._end
+
+        # work in big newline-aligned blocks: split() in C beats a find() per row
+        while pos < end:
+            stop = min(pos + BLOCK_SIZE, end)
+            if stop < end:
+                nl = mm.rfind(b"\n", pos, stop)
+                if nl < 0:
+                    nl = mm.find(b"\n", stop, end)
+                stop = end if nl < 0 else nl + 1
+
+            if mm.find(b'"', pos, stop) >= 0:
+                pos = yield from self._scan_lines(pos, stop)
+            else:
+                yield from self._split_block(mm[pos:stop])
+                pos = stop
+
+    def _split_block(self, block: bytes):
+        """Fast path: no quotes anywhere in the block."""
+        cols = self._cols
+        maxsplit = self._maxsplit
+        if len(cols) == 3:
+            # the report's id/name/score case, unrolled (about 2x faster than the generic dict build)
+            (n0, i0), (n1, i1), (n2, i2) = cols
+            for line in block.split(b"\n"):
+                if line[-1:] == b"\r":
+                    line = line[:-1]
+                if not line:
+                    continue
+                self._last = line
+                parts = line.split(b",", maxsplit)
+                if len(parts) >= maxsplit:
+                    yield {n0: parts[i0].decode("utf-8"), n1: parts[i1].decode("utf-8"), n2: parts[i2].decode("utf-8")}
+                else:
+                    n = len(parts)
+                    yield {name: (parts[i].decode("utf-8") if i < n else None) for name, i in cols}
+            return
+
+        for line in block.split(b"\n"):
+            if line[-1:] == b"\r":
+                line = line[:-1]
+            if not line:
+                continue
+            self._last = line
+            parts = line.split(b",", maxsplit)
+            n = len(parts)
+            yield {name: (parts[i].decode("utf-8") if i < n else None) for name, i in cols}
+
+    def _scan_lines(self, pos: int, stop: int):
+        """
+        Slow path: csv.reader over the physical lines from pos. A quoted
+        record may run past `stop`; returns the position after the last
+        record read.
+        """
+        mm = self._mm
+        find = mm.find
+        end = self._end
+        cols = self._cols
+        here = pos
+
+        def lines():
+            nonlocal here
+            while here < end:
+                nl = find(b"\n", here, end)
+                nxt = end if nl < 0 else nl + 1
+                line = mm[here:nxt]
+                here = nxt
+                yield line.decode("utf-8")
+
+        # csv.reader pulls one line at a time and stops at the record's end,
+        # so `here` is the next record's start after every next()
+        reader = csv.reader(lines())
+        while here < stop:
+            start = here
+            try:
+                fields = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                self._last = mm[start:here].rstrip(b"\r\n")
+                yield BadRecord(e)
+                continue
+            if not fields:
+                continue  # blank line, skipped like csv.DictReader does
+            self._last = fields
+            n = len(fields)
+            yield {name: (fields[i] if i < n else None) for name, i in cols}
+        return here
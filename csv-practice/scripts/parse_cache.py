@@ -0,0 +1,306 @@
+"""
+On-disk cache of parsed input rows (re-run a report with another filter)
+
+The first run over an input parses every row as usual and also stores:
+
+    id.q            int64   one per valid row, input order
+    score.d         float64 unrounded score (the filter compares this)
+    name.offsets.q  int64   end offset of each name in name.utf8
+    name.utf8       names back to back
+    errors.csv      the error rows, no header (line_no + error included)
+    meta.json       input size / mtime / sha256, row and error counts
+
+Later runs over the same bytes mmap the columns and only redo the
+--min-score filter and the grading: no csv parsing at all.
+
+Column files are written and mapped with the columnar_store helpers (same
+layout as report.cols). A row whose id does not fit int64 cannot be stored:
+the builder keeps the run going but commit() stores nothing (reason in
+CacheBuilder.skipped), so a cache entry never has columns out of step.
+
+Keys: an entry folder is named <sha256 of the input>-<variant> (variant =
+reader kind, so each reader replays the rows it produced itself).
+index.json maps (input path, size, mtime_ns) -> sha256, so an unchanged
+file is not re-hashed; a touched or copied file is hashed once and still
+hits if its bytes are the same. An edit that keeps both size and mtime is
+not noticed (same trade-off as make).
+
+Eviction: LRU by total size. A hit bumps the entry's meta.json mtime; after
+a new entry is stored, the least recently used entries are deleted until
+the cache fits in max_bytes.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from array import array
+from pathlib import Path
+
+import batch_writer
+import columnar_store
+from columnar_store import INT64_MAX, INT64_MIN
+
+FORMAT = "parsed-rows-cache"
+VERSION = 1
+DEFAULT_DIR = Path("~/.cache/csv-practice/parse")
+DEFAULT_MAX_BYTES = 1 << 30
+HASH_BLOCK = 1 << 20
+
+
+def content_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        while block := f.read(HASH_BLOCK):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _dir_bytes(folder: Path) -> int:
+    return sum(p.stat().st_size for p in folder.iterdir() if p.is_file())
+
+
+class ParseCache:
+    def __init__(self, root: Path = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root).expanduser()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._index_path = self.root / "index.json"
+
+    def _load_index(self) -> dict:
+        try:
+            with self._index_path.open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, index: dict) -> None:
+        tmp = self._index_path.with_name(self._index_path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp, self._index_path)
+
+    def key(self, in_path: Path, variant: str = "csv") -> str:
+        """Entry name for the current content of in_path."""
+        st = in_path.stat()
+        name = str(in_path.resolve())
+        index = self._load_index()
+        rec = index.get(name)
+        if rec and rec["size"] == st.st_size and rec["mtime_ns"] == st.st_mtime_ns:
+            digest = rec["sha256"]
+        else:
+            digest = content_hash(in_path)
+            index[name] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+            self._save_index(index)
+        return f"{digest}-{variant}"
+
+    def lookup(self, key: str) -> "CachedRows | None":
+        folder = self.root / key
+        try:
+            cached = CachedRows(folder)
+        except (OSError, ValueError, KeyError):
+            return None  # missing, half-written or old-format entry
+        os.utime(folder / "meta.json")  # LRU: mark as just used
+        return cached
+
+    def builder(self, key: str, in_path: Path, fieldnames: list[str]) -> "CacheBuilder":
+        return CacheBuilder(self, key, in_path, fieldnames)
+
+    def entries(self) -> list[tuple[float, int, Path]]:
+        """(last used, bytes, folder) of every finished entry, least recently used first."""
+        out = []
+        for folder in self.root.iterdir():
+            meta = folder / "meta.json"
+            if folder.is_dir() and meta.is_file():
+                out.append((meta.stat().st_mtime, _dir_bytes(folder), folder))
+        out.sort()
+        return out
+
+    def evict(self) -> list[Path]:
+        """Delete least recently used entries until the cache fits max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for _, size, folder in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(folder, ignore_errors=True)
+            total -= size
+            removed.append(folder)
+        if removed:
+            # drop index records that point at nothing any more
+            live = {folder.name.rsplit("-", 1)[0] for _, _, folder in self.entries()}
+            index = self._load_index()
+            self._save_index({k: v for k, v in index.items() if v["sha256"] in live})
+        return removed
+
+
+class CacheBuilder:
+    """
+    Collects parsed rows during a normal run; commit() publishes the entry.
+    As a context manager, an entry that was not committed is discarded on exit.
+    """
+
+    def __init__(self, cache: ParseCache, key: str, in_path: Path, fieldnames: list[str]):
+        self.cache = cache
+        self.key = key
+        self.in_path = Path(in_path)
+        self._stat = self.in_path.stat()
+        self._tmp_dir = cache.root / f"{key}.tmp"
+        if self._tmp_dir.exists():
+            shutil.rmtree(self._tmp_dir)
+        self._tmp_dir.mkdir(parents=True)
+
+        self.rows = 0
+        self.errors = 0
+        self.skipped: str | None = None   # why commit() will not store the entry
+        self._done = False                # committed or discarded
+        self._name_bytes = 0
+        self._files = {
+            key: (self._tmp_dir / fname).open("wb")
+            for key, fname in (("id", "id.q"), ("score", "score.d"),
+                               ("name_offsets", "name.offsets.q"), ("name", "name.utf8"))
+        }
+        self._f_err = (self._tmp_dir / "errors.csv").open("w", encoding="utf-8", newline="")
+        # same writer as the errors.csv it stands in for -> byte-identical rows
+        self._err_writer = batch_writer.BatchWriter(self._f_err, list(fieldnames) + ["line_no", "error"])
+        self._reset_buffers()
+
+    def _reset_buffers(self) -> None:
+        self._ids = array("q")
+        self._scores = array("d")
+        self._name_offsets = array("q")
+        self._names = bytearray()
+
+    def add(self, rid: int, name: str, score: float) -> None:
+        if not INT64_MIN <= rid <= INT64_MAX:
+            # checked before any column grows, so the columns stay in step
+            if self.skipped is None:
+                self.skipped = f"id {rid} does not fit the cache's 64-bit id column"
+            return
+        encoded = name.encode("utf-8")
+        self._name_bytes += len(encoded)
+        self._names += encoded
+        self._name_offsets.append(self._name_bytes)
+        self._ids.append(rid)
+        self._scores.append(score)
+        self.rows += 1
+        if len(self._ids) >= columnar_store.FLUSH_ROWS:
+            self._flush()
+
+    def add_error(self, row: dict) -> None:
+        self._err_writer.writerow(row)
+        self.errors += 1
+
+    def _flush(self) -> None:
+        for key, buf in (("id", self._ids), ("score", self._scores), ("name_offsets", self._name_offsets)):
+            columnar_store.write_column(self._files[key], buf)
+        self._files["name"].write(self._names)
+        self._reset_buffers()
+
+    def _close_files(self) -> None:
+        self._done = True
+        self._flush()
+        self._err_writer.close()
+        self._f_err.close()
+        for f in self._files.values():
+            f.close()
+
+    def discard(self) -> None:
+        self._close_files()
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if not self._done:
+            self.discard()
+
+    def commit(self) -> bool:
+        """
+        Publish the entry and run eviction. False (reason in self.skipped) if a
+        row could not be stored or the input changed while we read it.
+        """
+        self._close_files()
+        st = self.in_path.stat()
+        if self.skipped is None and (st.st_size, st.st_mtime_ns) != (self._stat.st_size, self._stat.st_mtime_ns):
+            self.skipped = "input changed while it was read"
+        if self.skipped is not None:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            return False
+
+        meta = {
+            "format": FORMAT,
+            "version": VERSION,
+            "input": str(self.in_path.resolve()),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": self.key.rsplit("-", 1)[0],
+            "rows": self.rows,
+            "errors": self.errors,
+            "byteorder": "little",
+        }
+        with (self._tmp_dir / "meta.json").open("w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        folder = self.cache.root / self.key
+        if folder.exists():
+            shutil.rmtree(folder)
+        os.replace(self._tmp_dir, folder)
+        self.cache.evict()
+        return True
+
+
+class CachedRows:
+    """
+    Memory-mapped cache entry.
+
+        for rid, name, score in cached: ...     (valid rows, input order)
+        cached.copy_errors(f_err)              (error rows, no header)
+    """
+
+    def __init__(self, folder: Path):
+        self.folder = Path(folder)
+        with (self.folder / "meta.json").open("r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != FORMAT or self.meta.get("version") != VERSION:
+            raise ValueError(f"not a {FORMAT} v{VERSION} folder: {self.folder}")
+
+        self.rows = self.meta["rows"]
+        self.errors = self.meta["errors"]
+        self._maps = []
+        self.id = self._map("id.q", "q")
+        self.score = self._map("score.d", "d")
+        self._name_offsets = self._map("name.offsets.q", "q")
+        self._names = self._map("name.utf8", "B")
+        if not len(self.id) == len(self.score) == len(self._name_offsets) == self.rows:
+            self.close()
+            raise ValueError(f"truncated cache entry: {self.folder}")
+
+    def _map(self, fname: str, typecode: str):
+        return columnar_store.map_column(self.folder / fname, typecode, self.meta.get("byteorder"), self._maps)
+
+    def __iter__(self):
+        names = self._names   # slices of the mapped view: no copy of the whole table
+        start = 0
+        for rid, score, end in zip(self.id, self.score, self._name_offsets):
+            yield rid, str(names[start:end], "utf-8"), score
+            start = end
+
+    def copy_errors(self, f_out) -> None:
+        with (self.folder / "errors.csv").open("r", encoding="utf-8", newline="") as f:
+            shutil.copyfileobj(f, f_out)
+
+    def close(self) -> None:
+        for view in (self.id, self.score, self._name_offsets, self._names):
+            view.release()
+        for mm in self._maps:
+            mm.close()
+        self._maps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
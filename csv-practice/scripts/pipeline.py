@@ -0,0 +1,204 @@
+"""
+Staged read -> parse -> write pipeline (bounded queue, ordered output)
+
+    read   : thread that pulls items from `source` and cuts them into batches
+    parse  : N workers (thread or process pool) running parse(batch)
+    write  : thread that calls sink(result) for every batch, in input order
+
+The reader submits each batch to the pool and puts the future on a bounded
+queue. The writer takes futures off that queue in FIFO order, so output
+order is input order even when workers finish out of order. When the queue
+is full the reader blocks: that is the backpressure, and it also caps how
+many batches are in memory (queue_depth + the one being read).
+
+    p = Pipeline(rows, parse_batch, write_batch, workers=4)
+    p.run()                       # re-raises the first error from any stage
+    for line in p.format_metrics(): print(line)
+
+With processes=True, parse must be a module-level function and batches /
+results must pickle. Threads only overlap where the work releases the GIL
+(I/O, codecs); processes give real parallel parsing.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+DEFAULT_BATCH_ROWS = 2048
+_DONE = object()
+
+
+def _timed(parse, batch):
+    # runs in the worker: report busy time alongside the result
+    t0 = time.perf_counter()
+    result = parse(batch)
+    return time.perf_counter() - t0, result
+
+
+class StageMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.batches = 0
+        self.busy = 0.0   # seconds doing the stage's own work
+        self.wait = 0.0   # seconds blocked on a neighbour stage
+
+    def as_dict(self) -> dict:
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "busy_sec": round(self.busy, 4),
+            "wait_sec": round(self.wait, 4),
+            "items_per_sec": round(self.items / self.busy) if self.busy else None,
+        }
+
+
+class Pipeline:
+    def __init__(self, source, parse, sink, workers: int = 2, batch_rows: int = DEFAULT_BATCH_ROWS,
+                 queue_depth: int | None = None, processes: bool = False):
+        if workers < 1 or batch_rows < 1:
+            raise ValueError("workers and batch_rows must be >= 1")
+        self.source = source
+        self.parse = parse
+        self.sink = sink
+        self.workers = workers
+        self.batch_rows = batch_rows
+        self.queue_depth = queue_depth or workers * 2
+        self.processes = processes
+
+        self.stages = {name: StageMetrics(name) for name in ("read", "parse", "write")}
+        self.wall = 0.0
+        self._depth_max = 0
+        self._depth_sum = 0
+        self._depth_samples = 0
+
+        self._q = queue.Queue(self.queue_depth)
+        self._stop = threading.Event()
+        self._errors: list[BaseException] = []
+
+    def _fail(self, e: BaseException) -> None:
+        self._errors.append(e)
+        self._stop.set()
+
+    def _sample_depth(self) -> None:
+        depth = self._q.qsize()
+        self._depth_sum += depth
+        self._depth_samples += 1
+        if depth > self._depth_max:
+            self._depth_max = depth
+
+    def _put(self, item) -> bool:
+        t0 = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                self._q.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        self.stages["read"].wait += time.perf_counter() - t0
+        self._sample_depth()
+        return not self._stop.is_set()
+
+    def _read(self, pool) -> None:
+        m = self.stages["read"]
+        try:
+            it = iter(self.source)
+            while not self._stop.is_set():
+                t0 = time.perf_counter()
+                batch = []
+                for item in it:
+                    batch.append(item)
+                    if len(batch) >= self.batch_rows:
+                        break
+                m.busy += time.perf_counter() - t0
+                if not batch:
+                    break
+                m.items += len(batch)
+                m.batches += 1
+                if not self._put((len(batch), pool.submit(_timed, self.parse, batch))):
+                    break
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            # the writer must always see the end marker unless it already gave up
+            while True:
+                try:
+                    self._q.put(_DONE, timeout=0.1)
+                    break
+                except queue.Full:
+                    if self._stop.is_set():
+                        break
+
+    def _write(self) -> None:
+        parse_m = self.stages["parse"]
+        write_m = self.stages["write"]
+        try:
+            while True:
+                t0 = time.perf_counter()
+                item = self._q.get()
+                if item is _DONE:
+                    write_m.wait += time.perf_counter() - t0
+                    return
+                n, future = item
+                busy, result = future.result()
+                write_m.wait += time.perf_counter() - t0
+                parse_m.items += n
+                parse_m.batches += 1
+                parse_m.busy += busy
+
+                t0 = time.perf_counter()
+                self.sink(result)
+                write_m.busy += time.perf_counter() - t0
+                write_m.items += n
+                write_m.batches += 1
+                if self._stop.is_set():
+                    return
+        except BaseException as e:
+            self._fail(e)
+
+    def run(self) -> None:
+        t0 = time.perf_counter()
+        executor = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+        with executor(max_workers=self.workers) as pool:
+            reader = threading.Thread(target=self._read, args=(pool,), name="pipeline-read", daemon=True)
+            writer = threading.Thread(target=self._write, name="pipeline-write", daemon=True)
+            reader.start()
+            writer.start()
+            writer.join()
+            if self._errors:
+                self._stop.set()
+                pool.shutdown(wait=True, cancel_futures=True)
+            reader.join()
+        self.wall = time.perf_counter() - t0
+        if self._errors:
+            raise self._errors[0]
+
+    def metrics(self) -> dict:
+        parse = self.stages["parse"]
+        return {
+            "wall_sec": round(self.wall, 4),
+            "workers": self.workers,
+            "mode": "process" if self.processes else "thread",
+            "batch_rows": self.batch_rows,
+            "stages": {name: m.as_dict() for name, m in self.stages.items()},
+            # parse busy is summed over workers: > wall means they overlapped
+            "parse_utilization": round(parse.busy / (self.wall * self.workers), 3) if self.wall else None,
+            "queue": {
+                "capacity": self.queue_depth,
+                "max_depth": self._depth_max,
+                "mean_depth": round(self._depth_sum / self._depth_samples, 2) if self._depth_samples else 0,
+            },
+        }
+
+    def format_metrics(self) -> list[str]:
+        m = self.metrics()
+        lines = [f"Pipeline: {m['wall_sec']:.3f} sec wall, {m['workers']} {m['mode']} worker(s), "
+                 f"batches of {m['batch_rows']}"]
+        for name, s in m["stages"].items():
+            rate = f"{s['items_per_sec']:,} items/sec" if s["items_per_sec"] else "-"
+            lines.append(f"  {name:<6}: {s['items']:>9} items | busy {s['busy_sec']:7.3f}s"
+                         f" | waiting {s['wait_sec']:7.3f}s | {rate}")
+        q = m["queue"]
+        lines.append(f"  queue : max {q['max_depth']}/{q['capacity']}, mean {q['mean_depth']}")
+        return lines
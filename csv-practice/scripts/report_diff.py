@@ -0,0 +1,286 @@
+"""
+Diff two report files on a key column (added / removed / changed rows)
+
+Strategies:
+  merge : both files sorted on the key -> one streaming pass, O(1) memory
+  hash  : unsorted files -> both sides are hash-partitioned on the key into
+          N spill files (N from the memory budget), then each partition pair
+          is diffed with a dict of its OLD rows; memory ~ one OLD partition
+  auto  : scan the key column of both files (stops at the first key out of
+          order) and use merge if both are sorted, hash otherwise
+
+Keys compare like join_engine.join_key ("007" == 7). A key that repeats is
+matched by occurrence: the 2nd row with id 7 in OLD pairs with the 2nd row
+with id 7 in NEW; the leftovers are removed / added.
+
+Output rows (ReportDiff.out_fields), then old_<col>... and new_<col>...:
+    change   : added / removed / changed
+    <key>    : the key as written in the file
+    columns  : the compared columns that differ, ';'-joined
+merge output is in key order; hash output is, per partition, in NEW row
+order followed by the removed rows.
+"""
+
+import csv
+import gc
+import math
+import shutil
+import tempfile
+from collections import deque
+from operator import itemgetter
+from pathlib import Path
+
+import compressed_io
+from join_engine import join_key
+
+STRATEGIES = ("auto", "merge", "hash")
+DEFAULT_BUDGET = 256 << 20
+ROW_OVERHEAD = 4          # resident dict size ~ 4x the csv bytes
+COMPRESSED_RATIO = 5      # rough csv bytes per compressed byte
+MAX_PARTITIONS = 512
+
+
+class ReportDiffError(ValueError):
+    pass
+
+
+class ReportDiff:
+    def __init__(self, old_path: Path, new_path: Path, key: str = "id", columns: list[str] | None = None,
+                 budget_bytes: int = DEFAULT_BUDGET, track: str | None = "grade"):
+        """
+        columns: compared columns (default: every column both files have)
+        track: column whose old -> new transitions are counted (e.g. grade)
+        """
+        self.old_path = Path(old_path)
+        self.new_path = Path(new_path)
+        self.key = key
+        self.budget_bytes = budget_bytes
+        self.old_header = [h.strip() for h in compressed_io.read_header(self.old_path)]
+        self.new_header = [h.strip() for h in compressed_io.read_header(self.new_path)]
+        for path, header in ((self.old_path, self.old_header), (self.new_path, self.new_header)):
+            if key not in header:
+                raise ReportDiffError(f"{path}: key column {key!r} not found (columns: {header})")
+
+        # every non-key column of either file is shown; OLD order first
+        self.fields = [c for c in self.old_header if c != key]
+        self.fields += [c for c in self.new_header if c != key and c not in self.fields]
+        shared = [c for c in self.fields if c in self.old_header and c in self.new_header]
+        self.columns = list(columns) if columns else shared
+        unknown = [c for c in self.columns if c not in shared]
+        if unknown:
+            raise ReportDiffError(f"compared columns must be in both files: {unknown}")
+        self.track = track if track in shared else None
+
+        self.out_fields = ["change", key, "columns"] + [f"old_{c}" for c in self.fields] \
+            + [f"new_{c}" for c in self.fields]
+        self.counts = {"added": 0, "removed": 0, "changed": 0, "unchanged": 0}
+        self.transitions: dict[tuple[str, str], int] = {}
+        self.strategy = None
+        self.partitions = 1
+
+        self._old_pick = self._picker(self.old_header)
+        self._new_pick = self._picker(self.new_header)
+        self._old_k = self.old_header.index(key)
+        self._new_k = self.new_header.index(key)
+        self._old_cmp = [self.old_header.index(c) for c in self.columns]
+        self._new_cmp = [self.new_header.index(c) for c in self.columns]
+        # tuple of the compared cells in C (itemgetter of one index returns the bare cell)
+        self._old_get = itemgetter(*self._old_cmp, self._old_k)
+        self._new_get = itemgetter(*self._new_cmp, self._new_k)
+        self._blank = ("",) * len(self.fields)
+
+    def _picker(self, header: list[str]):
+        # row -> values in self.fields order ("" for columns this file lacks)
+        idx = [header.index(c) if c in header else None for c in self.fields]
+        width = len(header)
+
+        def pick(row: list) -> tuple:
+            if len(row) < width:
+                row = row + [""] * (width - len(row))
+            return tuple("" if i is None else row[i] for i in idx)
+
+        return pick
+
+    # ---------------- rows ----------------
+
+    def _keyed(self, rows, k: int, path: Path | None = None):
+        """
+        (key, row) for csv rows; key cell at index k.
+        path: check that keys never go down (merge input) and name the file if they do.
+        """
+        prev = None
+        for row in rows:
+            if not row:
+                continue
+            try:
+                key = (0, int(row[k]))           # fast path, same result as join_key
+            except (ValueError, IndexError):
+                key = join_key(row[k] if k < len(row) else "")
+            if path is not None:
+                if prev is not None and key < prev:
+                    raise ReportDiffError(f"{path}: not sorted on {self.key!r} "
+                                          f"({key[1]!r} after {prev[1]!r}); use the hash strategy")
+                prev = key
+            yield key, row
+
+    def _rows(self, path: Path, k: int, check_sorted: bool = False):
+        with compressed_io.open_text(path) as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            yield from self._keyed(reader, k, path if check_sorted else None)
+
+    def is_sorted(self, path: Path, k: int) -> bool:
+        """True if the key column never goes down (stops at the first key that does)."""
+        try:
+            for _ in self._rows(path, k, check_sorted=True):
+                pass
+        except ReportDiffError:
+            return False
+        return True
+
+    @staticmethod
+    def _cells(row: list, idx: list[int]) -> tuple:
+        return tuple(row[i] if i < len(row) else "" for i in idx)
+
+    def _emit_pair(self, writer, old: list, new: list) -> None:
+        try:
+            o = self._old_get(old)
+            n = self._new_get(new)
+        except IndexError:
+            # short row: pad the missing cells
+            o = self._cells(old, self._old_cmp + [self._old_k])
+            n = self._cells(new, self._new_cmp + [self._new_k])
+        # the key cell rides along in the getters (keeps them tuples); "007" vs "7" is no change
+        if o == n or o[:-1] == n[:-1]:
+            self.counts["unchanged"] += 1
+            return
+        self.counts["changed"] += 1
+        changed = [c for c, a, b in zip(self.columns, o, n) if a != b]
+        if self.track is not None and self.track in changed:
+            t = self.columns.index(self.track)
+            pair = (o[t], n[t])
+            self.transitions[pair] = self.transitions.get(pair, 0) + 1
+        writer.writerow(("changed", n[-1].strip(), ";".join(changed)) + self._old_pick(old) + self._new_pick(new))
+
+    def _emit_removed(self, writer, old: list) -> None:
+        self.counts["removed"] += 1
+        raw = old[self._old_k] if self._old_k < len(old) else ""
+        writer.writerow(("removed", raw.strip(), "") + self._old_pick(old) + self._blank)
+
+    def _emit_added(self, writer, new: list) -> None:
+        self.counts["added"] += 1
+        raw = new[self._new_k] if self._new_k < len(new) else ""
+        writer.writerow(("added", raw.strip(), "") + self._blank + self._new_pick(new))
+
+    # ---------------- merge ----------------
+
+    def _merge(self, writer) -> None:
+        # equal keys pair up one by one, so repeats match by occurrence
+        old_rows = self._rows(self.old_path, self._old_k, check_sorted=True)
+        new_rows = self._rows(self.new_path, self._new_k, check_sorted=True)
+        o = next(old_rows, None)
+        n = next(new_rows, None)
+        while o is not None and n is not None:
+            if o[0] == n[0]:
+                self._emit_pair(writer, o[1], n[1])
+                o = next(old_rows, None)
+                n = next(new_rows, None)
+            elif o[0] < n[0]:
+                self._emit_removed(writer, o[1])
+                o = next(old_rows, None)
+            else:
+                self._emit_added(writer, n[1])
+                n = next(new_rows, None)
+        while o is not None:
+            self._emit_removed(writer, o[1])
+            o = next(old_rows, None)
+        while n is not None:
+            self._emit_added(writer, n[1])
+            n = next(new_rows, None)
+
+    # ---------------- hash ----------------
+
+    def _csv_bytes(self, path: Path) -> int:
+        size = path.stat().st_size
+        return size * COMPRESSED_RATIO if compressed_io.codec_for(path) else size
+
+    def _partition(self, path: Path, k: int, tmp_dir: Path, side: str) -> list[Path]:
+        parts = [tmp_dir / f"{side}_{i:04d}.csv" for i in range(self.partitions)]
+        files = [p.open("w", encoding="utf-8", newline="") for p in parts]
+        try:
+            writers = [csv.writer(f) for f in files]
+            n = self.partitions
+            for key, row in self._rows(path, k):
+                writers[hash(key) % n].writerow(row)
+        finally:
+            for f in files:
+                f.close()
+        return parts
+
+    def _read_part(self, path: Path, k: int):
+        with path.open("r", encoding="utf-8", newline="") as f:
+            yield from self._keyed(csv.reader(f), k)
+
+    def _diff_part(self, writer, old_rows, new_rows) -> None:
+        """OLD side in a dict, NEW side streamed past it; what is left of OLD was removed."""
+        index: dict[tuple, list] = {}
+        repeats: dict[tuple, deque] = {}         # 2nd, 3rd, ... OLD row of a key
+        # millions of new row lists would trigger full collections over and over
+        paused = gc.isenabled()
+        gc.disable()
+        try:
+            for key, row in old_rows:
+                if key in index:
+                    repeats.setdefault(key, deque()).append(row)
+                else:
+                    index[key] = row
+        finally:
+            if paused:
+                gc.enable()
+        for key, row in new_rows:
+            old = index.pop(key, None)
+            if old is None:
+                self._emit_added(writer, row)
+                continue
+            self._emit_pair(writer, old, row)
+            more = repeats.get(key)
+            if more:
+                # the next NEW row with this key pairs with the next OLD one
+                index[key] = more.popleft()
+        for key, row in index.items():
+            self._emit_removed(writer, row)
+            for row in repeats.get(key, ()):
+                self._emit_removed(writer, row)
+
+    def _hash(self, writer, tmp_dir: Path | None) -> None:
+        # only the OLD side of a partition is held in memory
+        need = self._csv_bytes(self.old_path)
+        self.partitions = min(MAX_PARTITIONS, max(1, math.ceil(need * ROW_OVERHEAD / self.budget_bytes)))
+        if self.partitions == 1:
+            self._diff_part(writer, self._rows(self.old_path, self._old_k),
+                            self._rows(self.new_path, self._new_k))
+            return
+        tmp = Path(tempfile.mkdtemp(prefix=".diff_", dir=tmp_dir))
+        try:
+            old_parts = self._partition(self.old_path, self._old_k, tmp, "old")
+            new_parts = self._partition(self.new_path, self._new_k, tmp, "new")
+            for old_part, new_part in zip(old_parts, new_parts):
+                self._diff_part(writer, self._read_part(old_part, self._old_k),
+                                self._read_part(new_part, self._new_k))
+                old_part.unlink()
+                new_part.unlink()
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def run(self, writer, strategy: str = "auto", tmp_dir: Path | None = None) -> None:
+        """writer: takes output tuples in out_fields order (header not written here)."""
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown diff strategy: {strategy!r}")
+        if strategy == "auto":
+            both_sorted = self.is_sorted(self.old_path, self._old_k) and self.is_sorted(self.new_path, self._new_k)
+            strategy = "merge" if both_sorted else "hash"
+        self.strategy = strategy
+        if strategy == "merge":
+            self._merge(writer)
+        else:
+            self._hash(writer, tmp_dir)
@@ -0,0 +1,125 @@
+"""
+Declarative row schema -> compiled validator (no exceptions on bad rows)
+
+Schema = dict of column -> spec:
+    {"type": "int" | "float" | "str", "strip": True, "nullable": False,
+     "min": None, "max": None}
+
+compile_validator(schema, fieldnames) generates one Python function for that
+header (fixed column positions, only the checks each column needs) and
+returns it. The function takes a csv.reader row (list of str) and returns
+
+    (values_tuple, None)          good row, values in schema order
+    (None, (code, column))        bad row
+
+Numbers are checked before int()/float(), so a bad row costs a failed
+check instead of a raised + caught exception. The check is str.isdecimal()
+(C speed, covers the common unsigned case) with a regex fallback for signs
+and exponents. Underscores and nan/inf are rejected, and so are ints with
+more digits than int() accepts (sys.get_int_max_str_digits()) and floats
+that overflow to inf ("1e999").
+"""
+
+import math
+import re
+import sys
+
+# error codes
+MISSING_FIELD = "MISSING_FIELD"
+EMPTY = "EMPTY"
+BAD_INT = "BAD_INT"
+BAD_FLOAT = "BAD_FLOAT"
+BELOW_MIN = "BELOW_MIN"
+ABOVE_MAX = "ABOVE_MAX"
+
+_INT_RE = re.compile(r"[+-]?[0-9]+")
+_FLOAT_RE = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?")
+
+SPEC_DEFAULTS = {"type": "str", "strip": True, "nullable": False, "min": None, "max": None}
+
+SCORE_SCHEMA = {
+    "id": {"type": "int"},
+    "name": {"type": "str"},
+    "score": {"type": "float"},
+}
+
+
+def required_columns(schema: dict) -> set[str]:
+    return set(schema)
+
+
+def _column_lines(var: str, col: str, spec: dict) -> list[str]:
+    """Checks + conversion for one column, as code lines (indent added later)."""
+    out = []
+    if spec["type"] == "int":
+        out.append(f"if not ({var}.isdecimal() or _int_match({var})): return None, ({BAD_INT!r}, {col!r})")
+        limit = sys.get_int_max_str_digits()
+        if limit:
+            # int() raises on longer digit strings (0 = no limit)
+            out.append(f"if len({var}) > {limit} and len({var}.lstrip('+-')) > {limit}: "
+                       f"return None, ({BAD_INT!r}, {col!r})")
+        out.append(f"{var} = int({var})")
+    elif spec["type"] == "float":
+        out.append(f"if not ({var}.replace('.', '', 1).isdecimal() or _float_match({var})): "
+                   f"return None, ({BAD_FLOAT!r}, {col!r})")
+        out.append(f"{var} = float({var})")
+        out.append(f"if not _isfinite({var}): return None, ({BAD_FLOAT!r}, {col!r})")
+    if spec["min"] is not None:
+        out.append(f"if {var} < {spec['min']!r}: return None, ({BELOW_MIN!r}, {col!r})")
+    if spec["max"] is not None:
+        out.append(f"if {var} > {spec['max']!r}: return None, ({ABOVE_MAX!r}, {col!r})")
+    return out
+
+
+def compile_validator(schema: dict, fieldnames: list[str]):
+    """
+    Build validate(row) for this header. Raises KeyError if a schema
+    column is missing from fieldnames (check required_columns() first).
+    """
+    index = {name.strip(): i for i, name in enumerate(fieldnames)}
+    positions = [(col, index[col]) for col in schema]
+    max_index = max(i for _, i in positions)
+
+    def first_missing(n: int) -> str:
+        return next(col for col, i in positions if i >= n)
+
+    # one length check up front; the per-column code can then index freely
+    lines = [
+        "def validate(row):",
+        f"    if len(row) <= {max_index}: return None, ({MISSING_FIELD!r}, _first_missing(len(row)))",
+    ]
+    out_vars = []
+
+    for k, (col, user_spec) in enumerate(schema.items()):
+        spec = {**SPEC_DEFAULTS, **user_spec}
+        if spec["type"] not in {"int", "float", "str"}:
+            raise ValueError(f"unknown type for {col!r}: {spec['type']!r}")
+        i = index[col]
+        var = f"v{k}"
+        out_vars.append(var)
+
+        lines.append(f"    {var} = row[{i}]" + (".strip()" if spec["strip"] else ""))
+        checks = _column_lines(var, col, spec)
+        if spec["nullable"]:
+            lines.append(f"    if not {var}:")
+            lines.append(f"        {var} = None")
+            if checks:
+                lines.append("    else:")
+                lines += [f"        {c}" for c in checks]
+        else:
+            lines.append(f"    if not {var}: return None, ({EMPTY!r}, {col!r})")
+            lines += [f"    {c}" for c in checks]
+
+    lines.append(f"    return ({', '.join(out_vars)},), None")
+    source = "\n".join(lines) + "\n"
+
+    namespace = {
+        "_int_match": _INT_RE.fullmatch,
+        "_float_match": _FLOAT_RE.fullmatch,
+        "_isfinite": math.isfinite,
+        "_first_missing": first_missing,
+    }
+    exec(compile(source, f"<validator {', '.join(schema)}>", "exec"), namespace)
+    validate = namespace["validate"]
+    validate.source = source
+    return validate
@@ -0,0 +1,175 @@
+"""
+Row samplers + projected stats for a quick preview of a huge CSV
+
+- reservoir(items, k, rng)      : k items uniformly at random (Algorithm L:
+                                  random skips, islice does the skipping in C)
+- bernoulli(items, p, rng)      : every item independently with probability p
+                                  (geometric skips instead of one draw per item)
+- seek_sample(path, k, rng)     : k rows found by seeking to random byte
+                                  offsets; never reads the rest of the file
+- project(...)                  : sample counts -> estimates for the whole
+                                  input with 95% confidence intervals
+
+reservoir / bernoulli take (line_no, row) pairs and return the total number
+of items they walked past, so the population size is exact.
+
+seek_sample is approximate: a row is picked with probability proportional
+to the length of the row before it, the row count is estimated from the
+mean sampled row size, and an offset that lands inside a quoted multi-line
+field can yield a misaligned row (it then shows up as a parse error).
+"""
+
+import csv
+import io
+import itertools
+import math
+
+Z95 = 1.959963984540054
+SEEK_ATTEMPTS = 4   # offsets tried per wanted row before giving up
+
+
+def reservoir(items, k: int, rng) -> tuple[list, int]:
+    """Return (sample in input order, items seen)."""
+    counter = itertools.count()
+    it = zip(counter, items)
+    sample = list(itertools.islice(it, k))
+    if len(sample) == k and k > 0:
+        w = math.exp(math.log(rng.random()) / k)
+        while True:
+            skip = math.floor(math.log(rng.random()) / math.log(1 - w))
+            item = next(itertools.islice(it, skip, None), None)
+            if item is None:
+                break
+            sample[rng.randrange(k)] = item
+            w *= math.exp(math.log(rng.random()) / k)
+    # zip() pulls the counter before it finds items exhausted: one extra
+    seen = next(counter) - 1
+    sample.sort(key=lambda item: item[0])
+    return [item for _, item in sample], seen
+
+
+def bernoulli(items, p: float, rng) -> tuple[list, int]:
+    """Return (sample in input order, items seen)."""
+    counter = itertools.count()
+    it = zip(counter, items)
+    sample = []
+    if p >= 1:
+        sample = [item for _, item in it]
+    elif p > 0:
+        log_q = math.log(1 - p)
+        while True:
+            # items skipped before the next pick ~ Geometric(p)
+            skip = math.floor(math.log(1 - rng.random()) / log_q)
+            item = next(itertools.islice(it, skip, None), None)
+            if item is None:
+                break
+            sample.append(item[1])
+    else:
+        for _ in it:
+            pass
+    return sample, next(counter) - 1
+
+
+def _as_dict(fieldnames: list[str], values: list[str]) -> dict:
+    # same shape csv.DictReader gives for short / long rows
+    row = dict(zip(fieldnames, values))
+    if len(values) > len(fieldnames):
+        row[None] = values[len(fieldnames):]
+    for name in fieldnames[len(values):]:
+        row[name] = None
+    return row
+
+
+def seek_sample(path, k: int, rng, fieldnames: list[str], data_start: int) -> tuple[list, float]:
+    """
+    Return ([(f"@{offset}", row), ...] sorted by offset, mean row bytes).
+    Each offset lands somewhere in a row; the sample is the next full row.
+    """
+    rows = {}
+    row_bytes = 0
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        size = f.tell()
+        if size <= data_start:
+            return [], 0.0
+        for _ in range(k * SEEK_ATTEMPTS):
+            if len(rows) >= k:
+                break
+            f.seek(rng.randrange(data_start, size))
+            f.readline()                  # rest of the row we landed in
+            start = f.tell()
+            if start >= size:
+                start = data_start        # landed in the last row: wrap to the first
+                f.seek(start)
+            if start in rows:
+                continue
+            raw = f.readline()
+            # odd quote count = the row goes on past this newline
+            while raw.count(b'"') % 2 and len(raw) < 1 << 20:
+                more = f.readline()
+                if not more:
+                    break
+                raw += more
+            text = raw.decode("utf-8", errors="replace")
+            try:
+                values = next(csv.reader(io.StringIO(text, newline="")), [])
+            except csv.Error:
+                continue  # misaligned garbage: try another offset
+            if not values:
+                continue
+            rows[start] = _as_dict(fieldnames, values)
+            row_bytes += len(raw)
+    picked = sorted(rows.items())
+    return [(f"@{offset}", row) for offset, row in picked], (row_bytes / len(picked) if picked else 0.0)
+
+
+def wilson(k: int, n: int, fpc: float = 1.0) -> tuple[float, float]:
+    """95% Wilson interval for a proportion k/n (fpc narrows it for samples without replacement)."""
+    if n == 0:
+        return 0.0, 1.0
+    z = Z95 * fpc
+    p = k / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def project(good: int, bad: int, filtered: int, stats, population: int, population_exact: bool) -> dict:
+    """
+    good/bad/filtered: counts among the sampled rows; stats: ScoreStats of the
+    sampled report rows; population: total data rows in the input.
+    """
+    n = good + bad + filtered
+    fpc = 1.0
+    if population_exact and population > 1 and n <= population:
+        fpc = math.sqrt((population - n) / (population - 1))
+
+    def share(k: int, of: int) -> dict:
+        lo, hi = wilson(k, of, fpc)
+        return {
+            "sample": k,
+            "rate": k / of if of else 0.0,
+            "ci95": [lo, hi],
+            "projected": round(k / of * population) if of else 0,
+            "projected_ci95": [round(lo * population), round(hi * population)],
+        }
+
+    out = {
+        "sampled_rows": n,
+        "population_rows": population,
+        "population_exact": population_exact,
+        "errors": share(bad, n),
+        "report_rows": share(good, n),
+    }
+    if filtered:
+        out["filtered"] = share(filtered, n)
+    if stats.count:
+        d = stats.to_dict()
+        half = Z95 * fpc * d["stddev"] / math.sqrt(stats.count)
+        out["mean_score"] = {"estimate": d["mean"], "ci95": [d["mean"] - half, d["mean"] + half]}
+        out["grades"] = {}
+        for g, k in d["grades"].items():
+            lo, hi = wilson(k, stats.count, fpc)
+            out["grades"][g] = {"sample": k, "share": k / stats.count, "ci95": [lo, hi]}
+    return out
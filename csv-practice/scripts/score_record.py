@@ -0,0 +1,21 @@
+"""
+ScoreRecord: one typed row without a per-row dict
+
+__slots__ drops the instance __dict__, so a record is a small fixed-size
+object holding three references (id, name, score). 04 holds its good rows
+as records while sorting (in memory, per spilled run or in the top-K heaps);
+02 parses each row into one and streams it into ScoreStats without keeping
+it. 10 compares their memory with a dict per row.
+"""
+
+
+class ScoreRecord:
+    __slots__ = ("id", "name", "score")
+
+    def __init__(self, rid: int, name: str, score: float):
+        self.id = rid
+        self.name = name
+        self.score = score
+
+    def __repr__(self) -> str:
+        return f"ScoreRecord(id={self.id!r}, name={self.name!r}, score={self.score!r})"
@@ -0,0 +1,180 @@
+"""
+Streaming score statistics (one pass, O(1) memory, mergeable)
+
+- count / mean / variance : Welford running update, Chan et al. to merge
+- min / max
+- grade histogram
+- approximate percentiles : small merging t-digest (bounded centroid list)
+
+Every piece can be merged, so shards / files can each keep their own
+ScoreStats and the parent merges them. state() / from_state() turn it
+into plain JSON (used by the incremental checkpoint).
+"""
+
+import json
+import math
+from pathlib import Path
+
+PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+class TDigest:
+    """
+    Merging t-digest (Dunning). Values are buffered and folded into at most
+    ~compression centroids; tails get small centroids, so p99 stays sharp.
+    """
+
+    def __init__(self, compression: float = 100.0):
+        self.compression = compression
+        self.centroids: list[tuple[float, float]] = []   # (mean, weight), sorted by mean
+        self.buffer: list[tuple[float, float]] = []
+        self.total = 0.0
+
+    def add(self, x: float, w: float = 1.0) -> None:
+        self.buffer.append((x, w))
+        self.total += w
+        if len(self.buffer) >= 10 * self.compression:
+            self.compress()
+
+    def merge(self, other: "TDigest") -> None:
+        self.buffer.extend(other.centroids)
+        self.buffer.extend(other.buffer)
+        self.total += other.total
+        self.compress()
+
+    def _k(self, q: float) -> float:
+        # k1 scale function: centroids may span at most 1 unit of k
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def compress(self) -> None:
+        if not self.buffer:
+            return
+        points = sorted(self.centroids + self.buffer)
+        self.buffer = []
+        total = self.total
+
+        out = []
+        done = 0.0
+        cur_m, cur_w = points[0]
+        k_left = self._k(0.0)
+        for m, w in points[1:]:
+            if self._k((done + cur_w + w) / total) - k_left <= 1.0:
+                cur_w += w
+                cur_m += (m - cur_m) * w / cur_w
+            else:
+                out.append((cur_m, cur_w))
+                done += cur_w
+                k_left = self._k(done / total)
+                cur_m, cur_w = m, w
+        out.append((cur_m, cur_w))
+        self.centroids = out
+
+    def quantile(self, q: float, lo: float, hi: float) -> float:
+        """lo/hi: exact min/max, used to pin the ends."""
+        self.compress()
+        cs = self.centroids
+        if not cs:
+            return math.nan
+        if len(cs) == 1:
+            return cs[0][0]
+
+        target = q * self.total
+        cum = 0.0
+        prev_center, prev_value = 0.0, lo
+        for m, w in cs:
+            center = cum + w / 2
+            if target <= center:
+                span = center - prev_center
+                t = (target - prev_center) / span if span > 0 else 0.0
+                return prev_value + t * (m - prev_value)
+            prev_center, prev_value = center, m
+            cum += w
+
+        span = self.total - prev_center
+        t = (target - prev_center) / span if span > 0 else 0.0
+        return prev_value + t * (hi - prev_value)
+
+
+class ScoreStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.grades: dict[str, int] = {}
+        self.digest = TDigest()
+
+    def add(self, score: float, grade: str | None = None) -> None:
+        self.count += 1
+        delta = score - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (score - self.mean)
+        if score < self.min:
+            self.min = score
+        if score > self.max:
+            self.max = score
+        if grade is not None:
+            self.grades[grade] = self.grades.get(grade, 0) + 1
+        self.digest.add(score)
+
+    def merge(self, other: "ScoreStats") -> None:
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.mean, self.m2 = other.mean, other.m2
+        else:
+            n = self.count + other.count
+            delta = other.mean - self.mean
+            self.m2 += other.m2 + delta * delta * self.count * other.count / n
+            self.mean += delta * other.count / n
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for g, c in other.grades.items():
+            self.grades[g] = self.grades.get(g, 0) + c
+        self.digest.merge(other.digest)
+
+    def to_dict(self) -> dict:
+        if self.count == 0:
+            return {"count": 0}
+        variance = self.m2 / (self.count - 1) if self.count > 1 else 0.0
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "variance": variance,  # sample variance (n - 1)
+            "stddev": math.sqrt(variance),
+            "grades": dict(sorted(self.grades.items())),
+            "percentiles": {
+                f"p{round(q * 100)}": self.digest.quantile(q, self.min, self.max) for q in PERCENTILES
+            },
+        }
+
+    def state(self) -> dict:
+        self.digest.compress()
+        return {
+            "count": self.count, "mean": self.mean, "m2": self.m2,
+            "min": self.min if self.count else None, "max": self.max if self.count else None,
+            "grades": self.grades, "centroids": self.digest.centroids,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "ScoreStats":
+        s = cls()
+        if not state or not state.get("count"):
+            return s
+        s.count, s.mean, s.m2 = state["count"], state["mean"], state["m2"]
+        s.min, s.max = state["min"], state["max"]
+        s.grades = dict(state["grades"])
+        s.digest.centroids = [tuple(c) for c in state["centroids"]]
+        s.digest.total = float(s.count)
+        return s
+
+
+def write_stats_json(path: Path, stats: ScoreStats, **info) -> None:
+    data = dict(info)
+    data["stats"] = stats.to_dict()
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
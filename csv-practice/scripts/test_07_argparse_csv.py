@@ -0,0 +1,11 @@
+import importlib
+from pathlib import Path
+
+argparse_csv = importlib.import_module("07_argparse_csv")
+
+
+def test_output_stems_are_unique():
+    files = [Path("d1/x.csv"), Path("d2/x.csv"), Path("b.csv"), Path("b.csv.gz"), Path("x_1.csv"), Path("c.csv")]
+    stems = argparse_csv.output_stems(files)
+    assert stems == ["x_7", "x_2", "b_3", "b_4", "x_1", "c"]
+    assert len(set(stems)) == len(files)
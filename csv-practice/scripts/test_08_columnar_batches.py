@@ -0,0 +1,25 @@
+import csv
+import importlib
+
+columnar = importlib.import_module("08_columnar_batches")
+
+TEXT = 'id,name,score\n1,Al,50\n\n2,"multi\nline",x\n3,Bo,60\n\n\n4,Cy,bad\n5,"a\nb",70\n'
+
+
+def test_blank_lines_skipped_and_not_counted(tmp_path):
+    in_path = tmp_path / "in.csv"
+    in_path.write_text(TEXT, encoding="utf-8", newline="")
+    good, bad = columnar.run_columnar(in_path, tmp_path / "report.csv", tmp_path / "errors.csv", batch_size=2)
+    assert (good, bad) == (3, 2)
+    with (tmp_path / "errors.csv").open(encoding="utf-8", newline="") as f:
+        errors = list(csv.DictReader(f))
+    assert [(e["id"], e["line_no"]) for e in errors] == [("2", "3"), ("4", "5")]   # record numbers, as in 05/07
+
+
+def test_line_numbers_match_the_dict_path(tmp_path):
+    in_path = tmp_path / "in.csv"
+    in_path.write_text(TEXT * 3, encoding="utf-8", newline="")   # header repeats: more bad rows
+    columnar.run_columnar(in_path, tmp_path / "report.csv", tmp_path / "errors.csv", batch_size=4)
+    columnar.run_dict_path(in_path, tmp_path / "report_dict.csv", tmp_path / "errors_dict.csv")
+    assert (tmp_path / "report.csv").read_text() == (tmp_path / "report_dict.csv").read_text()
+    assert (tmp_path / "errors.csv").read_text() == (tmp_path / "errors_dict.csv").read_text()
@@ -0,0 +1,15 @@
+import csv
+import importlib
+
+schema_validate = importlib.import_module("12_schema_validate")
+
+
+def test_blank_lines_are_not_missing_field_errors(tmp_path):
+    in_path = tmp_path / "in.csv"
+    in_path.write_text('id,name,score\n1,Al,50\n\n\n2,"two\nlines",x\n\r\n3,Bo,60\n', encoding="utf-8", newline="")
+    assert schema_validate.run_report(in_path, tmp_path) == 0
+    with (tmp_path / "report.csv").open(encoding="utf-8", newline="") as f:
+        assert [r["id"] for r in csv.DictReader(f)] == ["1", "3"]
+    with (tmp_path / "errors.csv").open(encoding="utf-8", newline="") as f:
+        errors = list(csv.DictReader(f))
+    assert [(e["id"], e["line_no"]) for e in errors] == [("2", "3")]   # record number, as in 05/07
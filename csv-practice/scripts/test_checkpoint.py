@@ -0,0 +1,75 @@
+import pytest
+
+import checkpoint
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(checkpoint, "HASH_BLOCK", 64)
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return path
+
+
+def test_mid_prefix_edit_changes_the_hash(tmp_path, small_blocks):
+    data = b"id,name,score\n" + b"".join(b"%d,n%d,50\n" % (i, i) for i in range(200))
+    path = write(tmp_path / "in.csv", data)
+    before = checkpoint.prefix_hash(path, len(data))
+    mid = len(data) // 2
+    write(path, data[:mid] + b"X" + data[mid + 1:])
+    assert checkpoint.prefix_hash(path, len(data)) != before
+
+
+def test_extending_from_a_base_matches_a_full_hash(tmp_path, small_blocks):
+    data = bytes(range(256)) * 3
+    path = write(tmp_path / "in.csv", data)
+    for first in (0, 10, 64, 130, 500):
+        base = checkpoint.prefix_hash(path, first)
+        for offset in (first, first + 1, first + 64, len(data)):
+            assert checkpoint.prefix_hash(path, offset, base) == checkpoint.prefix_hash(path, offset)
+
+
+def test_prepare_resume_rejects_an_edited_prefix(tmp_path, small_blocks):
+    data = b"id,name,score\n" + b"".join(b"%d,n,1\n" % i for i in range(100))
+    path = write(tmp_path / "in.csv", data)
+    report = write(tmp_path / "report.csv", b"r")
+    errors = write(tmp_path / "errors.csv", b"e")
+    ckpt_path = tmp_path / "ckpt.json"
+    checkpoint.save_checkpoint(ckpt_path, {
+        "input": str(path.resolve()), "offset": len(data), "rows": 100,
+        "prefix_hash": checkpoint.prefix_hash(path, len(data)),
+        "report_bytes": 1, "errors_bytes": 1, "options": {},
+    })
+    assert checkpoint.prepare_resume(ckpt_path, path, report, errors, {}) is not None
+
+    write(path, data.replace(b"\n50,n,1\n", b"\n50,m,1\n") + b"100,n,1\n")
+    assert checkpoint.prepare_resume(ckpt_path, path, report, errors, {}) is None
+
+
+def test_sampled_check_resumes_and_verify_full_catches_an_unsampled_edit(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, "SAMPLE_COUNT", 4)
+    monkeypatch.setattr(checkpoint, "SAMPLE_SIZE", 16)
+    data = b"id,name,score\n" + b"".join(b"%04d,n,1\n" % i for i in range(200))
+    path = write(tmp_path / "in.csv", data)
+    report = write(tmp_path / "report.csv", b"r")
+    errors = write(tmp_path / "errors.csv", b"e")
+    ckpt_path = tmp_path / "ckpt.json"
+    checkpoint.save_checkpoint(ckpt_path, {
+        "input": str(path.resolve()), "offset": len(data), "rows": 200,
+        "prefix_hash": checkpoint.prefix_hash(path, len(data)),
+        "sample_hash": checkpoint.sample_hash(path, len(data)),
+        "report_bytes": 1, "errors_bytes": 1, "options": {},
+    })
+    assert checkpoint.prepare_resume(ckpt_path, path, report, errors, {}) is not None
+
+    # byte 100 lies between the first two samples (0..16, 449..465)
+    edited = data[:100] + b"X" + data[101:]
+    write(path, edited + b"0200,n,1\n")
+    assert checkpoint.prepare_resume(ckpt_path, path, report, errors, {}) is not None
+    assert checkpoint.prepare_resume(ckpt_path, path, report, errors, {}, verify_full=True) is None
+
+    # an edit inside a sample or the tail is caught by the default check
+    write(path, data[:-3] + b"9\n\n" + b"0200,n,1\n")
+    assert checkpoint.prepare_resume(ckpt_path, path, report, errors, {}) is None
@@ -0,0 +1,63 @@
+import csv
+import io
+
+import pytest
+
+import columnar_store
+
+ROWS = [
+    (1, "Al", 50.0, "no", "F"),
+    (99999999999999999999, "big", 60.0, "no", "D"),   # does not fit int64
+    (3, "Cy", 70.0, "no", "C"),
+    (-(1 << 63), "min", 95.5, "yes", "A"),
+]
+
+
+def write_rows(writer, rows):
+    rejected = []
+    for row in rows:
+        try:
+            writer.writerow(row)
+        except ValueError:
+            rejected.append(row[0])
+    return rejected
+
+
+def test_overflow_id_is_rejected_before_anything_is_buffered(tmp_path):
+    folder = tmp_path / "report.cols"
+    with columnar_store.ColumnWriter(folder) as w:
+        assert write_rows(w, ROWS) == [ROWS[1][0]]
+    with columnar_store.load_columns(folder) as cols:
+        got = [(cols.id[i], cols.name(i), cols.score[i], "yes" if cols.passed[i] else "no", cols.grade(i))
+               for i in range(cols.rows)]
+    assert got == [ROWS[0], ROWS[2], ROWS[3]]
+
+
+def test_tee_writes_a_rejected_row_to_no_side(tmp_path):
+    folder = tmp_path / "report.cols"
+    text = io.StringIO()
+    with columnar_store.ColumnWriter(folder) as w:
+        assert write_rows(columnar_store.TeeWriter(csv.writer(text), w), ROWS) == [ROWS[1][0]]
+    ids = [int(r[0]) for r in csv.reader(io.StringIO(text.getvalue()))]
+    with columnar_store.load_columns(folder) as cols:
+        assert list(cols.id) == ids == [1, 3, -(1 << 63)]
+
+
+def test_unknown_grade_is_a_value_error(tmp_path):
+    with columnar_store.ColumnWriter(tmp_path / "report.cols") as w:
+        with pytest.raises(ValueError):
+            w.writerow((1, "x", 1.0, "no", "Z"))
+        assert w.rows == 0
+
+
+def test_error_inside_with_keeps_the_previous_folder(tmp_path):
+    folder = tmp_path / "report.cols"
+    with columnar_store.ColumnWriter(folder) as w:
+        w.writerow(ROWS[0])
+    with pytest.raises(RuntimeError):
+        with columnar_store.ColumnWriter(folder) as w:
+            w.writerow(ROWS[2])
+            raise RuntimeError("run aborted")
+    assert not folder.with_name("report.cols.tmp").exists()
+    with columnar_store.load_columns(folder) as cols:
+        assert list(cols.id) == [1]
@@ -0,0 +1,66 @@
+import csv
+import io
+
+import pytest
+
+import csv_shards
+
+ROWS = [
+    "1,Al,50",
+    '2,"multi\nline, with ""quotes""",60',
+    '3,O"Neil,70',                 # literal quote in an unquoted field
+    '4,"x"y"z,80',                 # text after a closing quote is literal
+    "5,,90",
+    '6,"",10',
+    '7,ab"",20',
+    '8,"a\n\n",30',
+]
+
+
+def write_csv(tmp_path, rows, copies):
+    body = "\n".join(rows * copies) + "\n"
+    path = tmp_path / "in.csv"
+    path.write_text("id,name,score\n" + body, encoding="utf-8", newline="")
+    return path
+
+
+def parse(path, start, end):
+    with path.open("rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    return list(csv.reader(io.StringIO(text, newline="")))
+
+
+@pytest.mark.parametrize("n_shards", [2, 7, 50, 400])
+def test_shards_parse_like_one_stream(tmp_path, n_shards):
+    path = write_csv(tmp_path, ROWS, 40)
+    _, data_start = csv_shards.header_info(path)
+    bounds = csv_shards.find_row_boundaries(path, data_start, n_shards)
+    assert bounds[0] == data_start and bounds[-1] == path.stat().st_size
+    assert bounds == sorted(set(bounds))
+
+    whole = parse(path, data_start, bounds[-1])
+    pieces = []
+    for start, end in zip(bounds, bounds[1:]):
+        pieces += parse(path, start, end)
+    assert pieces == whole
+    assert len(whole) == len(ROWS) * 40
+
+
+def test_stray_quote_does_not_shift_later_cuts(tmp_path):
+    # the O"Neil row is early; every later cut must still be a row start
+    rows = ['0,O"Neil,1'] + [f'{i},"n\n{i}",5' for i in range(1, 500)]
+    path = write_csv(tmp_path, rows, 1)
+    _, data_start = csv_shards.header_info(path)
+    bounds = csv_shards.find_row_boundaries(path, data_start, 20)
+    assert len(bounds) > 10
+    ids = []
+    for start, end in zip(bounds, bounds[1:]):
+        ids += [int(r[0]) for r in parse(path, start, end)]
+    assert ids == list(range(500))
+
+
+def test_small_or_single_shard(tmp_path):
+    path = write_csv(tmp_path, ["1,a,2"], 1)
+    _, data_start = csv_shards.header_info(path)
+    assert csv_shards.find_row_boundaries(path, data_start, 1) == [data_start, path.stat().st_size]
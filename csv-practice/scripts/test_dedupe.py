@@ -0,0 +1,87 @@
+import math
+import random
+
+import pytest
+
+import dedupe
+
+
+def test_index_unordered_dense_ids_stay_in_bitmap():
+    ids = list(range(2_000_000))
+    random.Random(7).shuffle(ids)
+    index = dedupe.IdIndex(budget_bytes=1 << 20)
+    for rid in ids:
+        assert index.add(rid)
+    assert len(index) == len(ids)
+    assert index.memory_bytes() <= 1 << 20
+    assert not index.add(ids[0])
+    assert 0 in index and 1_999_999 in index and 2_000_000 not in index
+
+
+def test_index_descending_and_negative_ids():
+    index = dedupe.IdIndex(budget_bytes=4096)
+    for rid in range(1000, -1000, -1):
+        assert index.add(rid)
+    for rid in range(-999, 1001):
+        assert rid in index
+        assert not index.add(rid)
+
+
+def test_index_sparse_outlier_uses_fallback_then_fills():
+    index = dedupe.IdIndex(budget_bytes=8192)
+    assert index.add(10)
+    assert index.add(10**15)          # far away: fallback set
+    assert 10**15 in index
+    assert not index.add(10**15)
+    with pytest.raises(dedupe.IdIndexFull):
+        for rid in range(10**16, 10**16 + 10**9, 10**6):
+            index.add(rid)
+
+
+def dedupe_run(policy, rows):
+    d = dedupe.Deduper(policy)
+    if d.passes >= 1:
+        d.count_pass(rows)
+    if d.passes >= 2:
+        d.best_pass(rows)
+    kept = []
+    for rid, score in rows:
+        try:
+            d.check(rid, score)
+        except dedupe.DuplicateIdError:
+            continue
+        kept.append((rid, score))
+    return kept
+
+
+def test_max_score_keeps_one_row_when_every_score_is_nan_or_inf():
+    nan, ninf = float("nan"), float("-inf")
+    kept = dedupe_run("max-score", [(1, nan), (1, nan), (2, ninf), (2, ninf), (3, nan), (3, 5.0)])
+    assert [rid for rid, _ in kept] == [1, 2, 3]
+    assert math.isnan(kept[0][1])
+    assert kept[1] == (2, ninf)          # first on ties
+    assert kept[2] == (3, 5.0)           # a real score beats NaN
+
+
+def test_first_and_last():
+    rows = [(5, 1.0), (6, 2.0), (5, 3.0)]
+    assert dedupe_run("first", rows) == [(5, 1.0), (6, 2.0)]
+    assert dedupe_run("last", rows) == [(6, 2.0), (5, 3.0)]
+
+
+def test_repeat_bookkeeping_counts_against_the_budget():
+    # 1000 distinct ids twice: the bitmap is tiny, the _repeats dict is not
+    rows = [(rid, 1.0) for rid in range(1000)] * 2
+    d = dedupe.Deduper("last", budget_bytes=8192)
+    with pytest.raises(dedupe.IdIndexFull):
+        d.count_pass(rows)
+
+    d = dedupe.Deduper("max-score", budget_bytes=1000 * dedupe.REPEAT_BYTES + 8192)
+    d.count_pass(rows)
+    with pytest.raises(dedupe.IdIndexFull):
+        d.best_pass(rows)
+
+    d = dedupe.Deduper("max-score", budget_bytes=1000 * (dedupe.REPEAT_BYTES + dedupe.BEST_BYTES) + 8192)
+    d.count_pass(rows)
+    d.best_pass(rows)
+    assert d.index.memory_bytes() <= 1000 * dedupe.BEST_BYTES + 8192
@@ -0,0 +1,71 @@
+import csv
+
+import pytest
+
+import mmap_reader
+
+HEADER = "id,name,score,cohort\n"
+ROWS = [
+    "1,Al,50,a",
+    '2,"multi\nline, with ""quotes""",60,b',
+    '3,O"Neil,70,c',                # literal quote in an unquoted field
+    '4,"x"y"z,80,a',                # text after a closing quote is literal
+    "",                             # blank line
+    "5,,90,b",
+    "6,short",
+    '7,"a\r\n\r\n",30,c',
+    "8,Bo,40,a",
+]
+
+
+def write_csv(tmp_path, text):
+    path = tmp_path / "in.csv"
+    path.write_bytes(text.encode("utf-8"))
+    return path
+
+
+def dict_rows(path):
+    with path.open(encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.parametrize("block_size", [16, 64, 4 << 20])
+def test_rows_match_dictreader(tmp_path, monkeypatch, block_size):
+    monkeypatch.setattr(mmap_reader, "BLOCK_SIZE", block_size)
+    path = write_csv(tmp_path, HEADER + "\n".join(ROWS * 20) + "\n")
+    want = [{k: r[k] for k in mmap_reader.DEFAULT_COLUMNS} for r in dict_rows(path)]
+    with mmap_reader.MmapReader(path) as reader:
+        assert list(reader) == want
+
+
+def test_stray_quote_does_not_swallow_later_rows(tmp_path):
+    rows = ['0,O"Neil,1,a'] + [f'{i},"n\n{i}",5,b' for i in range(1, 200)]
+    path = write_csv(tmp_path, HEADER + "\n".join(rows) + "\n")
+    with mmap_reader.MmapReader(path) as reader:
+        assert [int(r["id"]) for r in reader] == list(range(200))
+
+
+def test_full_row_has_every_column(tmp_path):
+    path = write_csv(tmp_path, HEADER + "\n".join(ROWS) + "\n")
+    want = dict_rows(path)
+    got = []
+    with mmap_reader.MmapReader(path) as reader:
+        for _ in reader:
+            got.append(reader.full_row())
+    assert got == want
+    assert got[2]["cohort"] == "c" and got[5] == {"id": "6", "name": "short", "score": None, "cohort": None}
+
+
+def test_unparsable_record_becomes_a_row_that_raises(tmp_path):
+    limit = csv.field_size_limit()
+    csv.field_size_limit(100)
+    try:
+        path = write_csv(tmp_path, HEADER + '1,"' + "x" * 200 + '",5,a\n2,"ok",6,b\n')
+        with mmap_reader.MmapReader(path) as reader:
+            rows = list(reader)
+    finally:
+        csv.field_size_limit(limit)
+    assert len(rows) == 2
+    with pytest.raises(csv.Error):
+        rows[0]["id"]
+    assert rows[1] == {"id": "2", "name": "ok", "score": "6"}
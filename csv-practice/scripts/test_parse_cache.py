@@ -0,0 +1,42 @@
+import parse_cache
+
+FIELDS = ["id", "name", "score"]
+
+
+def build(tmp_path, rows):
+    in_path = tmp_path / "in.csv"
+    in_path.write_text("id,name,score\n", encoding="utf-8")
+    cache = parse_cache.ParseCache(tmp_path / "cache")
+    key = cache.key(in_path)
+    builder = cache.builder(key, in_path, FIELDS)
+    for row in rows:
+        builder.add(*row)
+    builder.add_error({"id": "x", "name": "bad", "score": "?", "line_no": 9, "error": "nope"})
+    return cache, key, builder
+
+
+def test_round_trip(tmp_path):
+    rows = [(1, "Al", 50.5), (-(1 << 63), "Ünal", 0.0), (3, "", 99.25)]
+    cache, key, builder = build(tmp_path, rows)
+    assert builder.commit()
+    with cache.lookup(key) as cached:
+        assert list(cached) == rows
+        assert cached.errors == 1
+
+
+def test_overflow_id_stores_no_entry(tmp_path):
+    rows = [(1, "Al", 50.0), (99999999999999999999, "big", 60.0), (3, "Cy", 70.0)]
+    cache, key, builder = build(tmp_path, rows)
+    assert len(builder._ids) == len(builder._name_offsets) == 2
+    assert not builder.commit()
+    assert "99999999999999999999" in builder.skipped
+    assert cache.lookup(key) is None
+    assert not (cache.root / key).exists() and not (cache.root / f"{key}.tmp").exists()
+
+
+def test_uncommitted_builder_is_discarded_on_exit(tmp_path):
+    cache, key, builder = build(tmp_path, [(1, "Al", 50.0)])
+    with builder:
+        pass
+    assert cache.lookup(key) is None
+    assert not (cache.root / f"{key}.tmp").exists()
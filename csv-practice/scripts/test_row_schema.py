@@ -0,0 +1,24 @@
+import pytest
+
+import row_schema
+
+FIELDS = ["id", "name", "score"]
+
+
+@pytest.fixture
+def validate():
+    return row_schema.compile_validator(row_schema.SCORE_SCHEMA, FIELDS)
+
+
+def test_good_row(validate):
+    assert validate(["-7", " Al ", "1e2"]) == ((-7, "Al", 100.0), None)
+
+
+@pytest.mark.parametrize("rid", ["9" * 5000, "-" + "1" * 4301, "0" * 4301 + "1"])
+def test_too_many_digits_is_bad_int(validate, rid):
+    assert validate([rid, "Al", "50"]) == (None, (row_schema.BAD_INT, "id"))
+
+
+@pytest.mark.parametrize("score", ["1e999", "-1e999", "nan", "inf"])
+def test_non_finite_score_is_bad_float(validate, score):
+    assert validate(["1", "Al", score]) == (None, (row_schema.BAD_FLOAT, "score"))
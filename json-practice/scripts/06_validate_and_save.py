@@ -12,28 +12,10 @@ Adds:
 
 import argparse
 import json
-import os
 from pathlib import Path
 
+import config_resolver
 
-DEFAULTS = {
-    "paths": {
-        "input_csv": "playground/out/sample.csv",
-        "out_dir": "playground/out/results",
-    },
-    "options": {
-        "min_score": 80,
-        "verbose": False,
-    },
-}
-
-def get_nested(d: dict, path: list[str], default= None):
-    cur = d
-    for k in path:
-        if not isinstance(cur, dict) or k not in cur:
-            return default
-        cur = cur[k]
-    return cur
 
 def parse_bool(s: str)-> bool:
     s=s.strip().lower()
@@ -44,12 +26,6 @@ def parse_bool(s: str)-> bool:
         return False
     raise argparse.ArgumentTypeError(f"Invalid boolean: {s!r}")
 
-def load_json_config(config_path: Path) -> dict:
-    if not config_path.is_file():
-        return {}
-    with config_path.open("r", encoding="utf-8") as f:
-        return json.load(f)
-    
 def resolve_maybe_relative(project_root: Path, p:str) -> Path:
     """
     If p is absolute -> resolve it.
@@ -77,46 +53,13 @@ def main():
     project_root=scripts_dir.parent
     
     config_path = (args.config.expanduser()) if args.config else (project_root / "playground" / "out" / "config.json")
-    cfg_json = load_json_config(config_path=config_path)
-    
-    # Defaults 
-    input_csv = get_nested(DEFAULTS, ["paths", "input_csv"])
-    out_dir = get_nested(DEFAULTS, ["paths", "out_dir"])
-    min_score = int(get_nested(DEFAULTS,["options", "min_score"]))
-    verbose = bool(get_nested(DEFAULTS, ["options", "verbose"]))
-    
-    # merge json
-    input_csv = get_nested(cfg_json, ["paths", "input_csv"], input_csv)
-    out_dir = get_nested(cfg_json, ["paths", "out_dir"], out_dir)
-    min_score = int(get_nested(cfg_json, ["options", "min_score"], min_score))
-    verbose = bool(get_nested(cfg_json, ["options", "verbose"], verbose))
-    
-    # merger ENV
-    if "INPUT_CSV" in os.environ:
-        input_csv = os.environ["INPUT_CSV"]
-    if "OUT_DIR" in os.environ:
-        out_dir = os.environ["OUT_DIR"]
-    if "MIN_SCORE" in os.environ:
-        try: 
-            min_score=int(os.environ["MIN_SCORE"])
-        except ValueError:
-            print("CONFIG ERROR: MIN_SCORE must be an integer")
-            return 2
-    if  "VERBOSE" in os.environ:
-        try:
-            verbose = parse_bool(os.environ["VERBOSE"])
-        except argparse.ArgumentTypeError as e:
-            print(f"CONFIG ERROR: {e}")
-            return 2
-        
-    if args.input_csv is not None:
-        input_csv = args.input_csv
-    if args.out_dir is not None:
-        out_dir = args.out_dir
-    if args.min_score is not None:
-        min_score = int(args.min_score)
-    if args.verbose is not None:
-        verbose = bool(args.verbose)
+    try:
+        cfg = config_resolver.RESOLVER.resolve(config_path, cli=vars(args))
+    except config_resolver.ConfigError as e:
+        print(f"CONFIG ERROR: {e}")
+        return 2
+    input_csv = cfg.input_csv
+    out_dir = cfg.out_dir
         
     # resolve paths 
     input_csv_path = resolve_maybe_relative(project_root, str(input_csv))
@@ -142,23 +85,14 @@ def main():
             "out_dir": str(out_dir_path),
         },
         "options": {
-            "min_score": min_score,
-            "verbose": verbose,
+            "min_score": cfg.min_score,
+            "verbose": cfg.verbose,
         },
         "sources":{
             "config_path": str(config_path),
-            "env_seen":{
-                "INPUT_CSV": "INPUT_CSV" in os.environ,
-                "OUT_DIR": "OUT_DIR" in os.environ,
-                "MIN_SCORE": "MIN_SCORE" in os.environ,
-                "VERBOSE": "VERBOSE" in os.environ,
-            },
-            "cli_seen":{
-                "input_csv": args.input_csv is not None,
-                "out_dir": args.out_dir is not None,
-                "min_score": args.min_score is not None,
-                "verbose": args.verbose is not None,
-            },
+            "env_seen": dict(cfg.env_seen),
+            "cli_seen": dict(cfg.cli_seen),
+            "provenance": dict(cfg.sources),
         },
     }
     
@@ -8,43 +8,33 @@ Adds:
   - Lock file (avoid double-run)
   - Per-run directory (runs/run_<timestamp>/)
   - Console + file logging (run.log)
-  - Save final_config.json + summary.json in run folder
+  - Save the final config once per distinct content in configs/<sha256>.json
+    (shared by every run that resolves to it) + summary.json in run folder
+  - --runs-for <sha256>: list the runs that used a stored config
   - Timing + exit codes
+  - --manifest jobs.ndjson / jobs.json: one job per item, started while the
+    rest of the manifest is still unread (item keys override the config,
+    CLI still wins)
+  - Hot reload: config.json is polled (stat only) during the run; a change is
+    re-resolved through the same priority chain and swapped in as a new
+    immutable snapshot that every stage / job reads without a lock
 """
 
 import argparse
-from ast import TypeVarTuple
-from http.client import TOO_EARLY
 import json
 import logging
 import os
 from pathlib import Path
 from datetime import datetime
-from telnetlib import EC
 import time
 
-
-DEFAULTS = {
-    "paths": {
-        "input_csv": "playground/out/sample.csv",
-        "out_dir": "playground/out/results",
-    },
-    "options": {
-        "min_score": 80,
-        "verbose": False,
-    },
-}
+import config_resolver
+import config_store
+import config_watch
+import json_stream
 
 # ---------------------------- small utilities ----------------------------
 
-def get_nested(d: dict, path: list[str], default=None):
-    cur = d
-    for k in path:
-        if not isinstance(cur, dict) or k not in cur:
-            return default
-        cur = cur[k]
-    return cur
-
 def parse_bool(s: str) -> bool:
     s = s.strip().lower()
     if s in {"1", "true", "yes", "y", "on"}:
@@ -53,13 +43,6 @@ def parse_bool(s: str) -> bool:
         return False
     raise argparse.ArgumentTypeError(f"Invalid boolean: {s!r} (use 1/0, true/false, yes/no)")
 
-def load_json_config(config_path: Path) -> dict:
-    if not config_path.is_file():
-        return {}
-    with config_path.open("r", encoding="utf-8") as f:
-        return json.load(f)
-
-
 def resolve_maybe_relative(project_root: Path, p: str) -> Path:
     path = Path(p).expanduser()
     if path.is_absolute():
@@ -111,12 +94,45 @@ def acquire_lock(lock_path: Path) -> None:
         f.write(f"pid={os.getpid()}\n")
         
         
+def runs_dir_for(out_dir_path: Path) -> Path:
+    return out_dir_path / "runs"
+
+
 def release_lock(lock_path: Path) -> None:
     try:
         lock_path.unlink()
     except FileNotFoundError:
         pass
     
+
+def run_manifest(manifest_path: Path, layout: str, watcher, project_root: Path, counts: dict, log) -> None:
+    """
+    One job per manifest item, each started as soon as its item is parsed.
+    Each job takes the config snapshot current when it starts (watcher.current).
+    counts is filled as we go, so it is still right if the stream breaks.
+    """
+    resolved_inputs = {}  # input_csv string -> Path (resolve() hits the disk)
+    for item_no, item in json_stream.iter_items(manifest_path, layout):
+        counts["jobs"] += 1
+        if not isinstance(item, dict):
+            log.error("Job #%d: item is not an object: %r", item_no, item)
+            counts["failed"] += 1
+            continue
+        job_id = item.get("id", f"#{item_no}")
+        try:
+            job_cfg = watcher.current.with_overrides(item)
+        except config_resolver.ConfigError as e:
+            log.error("Job %s: CONFIG ERROR: %s", job_id, e)
+            counts["failed"] += 1
+            continue
+
+        # ---- Placeholder for the per-item job ----
+        job_input = resolved_inputs.get(job_cfg.input_csv)
+        if job_input is None:
+            job_input = resolved_inputs[job_cfg.input_csv] = resolve_maybe_relative(project_root, str(job_cfg.input_csv))
+        log.debug("Job %s: input=%s min_score=%s", job_id, job_input, job_cfg.min_score)
+        counts["ok"] += 1
+
 # ------------------------------ main logic ------------------------------
 def main() -> int:
     t_start = time.perf_counter()
@@ -132,61 +148,51 @@ def main() -> int:
     parser.add_argument("--verbose", type=parse_bool, default=None, help="Override verbose (1/0, true/false)")
     parser.add_argument("--run-id", type=str, default=None, help="Run folder name (default: timestamp)")
     parser.add_argument("--no-lock", action="store_true", help="Disable lock file (not recommended)")
+    parser.add_argument("--runs-for", type=str, default=None, metavar="SHA256",
+                        help="Print the runs that used this stored config and exit")
+    parser.add_argument("--watch-interval", type=float, default=1.0,
+                        help="Seconds between config.json checks during the run (0 = no hot reload)")
+    parser.add_argument("--manifest", type=Path, default=None,
+                        help="Job manifest: NDJSON or a JSON array of per-item overrides")
+    parser.add_argument("--manifest-format", choices=["auto", "array", "ndjson"], default="auto",
+                        help="Manifest layout (default: auto, from the first character)")
     args = parser.parse_args()
 
     scripts_dir = Path(__file__).resolve().parent
     project_root = scripts_dir.parent
 
     config_path = (args.config.expanduser() if args.config else project_root / "playground" / "out" / "config.json")
-    cfg_json = load_json_config(config_path)
-
-    # ---- defaults ----
-    input_csv = get_nested(DEFAULTS, ["paths", "input_csv"])
-    out_dir = get_nested(DEFAULTS, ["paths", "out_dir"])
-    min_score = int(get_nested(DEFAULTS, ["options", "min_score"]))
-    verbose = bool(get_nested(DEFAULTS, ["options", "verbose"]))
-
-    # ---- json ----
-    input_csv = get_nested(cfg_json, ["paths", "input_csv"], input_csv)
-    out_dir = get_nested(cfg_json, ["paths", "out_dir"], out_dir)
-    min_score = int(get_nested(cfg_json, ["options", "min_score"], min_score))
-    verbose = bool(get_nested(cfg_json, ["options", "verbose"], verbose))
-
-    # ---- env ----
-    if "INPUT_CSV" in os.environ:
-        input_csv = os.environ["INPUT_CSV"]
-    if "OUT_DIR" in os.environ:
-        out_dir = os.environ["OUT_DIR"]
-    if "MIN_SCORE" in os.environ:
-        try:
-            min_score = int(os.environ["MIN_SCORE"])
-        except ValueError:
-            print("CONFIG ERROR: MIN_SCORE must be an integer")
-            return 2
-    if "VERBOSE" in os.environ:
-        try:
-            verbose = parse_bool(os.environ["VERBOSE"])
-        except argparse.ArgumentTypeError as e:
-            print("CONFIG ERROR:", e)
-            return 2
-
-    # ---- cli (highest) ----
-    if args.input_csv is not None:
-        input_csv = args.input_csv
-    if args.out_dir is not None:
-        out_dir = args.out_dir
-    if args.min_score is not None:
-        min_score = int(args.min_score)
-    if args.verbose is not None:
-        verbose = bool(args.verbose)
+    try:
+        cfg = config_resolver.RESOLVER.resolve(config_path, cli=vars(args))
+    except config_resolver.ConfigError as e:
+        print("CONFIG ERROR:", e)
+        return 2
+    input_csv = cfg.input_csv
+    out_dir = cfg.out_dir
+    verbose = cfg.verbose
             
     # Resolve base paths
     input_csv_path = resolve_maybe_relative(project_root, str(input_csv))
     out_dir_path = resolve_maybe_relative(project_root, str(out_dir))
+    store = config_store.ConfigStore(out_dir_path / "configs")
+    
+    if args.runs_for:
+        try:
+            config_file = store.path(args.runs_for.strip().lower())
+        except ValueError as e:
+            print("ERROR:", e)
+            return 2
+        if not config_file.is_file():
+            print("ERROR: no stored config:", config_file)
+            return 2
+        print("Config:", config_file)
+        for rid in store.runs(config_file.stem):
+            print(runs_dir_for(out_dir_path) / rid)
+        return 0
     
     # Prepare run_dir early (so logs go into it)
     run_id = args.run_id or datetime.now().strftime("run_%Y-%m-%d_%H-%M-%S")
-    runs_dir = out_dir_path / "runs"
+    runs_dir = runs_dir_for(out_dir_path)
     run_dir = runs_dir / run_id
     log_path = run_dir / "run.log"
     
@@ -195,24 +201,25 @@ def main() -> int:
     log = logging.getLogger(__name__)
     
     lock_path = out_dir_path / ".lock"
+    manifest_path = args.manifest.expanduser().resolve() if args.manifest else None
+    jobs = {"jobs": 0, "ok": 0, "failed": 0} if manifest_path else None
     
-    # Build final config dict
+    # Build final config dict (nothing run-specific: identical configs share one stored file)
     final = {
-        "paths": {"input_csv": str(input_csv_path), "out_dir": str(out_dir_path), "run_dir": str(run_dir)},
-        "options": {"min_score": min_score, "verbose": verbose},
+        "paths": {"input_csv": str(input_csv_path), "out_dir": str(out_dir_path),
+                  "manifest": str(manifest_path) if manifest_path else None},
+        "options": {"min_score": cfg.min_score, "verbose": cfg.verbose},
         "sources": {
             "config_path": str(config_path),
-            "env_seen": {k: (k in os.environ) for k in ["INPUT_CSV", "OUT_DIR", "MIN_SCORE", "VERBOSE"]},
-            "cli_seen": {
-                "input_csv": args.input_csv is not None,
-                "out_dir": args.out_dir is not None,
-                "min_score": args.min_score is not None,
-                "verbose": args.verbose is not None,
-                "run_id": args.run_id is not None,
-            },
+            "env_seen": dict(cfg.env_seen),
+            "cli_seen": dict(cfg.cli_seen),
+            "provenance": dict(cfg.sources),
         },
-        "started_at": started_at,
     }
+    config_sha256 = None
+    watcher = config_watch.ConfigWatcher(
+        config_path, lambda: config_resolver.RESOLVER.resolve(config_path, cli=vars(args)),
+        initial=cfg, interval=args.watch_interval, log=log)
     
 # Make output dirs
     try:
@@ -224,6 +231,7 @@ def main() -> int:
 
     # Acquire lock (unless disabled)
     lock_acquired = False 
+    return_code = 1  # what summary.json records if we stop before setting it
     try:
         if not args.no_lock:
             try:
@@ -233,38 +241,62 @@ def main() -> int:
             except FileExistsError:
                 log.error("Another run may be active (lock exists): %s", lock_path)
                 log.error("If stale, delete if manually: %s", lock_path)
-                return 3
+                return_code = 3
+                return return_code
             
         # validate input csv 
         if not input_csv_path.is_file():
             log.error("INPUT ERROR: input CSV not found: %s", input_csv_path)
-            return 2
+            return_code = 2
+            return return_code
+        if manifest_path and not manifest_path.is_file():
+            log.error("INPUT ERROR: manifest not found: %s", manifest_path)
+            return_code = 2
+            return return_code
         
-        # Save final_config.json into out_dir
-        final_config_path = run_dir / "final_config.json"
-        with final_config_path.open("w", encoding="utf-8") as f:
-            json.dump(final, f, indent=2, ensure_ascii=False)
+        # Save the final config into the store (written only if new), link this run to it
+        config_sha256, is_new = store.put(final)
+        store.add_run(config_sha256, run_id)
+        final_config_path = store.path(config_sha256)
             
         log.info("Run started")
         log.info("Input CSV : %s", input_csv_path)
         log.info("Out dir   : %s", out_dir_path)
         log.info("Run dir   : %s", run_dir)
-        log.info("Saved     : %s", final_config_path)
+        log.info("Config    : %s (%s)", final_config_path, "new" if is_new else "reused")
         
         # ---- Placeholder for real pipeline work ----
         # Here you would call your CSV processing / API download / cleanup job.
         log.info("TODO: pipeline started ... ")
-        time.sleep(10)
+        return_code = 0
+        if args.watch_interval > 0:
+            watcher.start()
+        if manifest_path:
+            log.info("Manifest  : %s", manifest_path)
+            try:
+                run_manifest(manifest_path, args.manifest_format, watcher, project_root, jobs, log)
+            except json_stream.ManifestError as e:
+                log.error("MANIFEST ERROR: %s", e)
+                return_code = 2
+            log.info("Jobs      : %d ok, %d failed", jobs["ok"], jobs["failed"])
+            if jobs["failed"]:
+                return_code = 2
+        else:
+            for step in range(10):
+                stage_cfg = watcher.current  # one snapshot per stage
+                log.debug("Stage %d: min_score=%s", step, stage_cfg.min_score)
+                time.sleep(1)
         log.info("pipeline ended ... ")
         
-        return_code = 0
-        log.info("Run finished successfully")
+        if return_code == 0:
+            log.info("Run finished successfully")
         
     except Exception:
         log.exception("Unhandled crash")
         return_code = 1
         
     finally:
+        watcher.stop()
         # Always write summary.json (even if crashed)
         ended_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         duration = time.perf_counter() - t_start
@@ -276,7 +308,11 @@ def main() -> int:
             "duration": duration,
             "exit_code": return_code,
             "log_file":str(log_path),
+            "config_sha256": config_sha256,
+            "config_reloads": watcher.reloads,
         }
+        if jobs is not None:
+            summary["jobs"] = jobs
         
         try:
             summary_path = run_dir / "summary.json"
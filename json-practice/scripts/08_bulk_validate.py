@@ -0,0 +1,136 @@
+"""
+Bulk validation of many config files (pre-deploy check)
+
+Goal:
+  - Validate every *.json under a folder (e.g. thousands of tenant configs)
+  - Required keys + types from a schema (default: the config.json layout
+    checked by 02), compiled once per worker process
+  - Report every violation of every file, not just the first
+  - Files are split into batches over a process pool (--workers)
+  - Write one summary JSON (counts, violations by code / key, bad files)
+  - Exit codes (0 all valid, 2 invalid configs or bad input)
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import config_schema
+
+BATCH_MAX = 256      # files per pool task (amortises pickling + scheduling)
+
+_check = None        # compiled validator, one per worker process
+
+
+def init_worker(schema: dict) -> None:
+    global _check
+    _check = config_schema.compile_validator(schema)
+
+
+def validate_batch(paths: list[str]) -> list[tuple[str, list[dict]]]:
+    """Bad files of a batch only: (path, violations)."""
+    check = _check
+    out = []
+    for p in paths:
+        violations = config_schema.validate_file(p, check)
+        if violations:
+            out.append((p, violations))
+    return out
+
+
+def batches(items: list, workers: int) -> list[list]:
+    # a few batches per worker keeps them busy to the end
+    size = max(1, min(BATCH_MAX, len(items) // (workers * 4) or 1))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="validate a folder of config json files in parallel")
+    parser.add_argument("config_dir", type=Path, help="Folder with config files")
+    parser.add_argument("--pattern", default="*.json", help="File glob (default: *.json)")
+    parser.add_argument("--recursive", action="store_true", help="Search sub-folders too")
+    parser.add_argument("--schema", type=Path, default=None,
+                        help="Schema json: {\"dotted.key\": \"type\"} (default: config.json layout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count; 1 = no pool)")
+    parser.add_argument("--out", type=Path, default=None,
+                        help="Summary json (default: <config_dir>/validation_summary.json)")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    config_dir: Path = args.config_dir.expanduser().resolve()
+    if not config_dir.is_dir():
+        print("INPUT ERROR: config folder not found:", config_dir)
+        return 2
+    out_path: Path = (args.out.expanduser() if args.out else config_dir / "validation_summary.json").resolve()
+
+    try:
+        schema = config_schema.load_schema(args.schema) if args.schema else config_schema.CONFIG_SCHEMA
+        config_schema.compile_validator(schema)  # fail fast on a bad schema
+    except (OSError, ValueError) as e:
+        print("SCHEMA ERROR:", e)
+        return 2
+
+    found = config_dir.rglob(args.pattern) if args.recursive else config_dir.glob(args.pattern)
+    files = sorted(str(p) for p in found if p.is_file() and p.resolve() != out_path)
+    if not files:
+        print("INPUT ERROR: no files match", args.pattern, "in", config_dir)
+        return 2
+
+    workers = max(1, min(args.workers, len(files)))
+    bad: list[tuple[str, list[dict]]] = []
+    if workers == 1:
+        init_worker(schema)
+        bad = validate_batch(files)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(schema,)) as pool:
+            for result in pool.map(validate_batch, batches(files, workers)):
+                bad.extend(result)
+
+    by_code: dict[str, int] = {}
+    by_key: dict[str, int] = {}
+    for _, violations in bad:
+        for v in violations:
+            by_code[v["code"]] = by_code.get(v["code"], 0) + 1
+            if v["key"]:
+                by_key[v["key"]] = by_key.get(v["key"], 0) + 1
+    elapsed = time.perf_counter() - t0
+
+    summary = {
+        "config_dir": str(config_dir),
+        "pattern": args.pattern,
+        "schema": schema,
+        "files": len(files),
+        "valid": len(files) - len(bad),
+        "invalid": len(bad),
+        "violations": sum(by_code.values()),
+        "by_code": dict(sorted(by_code.items(), key=lambda kv: -kv[1])),
+        "by_key": dict(sorted(by_key.items(), key=lambda kv: -kv[1])),
+        "invalid_files": {os.path.relpath(p, config_dir): v for p, v in bad},
+        "workers": workers,
+        "elapsed_sec": round(elapsed, 3),
+    }
+    try:
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with out_path.open("w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    except OSError as e:
+        print("OUTPUT ERROR: cannot write summary:", out_path, "->", e)
+        return 2
+
+    print("-" * 60)
+    print("Configs :", config_dir, f"({len(files)} files)")
+    print("Valid   :", summary["valid"])
+    print("Invalid :", summary["invalid"], f"({summary['violations']} violations)")
+    for code, n in summary["by_code"].items():
+        print(f"  {code:<13}: {n}")
+    print("Summary :", out_path)
+    print(f"Time    : {elapsed:.2f} sec ({workers} worker{'s' if workers > 1 else ''})")
+    return 2 if bad else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,255 @@
+"""
+Layered config resolver (CLI > ENV > config.json > defaults)
+
+The key schema is compiled once into flat (name, json path, env var, cli
+attr, converters) tuples; config.json is flattened once per load into
+{("paths", "out_dir"): value, ...}, so resolving a key is one dict lookup
+per layer instead of a get_nested walk per layer.
+
+    cfg = RESOLVER.resolve(config_path, cli=vars(args))
+    cfg.min_score            -> 85
+    cfg.source("min_score")  -> "env"
+    cfg.to_dict()            -> {"paths": {...}, "options": {...}}
+
+ResolvedConfig is immutable (a read-only Mapping) and remembers which layer
+every value came from: "cli", "env", "json" or "default".
+cfg.with_overrides(item) layers one manifest item on top (source "item";
+CLI values still win).
+"""
+
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from types import MappingProxyType
+
+LAYERS = ("cli", "item", "env", "json", "default")
+
+_MISSING = object()
+
+
+class ConfigError(ValueError):
+    pass
+
+
+def parse_bool(s: str) -> bool:
+    s = s.strip().lower()
+    if s in {"1", "true", "yes", "y", "on"}:
+        return True
+    if s in {"0", "false", "no", "n", "off"}:
+        return False
+    raise ValueError(f"Invalid boolean: {s!r} (use 1/0, true/false, yes/no)")
+
+
+class Key:
+    """
+    One setting.
+    path    : where it lives in config.json / DEFAULTS
+    convert : applied to json / default / cli values (int, bool, str ...)
+    parse   : applied to the env string (default: convert)
+    """
+
+    __slots__ = ("name", "path", "env", "cli", "convert", "parse")
+
+    def __init__(self, path: tuple[str, ...], convert=str, env: str | None = None,
+                 cli: str | None = None, parse=None, name: str | None = None):
+        self.path = tuple(path)
+        self.name = name or self.path[-1]
+        self.env = env
+        self.cli = cli if cli is not None else self.name
+        self.convert = convert
+        self.parse = parse or convert
+
+
+SCHEMA = (
+    Key(("paths", "input_csv"), env="INPUT_CSV"),
+    Key(("paths", "out_dir"), env="OUT_DIR"),
+    Key(("options", "min_score"), int, env="MIN_SCORE"),
+    Key(("options", "verbose"), bool, env="VERBOSE", parse=parse_bool),
+)
+
+DEFAULTS = {
+    "paths": {
+        "input_csv": "playground/out/sample.csv",
+        "out_dir": "playground/out/results",
+    },
+    "options": {
+        "min_score": 80,
+        "verbose": False,
+    },
+}
+
+
+def flatten(d, prefix: tuple = (), out: dict | None = None) -> dict:
+    """{"a": {"b": 1}} -> {("a",): {"b": 1}, ("a", "b"): 1} (every node, like get_nested sees it)"""
+    if out is None:
+        out = {}
+    if isinstance(d, dict):
+        for k, v in d.items():
+            path = prefix + (k,)
+            out[path] = v
+            flatten(v, path, out)
+    return out
+
+
+def _lookup(d, path: tuple):
+    for k in path:
+        if not isinstance(d, dict) or k not in d:
+            return _MISSING
+        d = d[k]
+    return d
+
+
+def load_flat(config_path: Path) -> dict:
+    """Flattened config.json ({} if missing)."""
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except OSError as e:
+        raise ConfigError(f"cannot read {config_path}: {e.strerror or e}")
+    except ValueError as e:
+        raise ConfigError(f"{config_path}: invalid JSON: {e}")
+    return flatten(data)
+
+
+class ResolvedConfig(Mapping):
+    """Read-only {name: value}; cfg.name works too."""
+
+    __slots__ = ("_values", "_sources", "_keys", "config_path", "env_seen", "cli_seen")
+
+    def __init__(self, keys, values: dict, sources: dict, config_path: Path,
+                 env_seen: dict, cli_seen: dict):
+        set_ = object.__setattr__
+        set_(self, "_keys", keys)
+        set_(self, "_values", MappingProxyType(values))
+        set_(self, "_sources", MappingProxyType(sources))
+        set_(self, "config_path", config_path)
+        set_(self, "env_seen", MappingProxyType(env_seen))
+        set_(self, "cli_seen", MappingProxyType(cli_seen))
+
+    def __getitem__(self, name: str):
+        return self._values[name]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getattr__(self, name: str):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ResolvedConfig is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("ResolvedConfig is read-only")
+
+    def __repr__(self) -> str:
+        return f"ResolvedConfig({dict(self._values)!r})"
+
+    @property
+    def sources(self) -> Mapping:
+        return self._sources
+
+    def source(self, name: str) -> str:
+        """Layer the value came from: cli / item / env / json / default."""
+        return self._sources[name]
+
+    def with_overrides(self, overrides: Mapping, layer: str = "item") -> "ResolvedConfig":
+        """
+        Copy with values from overrides, flat ({"min_score": 90}) or nested like
+        config.json ({"options": {"min_score": 90}}). Other keys are ignored.
+        """
+        values = sources = None
+        for key in self._keys:
+            raw = _lookup(overrides, key.path)
+            if raw is _MISSING:
+                raw = overrides.get(key.name, _MISSING)
+            if raw is _MISSING or self._sources[key.name] == "cli":
+                continue
+            if values is None:
+                values = dict(self._values)
+                sources = dict(self._sources)
+            try:
+                values[key.name] = key.convert(raw)
+            except (TypeError, ValueError) as e:
+                if key.convert is int:
+                    raise ConfigError(f"{layer} {key.name} must be an integer") from None
+                raise ConfigError(f"{layer} {key.name}: {e}") from None
+            sources[key.name] = layer
+        if values is None:
+            return self  # nothing to override (immutable, so sharing is safe)
+        return ResolvedConfig(self._keys, values, sources, self.config_path,
+                              dict(self.env_seen), dict(self.cli_seen))
+
+    def to_dict(self) -> dict:
+        """Nested like config.json: {"paths": {...}, "options": {...}}"""
+        out: dict = {}
+        for key in self._keys:
+            node = out
+            for part in key.path[:-1]:
+                node = node.setdefault(part, {})
+            node[key.path[-1]] = self._values[key.name]
+        return out
+
+
+class Resolver:
+    def __init__(self, schema=SCHEMA, defaults: dict = DEFAULTS):
+        self.keys = tuple(schema)
+        names = [k.name for k in self.keys]
+        if len(set(names)) != len(names):
+            raise ValueError(f"duplicate key names in schema: {names}")
+        flat_defaults = flatten(defaults)
+        # (key, default) resolved once; convert is applied per layer at resolve time
+        self._compiled = tuple((k, flat_defaults.get(k.path, None)) for k in self.keys)
+
+    def resolve(self, config_path: Path, cli: Mapping | None = None,
+                environ: Mapping | None = None) -> ResolvedConfig:
+        """
+        cli: {attr: value} (e.g. vars(args)); None values mean "not given".
+        environ: defaults to os.environ.
+        """
+        cli = cli or {}
+        environ = os.environ if environ is None else environ
+        flat = load_flat(config_path)
+        values = {}
+        sources = {}
+        env_seen = {}
+        cli_seen = {}
+        for key, default in self._compiled:
+            cli_value = cli.get(key.cli)
+            cli_seen[key.cli] = cli_value is not None
+            if key.env is not None:
+                env_seen[key.env] = key.env in environ
+
+            if cli_value is not None:
+                layer, raw, conv = "cli", cli_value, key.convert
+            elif key.env is not None and key.env in environ:
+                layer, raw, conv = "env", environ[key.env], key.parse
+            else:
+                raw = flat.get(key.path, _MISSING)
+                if raw is _MISSING:
+                    layer, raw = "default", default
+                else:
+                    layer = "json"
+                conv = key.convert
+            try:
+                values[key.name] = conv(raw)
+            except (TypeError, ValueError) as e:
+                where = {"cli": f"--{key.cli.replace('_', '-')}", "env": key.env,
+                         "json": f"{config_path}: {'.'.join(key.path)}",
+                         "default": f"default {'.'.join(key.path)}"}[layer]
+                if conv is int:
+                    raise ConfigError(f"{where} must be an integer") from None
+                raise ConfigError(f"{where}: {e}") from None
+            sources[key.name] = layer
+        return ResolvedConfig(self.keys, values, sources, Path(config_path), env_seen, cli_seen)
+
+
+RESOLVER = Resolver()
@@ -0,0 +1,137 @@
+"""
+Config schema (required keys + types) -> compiled validator that reports
+every violation, not just the first
+
+Schema = dict of dotted key -> type name:
+    {"project": "str", "paths.input_csv": "str", "options.min_score": "int", ...}
+
+Types: str, int (bools rejected), number (int or float, bools rejected),
+bool, object, list, any.
+
+compile_validator(schema) groups the keys by parent once, so at check time
+each parent object ("paths", "options") is looked up once and its leaves
+are checked with one isinstance() each. The returned function takes a
+parsed config and returns a list of violations:
+
+    {"key": "options.min_score", "code": "BAD_TYPE", "expected": "int", "got": "str"}
+
+A missing / non-object parent is reported once; its leaves are skipped.
+validate_file(path, check) adds INVALID_JSON / UNREADABLE for files that
+never get as far as a dict.
+"""
+
+import json
+from pathlib import Path
+
+# violation codes
+MISSING = "MISSING"
+BAD_TYPE = "BAD_TYPE"
+NOT_OBJECT = "NOT_OBJECT"
+INVALID_JSON = "INVALID_JSON"
+UNREADABLE = "UNREADABLE"
+
+# required keys + types of json-practice/playground/out/config.json
+CONFIG_SCHEMA = {
+    "project": "str",
+    "paths.input_csv": "str",
+    "paths.out_dir": "str",
+    "options.min_score": "int",
+    "options.verbose": "bool",
+}
+
+_TYPES = {
+    "str": (str,),
+    "int": (int,),
+    "number": (int, float),
+    "bool": (bool,),
+    "object": (dict,),
+    "list": (list,),
+    "any": (object,),
+}
+_NO_BOOL = {"int", "number"}
+_JSON_NAMES = {dict: "object", list: "list", str: "str", int: "int", float: "number",
+               bool: "bool", type(None): "null"}
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def json_type(value) -> str:
+    return _JSON_NAMES.get(type(value), type(value).__name__)
+
+
+def load_schema(path: Path) -> dict:
+    with Path(path).expanduser().open("r", encoding="utf-8") as f:
+        schema = json.load(f)
+    if not isinstance(schema, dict):
+        raise SchemaError(f"{path}: schema must be an object of key -> type")
+    return schema
+
+
+def compile_validator(schema: dict):
+    """schema -> check(cfg) -> list of violation dicts"""
+    groups: dict[tuple, list] = {}
+    for key, type_name in schema.items():
+        if type_name not in _TYPES:
+            raise SchemaError(f"{key}: unknown type {type_name!r} (use {', '.join(_TYPES)})")
+        parts = tuple(key.split("."))
+        if not all(parts):
+            raise SchemaError(f"bad key: {key!r}")
+        groups.setdefault(parts[:-1], []).append(
+            (parts[-1], key, _TYPES[type_name], type_name, type_name in _NO_BOOL))
+    # parents in depth order, so "a" is checked (and reported) before "a.b"
+    compiled = tuple((parent, tuple(leaves))
+                     for parent, leaves in sorted(groups.items(), key=lambda g: (len(g[0]), g[0])))
+
+    def check(cfg) -> list[dict]:
+        if not isinstance(cfg, dict):
+            return [{"key": "", "code": NOT_OBJECT, "expected": "object", "got": json_type(cfg)}]
+        out = []
+        broken = set()     # parents already reported
+        for parent, leaves in compiled:
+            node = cfg
+            for depth, part in enumerate(parent):
+                here = parent[:depth + 1]
+                if here in broken:
+                    node = None
+                    break
+                if part not in node:
+                    out.append({"key": ".".join(here), "code": MISSING, "expected": "object"})
+                    broken.add(here)
+                    node = None
+                    break
+                node = node[part]
+                if not isinstance(node, dict):
+                    out.append({"key": ".".join(here), "code": BAD_TYPE, "expected": "object",
+                                "got": json_type(node)})
+                    broken.add(here)
+                    node = None
+                    break
+            if node is None:
+                continue
+            for leaf, key, types, type_name, no_bool in leaves:
+                if leaf not in node:
+                    out.append({"key": key, "code": MISSING, "expected": type_name})
+                    broken.add(parent + (leaf,))
+                    continue
+                value = node[leaf]
+                if not isinstance(value, types) or (no_bool and isinstance(value, bool)):
+                    out.append({"key": key, "code": BAD_TYPE, "expected": type_name, "got": json_type(value)})
+                    broken.add(parent + (leaf,))
+        return out
+
+    return check
+
+
+def validate_file(path: Path, check) -> list[dict]:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return [{"key": "", "code": UNREADABLE, "error": e.strerror or str(e)}]
+    try:
+        cfg = json.loads(data)
+    except ValueError as e:
+        return [{"key": "", "code": INVALID_JSON, "error": str(e)}]
+    return check(cfg)
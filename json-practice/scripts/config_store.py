@@ -0,0 +1,83 @@
+"""
+Content-addressed store for resolved run configs
+
+Most runs resolve to the same final config, so instead of one
+final_config.json per run folder the config is stored once under the
+sha256 of its canonical JSON (sorted keys, no whitespace):
+
+    configs/
+      3f/
+        3fa9...e1.json   the config (pretty printed, written once)
+        3fa9...e1.runs   run ids that used it, one per line (append-only)
+
+put()     : hash + one stat(); the file is written only for a new config
+            (tmp file + os.replace, so racing writers are safe)
+add_run() : one O_APPEND write of a short line
+runs()    : reads that one .runs file
+
+None of these look at other configs or runs, so they cost the same with
+10 runs or 100k. The two-hex-char fan-out keeps each folder small.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+def canonical(cfg: dict) -> bytes:
+    return json.dumps(cfg, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def config_hash(cfg: dict) -> str:
+    return hashlib.sha256(canonical(cfg)).hexdigest()
+
+
+class ConfigStore:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _base(self, digest: str) -> Path:
+        if len(digest) != 64 or any(c not in "0123456789abcdef" for c in digest):
+            raise ValueError(f"not a sha256 hex digest: {digest!r}")
+        return self.root / digest[:2] / digest
+
+    def path(self, digest: str) -> Path:
+        return self._base(digest).with_suffix(".json")
+
+    def put(self, cfg: dict) -> tuple[str, bool]:
+        """Store cfg; return (sha256, True if it was new)."""
+        digest = config_hash(cfg)
+        path = self.path(digest)
+        if path.is_file():
+            return digest, False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(cfg, f, indent=2, sort_keys=True, ensure_ascii=False)
+        os.replace(tmp, path)
+        return digest, True
+
+    def get(self, digest: str) -> dict:
+        with self.path(digest).open("r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def add_run(self, digest: str, run_id: str) -> None:
+        if "\n" in run_id:
+            raise ValueError(f"run id cannot contain a newline: {run_id!r}")
+        runs_path = self._base(digest).with_suffix(".runs")
+        runs_path.parent.mkdir(parents=True, exist_ok=True)
+        # one short write with O_APPEND: concurrent runs never interleave lines
+        fd = os.open(runs_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, (run_id + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def runs(self, digest: str) -> list[str]:
+        """Run ids that used this config, oldest first ([] if none)."""
+        try:
+            with self._base(digest).with_suffix(".runs").open("r", encoding="utf-8") as f:
+                return [line.rstrip("\n") for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
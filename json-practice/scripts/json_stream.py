@@ -0,0 +1,163 @@
+"""
+Stream items out of a big JSON manifest without loading it whole
+
+Two layouts:
+  NDJSON      : one JSON value per line (blank lines skipped)
+  JSON array  : [ {...}, {...}, ... ] as one document
+
+iter_items(path) looks at the first non-blank byte ("[" -> array, else
+NDJSON) and yields (item_no, item) as soon as each item is parsed, so a
+caller can start work on item 1 while the rest of the file is unread.
+
+Memory: one read chunk + the item being decoded. For arrays the buffer is
+trimmed after every chunk's worth of items; an item bigger than a chunk
+makes the buffer grow (doubling) until it fits, up to max_item bytes.
+
+Errors raise ManifestError with the line (NDJSON) or item number (array)
+and stop the stream: items already yielded stay valid.
+"""
+
+import json
+from pathlib import Path
+
+CHUNK = 1 << 16
+MAX_ITEM = 64 << 20
+_WS = " \t\r\n"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+_decoder = json.JSONDecoder()
+
+
+class ManifestError(ValueError):
+    pass
+
+
+def iter_ndjson(path: Path, max_item: int = MAX_ITEM):
+    """Yield (line_no, value) for every non-blank line."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if len(line) > max_item:
+                raise ManifestError(f"{path}:{line_no}: line longer than {max_item} bytes")
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError as e:
+                raise ManifestError(f"{path}:{line_no}: invalid JSON: {e}") from None
+            yield line_no, value
+
+
+def _skip_ws(buf: str, pos: int) -> int:
+    n = len(buf)
+    while pos < n and buf[pos] in _WS:
+        pos += 1
+    return pos
+
+
+def _scalar_ends(buf: str, end: int) -> bool:
+    """
+    A number / literal decoded from buf[:end] is whole only if what follows
+    ends it: "," or "]" after optional whitespace. "1." or "1e" cut at the
+    buffer end decodes as 1, so number characters running to the end of the
+    buffer (or only whitespace left) mean: read more. Anything else is a
+    syntax error the caller reports.
+    """
+    nxt = _skip_ws(buf, end)
+    if nxt >= len(buf):
+        return False
+    if buf[nxt] in ",]":
+        return True
+    run = end
+    while run < len(buf) and buf[run] in _NUMBER_CHARS:
+        run += 1
+    return run < len(buf)
+
+
+def iter_json_array(path: Path, chunk_size: int = CHUNK, max_item: int = MAX_ITEM):
+    """Yield (item_no, value) for every element of a top-level JSON array."""
+    with open(path, "r", encoding="utf-8") as f:
+        buf = f.read(chunk_size)
+        eof = not buf
+        pos = _skip_ws(buf, 0)
+        while pos >= len(buf) and not eof:
+            more = f.read(chunk_size)
+            eof = not more
+            buf += more
+            pos = _skip_ws(buf, pos)
+        if pos >= len(buf) or buf[pos] != "[":
+            raise ManifestError(f"{path}: expected a JSON array")
+        pos += 1
+        item_no = 0
+        want = chunk_size          # bytes to read when the buffer runs dry
+        expect_item = True         # after "[" or ","
+
+        while True:
+            pos = _skip_ws(buf, pos)
+            if pos >= len(buf):
+                if eof:
+                    raise ManifestError(f"{path}: unexpected end of file after item {item_no}")
+                more = f.read(want)
+                eof = not more
+                buf = buf[pos:] + more
+                pos = 0
+                continue
+
+            ch = buf[pos]
+            if ch == "]" and (not expect_item or item_no == 0):
+                return
+            if not expect_item:
+                if ch != ",":
+                    raise ManifestError(f"{path}: expected ',' or ']' after item {item_no}, got {ch!r}")
+                pos += 1
+                expect_item = True
+                continue
+
+            try:
+                value, end = _decoder.raw_decode(buf, pos)
+                complete = eof or isinstance(value, (dict, list, str)) or _scalar_ends(buf, end)
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise ManifestError(f"{path}: item {item_no + 1}: invalid JSON: {e.msg}") from None
+                complete = False
+            if not complete:
+                if len(buf) - pos >= max_item:
+                    raise ManifestError(f"{path}: item {item_no + 1} is larger than {max_item} bytes")
+                # keep the partial item, read at least as much again (amortised O(n))
+                want = max(chunk_size, len(buf) - pos)
+                more = f.read(want)
+                eof = not more
+                buf = buf[pos:] + more
+                pos = 0
+                continue
+
+            item_no += 1
+            yield item_no, value
+            pos = end
+            expect_item = False
+            want = chunk_size
+            if pos >= chunk_size:
+                buf = buf[pos:]
+                pos = 0
+
+
+def detect_layout(path: Path) -> str:
+    """'array' or 'ndjson' from the first non-blank character."""
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            block = f.read(4096)
+            if not block:
+                return "ndjson"
+            stripped = block.lstrip(_WS)
+            if stripped:
+                return "array" if stripped[0] == "[" else "ndjson"
+
+
+def iter_items(path: Path, layout: str = "auto", chunk_size: int = CHUNK, max_item: int = MAX_ITEM):
+    """layout: auto / array / ndjson"""
+    if layout == "auto":
+        layout = detect_layout(path)
+    if layout == "array":
+        return iter_json_array(path, chunk_size=chunk_size, max_item=max_item)
+    if layout == "ndjson":
+        return iter_ndjson(path, max_item=max_item)
+    raise ValueError(f"unknown manifest layout: {layout!r}")
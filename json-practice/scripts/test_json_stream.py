@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+import json_stream
+
+DOCS = [
+    "[" + " " * (65536 - 3) + "1.5]",
+    '[1.5, -2e10, 3E-2, 0, -0.25e+3, true, false, null, "s", {"a": [1, 2.5]}, [], 12345678901234567890]',
+    '[\n  1.0 ,\n  2e5\t,3\n]\n',
+    "[]",
+    "  [ 7 ]  ",
+]
+
+
+@pytest.mark.parametrize("doc", DOCS)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64, 1 << 16])
+def test_array_matches_json_loads(tmp_path, doc, chunk_size):
+    path = tmp_path / "manifest.json"
+    path.write_text(doc, encoding="utf-8")
+    items = list(json_stream.iter_json_array(path, chunk_size=chunk_size))
+    assert [value for _, value in items] == json.loads(doc)
+    assert [n for n, _ in items] == list(range(1, len(items) + 1))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+@pytest.mark.parametrize("doc", ["[1.x]", "[1 2]", "[1.5,]", "[tru]"])
+def test_invalid_array_raises(tmp_path, doc, chunk_size):
+    path = tmp_path / "manifest.json"
+    path.write_text(doc, encoding="utf-8")
+    with pytest.raises(json_stream.ManifestError):
+        list(json_stream.iter_json_array(path, chunk_size=chunk_size))